@@ -0,0 +1,186 @@
+"""
+Microbenchmark: IndexedMinBinaryHeap (decrease-key) vs. heapq with lazy deletion.
+
+The workload mimics a Dijkstra/A* open list: keys are pushed, then their priorities are
+lowered a few times each, and keys are popped in order until the heap is empty.
+With heapq, a decrease-key pushes a duplicate entry and stale entries are skipped on pop.
+
+A second run times `PathFinder.find` (A* with its inline open list) against A* loops on
+IndexedMinBinaryHeap and on heapq, over random queries on a tiled room with #holes obstacles.
+
+Run from the repo root: python -m benchmarks.bench_heap [#keys] [#decrease-key per key] [#holes]
+"""
+import functools
+import heapq
+import random
+import sys
+import time
+
+import numpy as np
+
+import meadow_map
+from meadow_map import PathFinder
+from benchmarks import generators
+from utils.MinBinaryHeap import IndexedMinBinaryHeap
+
+
+def make_workload(n_keys: int, n_updates: int, seed: int = 0) -> ([float], [(int, float)]):
+    """
+    :return: (initial priority of each key, list of (key, lowered priority))
+    """
+    rng = random.Random(seed)
+    init = [rng.uniform(0, 1000) for _ in range(n_keys)]
+    current = list(init)
+    updates = []
+    for _ in range(n_keys * n_updates):
+        key = rng.randrange(n_keys)
+        current[key] -= rng.uniform(0, 10)
+        updates.append((key, current[key]))
+    return init, updates
+
+
+def run_indexed(init: [float], updates: [(int, float)]) -> [int]:
+    heap = IndexedMinBinaryHeap(len(init))
+    for key, priority in enumerate(init):
+        heap.insert(key, priority)
+    for key, priority in updates:
+        heap.decrease_key(key, priority)
+    order = []
+    while len(heap) > 0:
+        order.append(heap.pop_min()[0])
+    return order
+
+
+def run_heapq_lazy(init: [float], updates: [(int, float)]) -> [int]:
+    heap = [(priority, key) for key, priority in enumerate(init)]
+    heapq.heapify(heap)
+    best = list(init)
+    for key, priority in updates:
+        best[key] = priority
+        heapq.heappush(heap, (priority, key))
+    done = [False] * len(init)
+    order = []
+    while heap:
+        priority, key = heapq.heappop(heap)
+        if done[key] or priority != best[key]:
+            continue  # stale entry
+        done[key] = True
+        order.append(key)
+    return order
+
+
+def _graph(mesh) -> dict:
+    """
+    Graph of a NavMesh as lists, as copied by `PathFinder`.
+    """
+    return {"offsets": mesh.poly_offsets.tolist(), "neis": mesh.edge_neighbours.tolist(),
+            "costs": mesh.edge_costs.tolist(), "centers": mesh.centers.tolist()}
+
+
+def _distance(centers: [[float]], p: int, q: int) -> float:
+    return ((centers[p][0] - centers[q][0]) ** 2 + (centers[p][1] - centers[q][1]) ** 2) ** 0.5
+
+
+def astar_indexed(graph: dict, start: int, goal: int) -> float:
+    """
+    Corridor cost by A* with IndexedMinBinaryHeap (decrease-key) as open list.
+    """
+    offsets, neis, costs, centers = (graph[k] for k in ("offsets", "neis", "costs", "centers"))
+    heap = IndexedMinBinaryHeap(len(centers))
+    best = {start: 0.0}
+    done = set()
+    heap.insert(start, _distance(centers, start, goal))
+    while len(heap) > 0:
+        p = heap.pop_min()[0]
+        if p == goal:
+            return best[p]
+        done.add(p)
+        for e in range(offsets[p], offsets[p + 1]):
+            q = neis[e]
+            d = best[p] + costs[e]
+            if q < 0 or q in done or d >= best.get(q, float("inf")):
+                continue
+            if heap.contains(q):
+                heap.decrease_key(q, d + _distance(centers, q, goal))
+            else:
+                heap.insert(q, d + _distance(centers, q, goal))
+            best[q] = d
+    return float("inf")
+
+
+def astar_heapq(graph: dict, start: int, goal: int) -> float:
+    """
+    Corridor cost by A* with heapq (lazy deletion) as open list.
+    """
+    offsets, neis, costs, centers = (graph[k] for k in ("offsets", "neis", "costs", "centers"))
+    best = {start: 0.0}
+    done = set()
+    heap = [(_distance(centers, start, goal), start)]
+    while heap:
+        p = heapq.heappop(heap)[1]
+        if p in done:
+            continue  # stale entry
+        if p == goal:
+            return best[p]
+        done.add(p)
+        for e in range(offsets[p], offsets[p + 1]):
+            q = neis[e]
+            d = best[p] + costs[e]
+            if q >= 0 and q not in done and d < best.get(q, float("inf")):
+                best[q] = d
+                heapq.heappush(heap, (d + _distance(centers, q, goal), q))
+    return float("inf")
+
+
+def bench_astar(n_holes: int, n_queries: int = 200, repeat: int = 3) -> None:
+    verts_poly, indices_poly, holes = generators.room_with_holes(n_holes, seed=n_holes)
+    mesh = meadow_map.build_tiled(verts_poly, indices_poly, holes, tile_size=2.0)
+    starts, goals = generators.random_queries(mesh, n_queries, seed=n_holes)
+    pairs = list(zip(mesh.locate(starts).tolist(), mesh.locate(goals).tolist()))
+    print(f"A*, {mesh.n_polys} polygons, {n_queries} queries")
+
+    finder = PathFinder(mesh)
+    graph = _graph(mesh)
+
+    def inline(start: int, goal: int) -> float:
+        return finder.cost(goal) if finder.find(start, goal) else float("inf")
+
+    results = {}
+    for name, func in [("PathFinder.find (inline)", inline),
+                       ("IndexedMinBinaryHeap", functools.partial(astar_indexed, graph)),
+                       ("heapq (lazy deletion)", functools.partial(astar_heapq, graph))]:
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            costs = [func(s, g) if s >= 0 and g >= 0 else float("inf") for s, g in pairs]
+            best = min(best, time.perf_counter() - start)
+        results[name] = costs
+        print(f"{name:24s} {best:8.3f} s")
+
+    costs = np.array(list(results.values()))
+    assert np.allclose(costs, costs[0], rtol=1e-9, atol=0), \
+        "A* variants disagree on corridor costs"
+
+
+def main() -> None:
+    n_keys = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    n_updates = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    n_holes = int(sys.argv[3]) if len(sys.argv) > 3 else 1000
+    init, updates = make_workload(n_keys, n_updates)
+
+    results = {}
+    for name, func in [("IndexedMinBinaryHeap", run_indexed),
+                       ("heapq (lazy deletion)", run_heapq_lazy)]:
+        start = time.perf_counter()
+        order = func(init, updates)
+        results[name] = order
+        print(f"{name:24s} {time.perf_counter() - start:8.3f} s")
+
+    orders = list(results.values())
+    assert orders[0] == orders[1], "heaps disagree on pop order"
+
+    bench_astar(n_holes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Seeded generators of benchmark inputs: simple polygons, holes and path queries.
+
+Polygons are returned as vertex positions in counter-clock wise (index = position), holes
+as (verts_hole, indices_hole) in clock wise, ready for `merge_holes` / `NavMesh.build`.
+"""
+import numpy as np
+
+
+def _ccw(verts: np.ndarray) -> np.ndarray:
+    x, y = verts[:, 0], verts[:, 1]
+    area = np.sum(x * np.roll(y, -1) - np.roll(x, -1) * y)
+    return verts if area > 0 else verts[::-1].copy()
+
+
+def star_polygon(n: int, seed: int = 0) -> np.ndarray:
+    """
+    Star-shaped polygon with random radii: about half of the vertices are concave.
+    :param n:      int                     #verts
+    :param seed:   int                     random seed
+    :return:       np.ndarray (#verts, 2)  vertex positions, counter-clock wise
+    """
+    rng = np.random.default_rng(seed)
+    angles = np.sort(rng.uniform(0, 2 * np.pi, n))
+    radius = rng.uniform(2.0, 10.0, n)
+    return np.stack((radius * np.cos(angles), radius * np.sin(angles)), axis=1)
+
+
+def spiral_polygon(n: int, seed: int = 0, turns: float = 3.0) -> np.ndarray:
+    """
+    Spiral corridor: long, narrow, every diagonal is blocked by the other arms.
+    :param n:      int                     #verts (rounded down to even)
+    :param seed:   int                     random seed (jitter of the corridor width)
+    :param turns:  float                   number of turns of the spiral
+    :return:       np.ndarray (#verts, 2)  vertex positions, counter-clock wise
+    """
+    rng = np.random.default_rng(seed)
+    half = max(n // 2, 3)
+    theta = np.linspace(0.0, 2 * np.pi * turns, half)
+    inner = 1.0 + theta / (2 * np.pi)
+    outer = inner + rng.uniform(0.4, 0.6, half)
+    arm_in = np.stack((inner * np.cos(theta), inner * np.sin(theta)), axis=1)
+    arm_out = np.stack((outer * np.cos(theta), outer * np.sin(theta)), axis=1)
+    return _ccw(np.concatenate((arm_out, arm_in[::-1])))
+
+
+def comb_polygon(n: int, seed: int = 0) -> np.ndarray:
+    """
+    Comb: a corridor with teeth (dead-end rooms) of random depth on one side.
+    :param n:      int                     #verts (about, 4 per tooth)
+    :param seed:   int                     random seed
+    :return:       np.ndarray (#verts, 2)  vertex positions, counter-clock wise
+    """
+    rng = np.random.default_rng(seed)
+    k = max((n - 4) // 4, 1)
+    depth = rng.uniform(1.0, 5.0, k)
+    verts = [(0.0, 0.0), (float(k), 0.0), (float(k), 1.0)]
+    for i in range(k - 1, -1, -1):
+        verts += [(i + 0.9, 1.0), (i + 0.9, 1.0 + depth[i]),
+                  (i + 0.1, 1.0 + depth[i]), (i + 0.1, 1.0)]
+    verts.append((0.0, 1.0))
+    return np.array(verts)
+
+
+def one_concave_polygon(n: int) -> np.ndarray:
+    """
+    Regular polygon with only the last vertex pushed inwards: worst case for
+    `find_concave_vertex`, which scans from the first vertex.
+    :param n:      int                     #verts
+    :return:       np.ndarray (#verts, 2)  vertex positions, counter-clock wise
+    """
+    angles = np.linspace(0, 2 * np.pi, n, endpoint=False)
+    verts = np.stack((np.cos(angles), np.sin(angles)), axis=1) * 10.0
+    verts[-1] *= 0.5
+    return verts
+
+
+def room_with_holes(n_holes: int, seed: int = 0) -> (np.ndarray, np.ndarray, list):
+    """
+    Square room with non-overlapping random quadrilateral holes, one per grid cell.
+    :param n_holes:  int  number of holes
+    :param seed:     int  random seed
+    :return:  (verts_poly, indices_poly, holes), input of `merge_holes` / `NavMesh.build`
+    """
+    rng = np.random.default_rng(seed)
+    side = max(int(np.ceil(np.sqrt(n_holes))), 1)
+    verts_poly = np.array([[0., 0.], [side, 0.], [side, side], [0., side]], dtype=np.float64)
+    cells = rng.permutation(side * side)[:n_holes]
+    holes = []
+    for c in cells.tolist():
+        cx, cy = c % side + 0.5, c // side + 0.5
+        # quadrilateral with a random size and rotation, inside its cell
+        angle = rng.uniform(0, np.pi / 2) + np.arange(4) * np.pi / 2
+        radius = rng.uniform(0.15, 0.35, 4)
+        quad = np.stack((cx + radius * np.cos(angle), cy + radius * np.sin(angle)), axis=1)
+        holes.append((quad, np.arange(3, -1, -1)))  # CW
+    return verts_poly, np.arange(4), holes
+
+
+def random_queries(navmesh, n: int, seed: int = 0) -> (np.ndarray, np.ndarray):
+    """
+    Random start and goal points, all inside the mesh.
+    :param navmesh:  NavMesh  the mesh
+    :param n:        int      number of queries
+    :param seed:     int      random seed
+    :return:         (np.ndarray (n, 2), np.ndarray (n, 2))  starts, goals
+    """
+    rng = np.random.default_rng(seed)
+    lo = navmesh.verts.min(axis=0)
+    hi = navmesh.verts.max(axis=0)
+    points = np.zeros((0, 2))
+    while points.shape[0] < 2 * n:
+        cand = rng.uniform(lo, hi, size=(4 * n, 2))
+        points = np.concatenate((points, cand[navmesh.locate(cand) >= 0]))
+    return points[:n], points[n:2 * n]
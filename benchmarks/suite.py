@@ -0,0 +1,234 @@
+"""
+Benchmark suite: time the building blocks and path queries across input sizes, fit the
+complexity exponent of each benchmark and write the results as JSON.
+
+For each benchmark and size: the best wall time of `--repeat` runs, ops/sec, and the peak
+memory traced (tracemalloc, numpy allocations included) of one more run. The exponent k of
+time ~ n^k is fitted on sizes taking more than 1 ms. Larger sizes of a benchmark are skipped
+once a run takes more than `--budget` seconds.
+
+With `--baseline` (a previous JSON output), runs slower by more than `--tolerance` (ratio)
+and exponents higher by more than 0.25 are reported, and the exit code is 1.
+
+Run from the repo root:
+    python -m benchmarks.suite [--sizes 10,100,1000] [--only convexify] [--out res.json]
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+import meadow_map
+from meadow_map import kernels
+from meadow_map.convex_no_hole import find_concave_vertex
+from meadow_map.diag import diagonal
+from benchmarks import generators
+
+DEFAULT_SIZES = [10, 30, 100, 300, 1000, 3000, 10000, 30000, 100000]
+
+
+def _setup_find_concave_vertex(n: int):
+    verts = generators.one_concave_polygon(n)
+    indices = np.arange(n)
+    return lambda: find_concave_vertex(verts, indices), 1
+
+
+def _setup_diagonal(n: int):
+    verts = generators.star_polygon(n, seed=n)
+    indices = np.arange(n)
+    pairs = np.random.default_rng(n).integers(0, n, size=(20, 2))
+
+    def run():
+        for ia, ib in pairs.tolist():
+            if ia != ib:
+                diagonal(verts, indices, ia, ib)
+    return run, len(pairs)
+
+
+def _setup_convexify(generator, method: str):
+    def setup(n: int):
+        verts = generator(n, seed=n)
+        indices = np.arange(len(verts))
+        return lambda: meadow_map.convexify(verts, indices, method=method), 1
+    return setup
+
+
+def _setup_merge_hole(n: int):
+    verts_poly, indices_poly, _ = generators.room_with_holes(1, seed=n)
+    verts_hole = generators.star_polygon(n, seed=n) * 0.02 + verts_poly.mean(axis=0)
+    indices_hole = np.arange(n)[::-1]  # CW
+    return lambda: meadow_map.merge_hole(verts_poly, indices_poly, verts_hole, indices_hole), 1
+
+
+def _setup_merge_holes(n: int):
+    # n vertices: 4 per hole
+    verts_poly, indices_poly, holes = generators.room_with_holes(max(n // 4, 1), seed=n)
+    return lambda: meadow_map.merge_holes(verts_poly, indices_poly, holes), 1
+
+
+def _query_mesh(n: int):
+    verts_poly, indices_poly, holes = generators.room_with_holes(max(n // 4, 1), seed=n)
+    mesh = meadow_map.build_tiled(verts_poly, indices_poly, holes, tile_size=4.0)
+    starts, goals = generators.random_queries(mesh, 50, seed=n)
+    return mesh, starts, goals
+
+
+def _setup_find_path(n: int):
+    mesh, starts, goals = _query_mesh(n)
+    start_polys, goal_polys = mesh.locate(starts), mesh.locate(goals)
+    finder = meadow_map.PathFinder(mesh)
+
+    def run():
+        for s, g in zip(start_polys.tolist(), goal_polys.tolist()):
+            finder.find(s, g)
+    return run, len(starts)
+
+
+def _setup_find_paths(n: int):
+    mesh, starts, goals = _query_mesh(n)
+    return lambda: meadow_map.find_paths(mesh, starts, goals), len(starts)
+
+
+def _setup_locate(n: int):
+    mesh, starts, _ = _query_mesh(n)
+    points = np.repeat(starts, 20, axis=0)
+    mesh.locate(points[:1])  # build the index out of the timing
+    return lambda: mesh.locate(points), len(points)
+
+
+# name -> setup(n) returning (run, #ops per run); n is the number of input vertices
+BENCHMARKS = {
+    "find_concave_vertex": _setup_find_concave_vertex,
+    "diagonal": _setup_diagonal,
+    "convexify/star/arkin": _setup_convexify(generators.star_polygon, "arkin"),
+    "convexify/star/hm": _setup_convexify(generators.star_polygon, "hm"),
+    "convexify/spiral/arkin": _setup_convexify(generators.spiral_polygon, "arkin"),
+    "convexify/spiral/hm": _setup_convexify(generators.spiral_polygon, "hm"),
+    "convexify/comb/arkin": _setup_convexify(generators.comb_polygon, "arkin"),
+    "convexify/comb/hm": _setup_convexify(generators.comb_polygon, "hm"),
+    "merge_hole": _setup_merge_hole,
+    "merge_holes": _setup_merge_holes,
+    "find_path": _setup_find_path,
+    "find_paths": _setup_find_paths,
+    "locate": _setup_locate,
+}
+
+
+def measure(run, repeat: int) -> (float, int):
+    """
+    :return: (best wall time of `repeat` runs in seconds, peak traced memory in bytes)
+    """
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def fit_exponent(sizes: [int], seconds: [float]) -> float:
+    """
+    Slope of log(time) over log(n), on the runs long enough to be measured reliably.
+    """
+    points = [(n, t) for n, t in zip(sizes, seconds) if t > 1e-3]
+    if len(points) < 2:
+        return None
+    x, y = np.log([p[0] for p in points]), np.log([p[1] for p in points])
+    return float(np.polyfit(x, y, 1)[0])
+
+
+def run_suite(names: [str], sizes: [int], repeat: int, budget: float) -> dict:
+    results = []
+    fits = {}
+    for name in names:
+        measured = []
+        for n in sizes:
+            run, ops = BENCHMARKS[name](n)
+            seconds, peak = measure(run, repeat)
+            measured.append((n, seconds))
+            results.append({"benchmark": name, "n": n, "seconds": seconds,
+                            "ops_per_sec": ops / seconds if seconds > 0 else None,
+                            "peak_bytes": peak})
+            print(f"{name:24s} n={n:7d} {seconds * 1e3:10.3f} ms {peak / 1024:10.1f} KiB",
+                  file=sys.stderr)
+            if seconds > budget:
+                break
+        fits[name] = fit_exponent(*zip(*measured))
+    return {"meta": _meta(), "results": results, "exponents": fits}
+
+
+def _meta() -> dict:
+    try:
+        revision = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True,
+                                  text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        revision = None
+    return {"revision": revision, "python": platform.python_version(),
+            "numpy": np.__version__, "backend": kernels.backend(), "machine": platform.machine(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S")}
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> [str]:
+    """
+    :return: [str]  regressions of `report` against `baseline`
+    """
+    base = {(r["benchmark"], r["n"]): r["seconds"] for r in baseline["results"]}
+    issues = []
+    for r in report["results"]:
+        old = base.get((r["benchmark"], r["n"]))
+        if old and r["seconds"] > 1e-3 and r["seconds"] > old * tolerance:
+            issues.append(f"{r['benchmark']} n={r['n']}: {old:.4f} s -> {r['seconds']:.4f} s")
+    for name, exponent in report["exponents"].items():
+        old = baseline["exponents"].get(name)
+        if exponent is not None and old is not None and exponent > old + 0.25:
+            issues.append(f"{name}: exponent {old:.2f} -> {exponent:.2f}")
+    return issues
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="comma separated input sizes (#verts)")
+    parser.add_argument("--only", default="", help="comma separated benchmark name prefixes")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per size")
+    parser.add_argument("--budget", type=float, default=5.0,
+                        help="skip larger sizes once a run takes longer (seconds)")
+    parser.add_argument("--out", default="-", help="JSON output file, - for stdout")
+    parser.add_argument("--baseline", help="JSON output of a previous run to compare to")
+    parser.add_argument("--tolerance", type=float, default=1.5,
+                        help="slow-down ratio reported as a regression")
+    args = parser.parse_args()
+
+    prefixes = [p for p in args.only.split(",") if p]
+    names = [name for name in BENCHMARKS
+             if not prefixes or any(name.startswith(p) for p in prefixes)]
+    sizes = [int(s) for s in args.sizes.split(",")]
+    report = run_suite(names, sizes, args.repeat, args.budget)
+
+    text = json.dumps(report, indent=1)
+    if args.out == "-":
+        print(text)
+    else:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            issues = compare(report, json.load(f), args.tolerance)
+        for issue in issues:
+            print("REGRESSION", issue, file=sys.stderr)
+        return 1 if issues else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
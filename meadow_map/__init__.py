@@ -14,5 +14,19 @@ The method bases on Arkin, Ronald C.'s report "Path planning for a vision-based
 }
 """
 
+from .instrument import BuildStats, collect_stats
 from .convex_no_hole import convexify
-from .convex_with_hole import merge_hole
+from .convex_with_hole import merge_hole, merge_holes
+from .edge_index import EdgeIndex
+from .build_cache import BuildCache
+from .quantize import Quantizer
+from .navmesh import NavMesh
+from .locate import PointLocator
+from .tiles import build_tiled
+from .serialize import save_navmesh, load_navmesh
+from .landmarks import LandmarkTable
+from .pathfind import PathFinder, find_path, shared_finder
+from .hierarchical import HierarchicalPathFinder
+from .funnel import string_pull
+from .path_cache import PathCache
+from .parallel import PathWorkers, find_paths
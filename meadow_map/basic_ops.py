@@ -2,11 +2,116 @@
 Basic operations of Computational Geometry,
 which would be used in Meadow Mapping
 
+Every predicate comes in two flavours:
+(1) a scalar version (`left`, `left_on`, ...) that tests three single 2D points.
+(2) a batched version (`left_many`, `left_on_many`, ...) that tests (N, 2) arrays
+    of points (or index arrays to a shared `verts` buffer) in one NumPy call and
+    returns a boolean mask. Inputs broadcast, so a single (2, ) point could be
+    tested against an (N, 2) array directly.
+
+Orientation tests are exact (adaptive precision, see `predicates.py`), so results do not
+depend on the scale of the coordinates: `collinear` means exactly collinear.
+
 Refer to: https://github.com/w8r/orourke-compc
 """
 import numpy as np
+from .predicates import orient2d, orient2d_many
+
+__all__ = ["left", "left_on", "collinear", "between",
+           "cross_many", "left_many", "left_on_many", "collinear_many", "between_many"]
 
-__all__ = ["left", "left_on", "collinear", "between"]
+
+def _gather(verts: np.ndarray, x, y, z) -> (np.ndarray, np.ndarray, np.ndarray):
+    """
+    Turn index arrays to `verts` into point arrays. Do nothing if `verts` is None.
+    :param verts:  np.ndarray (#verts, 2) or None
+    :return:       (x, y, z) as point arrays
+    """
+    if verts is None:
+        return np.asarray(x), np.asarray(y), np.asarray(z)
+    return verts[x], verts[y], verts[z]
+
+
+def _take_axis(p: np.ndarray, axis: np.ndarray) -> np.ndarray:
+    """
+    Pick coordinate `axis` (0 for x, 1 for y) of each point in `p`.
+    """
+    return np.where(axis == 0, p[..., 0], p[..., 1])
+
+
+def cross_many(x: np.ndarray, y: np.ndarray, z: np.ndarray,
+               verts: np.ndarray = None) -> np.ndarray:
+    """
+    Compute cross product of (y - x) and (z - y) for batches of 2D-points.
+    The value is approximate but its sign is exact:
+    positive iff z is at left of xy, zero iff x, y, z are collinear.
+    :param x:      np.ndarray (N, 2) or (2, ), points of lines xy (index array if `verts` given)
+    :param y:      np.ndarray (N, 2) or (2, ), points of lines xy (index array if `verts` given)
+    :param z:      np.ndarray (N, 2) or (2, ), tested points (index array if `verts` given)
+    :param verts:  np.ndarray (#verts, 2) or None, shared buffer that x, y, z index into
+    :return:       np.ndarray (N, ) cross products
+    """
+    x, y, z = _gather(verts, x, y, z)
+    return orient2d_many(x, y, z)
+
+
+def left_many(x: np.ndarray, y: np.ndarray, z: np.ndarray,
+              verts: np.ndarray = None) -> np.ndarray:
+    """
+    Batched `left`: whether each point z is at left of line xy.
+    :param x:      np.ndarray (N, 2) or (2, ), points of lines xy (index array if `verts` given)
+    :param y:      np.ndarray (N, 2) or (2, ), points of lines xy (index array if `verts` given)
+    :param z:      np.ndarray (N, 2) or (2, ), tested points (index array if `verts` given)
+    :param verts:  np.ndarray (#verts, 2) or None, shared buffer that x, y, z index into
+    :return:       np.ndarray (N, ) bool mask
+    """
+    return cross_many(x, y, z, verts) > 0
+
+
+def left_on_many(x: np.ndarray, y: np.ndarray, z: np.ndarray,
+                 verts: np.ndarray = None) -> np.ndarray:
+    """
+    Batched `left_on`: whether each point z is at left of or on line xy.
+    :param x:      np.ndarray (N, 2) or (2, ), points of lines xy (index array if `verts` given)
+    :param y:      np.ndarray (N, 2) or (2, ), points of lines xy (index array if `verts` given)
+    :param z:      np.ndarray (N, 2) or (2, ), tested points (index array if `verts` given)
+    :param verts:  np.ndarray (#verts, 2) or None, shared buffer that x, y, z index into
+    :return:       np.ndarray (N, ) bool mask
+    """
+    return cross_many(x, y, z, verts) >= 0
+
+
+def collinear_many(x: np.ndarray, y: np.ndarray, z: np.ndarray,
+                   verts: np.ndarray = None) -> np.ndarray:
+    """
+    Batched `collinear`: whether each triple x, y, z is on the same 2D-line.
+    :param x:      np.ndarray (N, 2) or (2, ), points (index array if `verts` given)
+    :param y:      np.ndarray (N, 2) or (2, ), points (index array if `verts` given)
+    :param z:      np.ndarray (N, 2) or (2, ), points (index array if `verts` given)
+    :param verts:  np.ndarray (#verts, 2) or None, shared buffer that x, y, z index into
+    :return:       np.ndarray (N, ) bool mask
+    """
+    return cross_many(x, y, z, verts) == 0
+
+
+def between_many(x: np.ndarray, y: np.ndarray, z: np.ndarray,
+                 verts: np.ndarray = None) -> np.ndarray:
+    """
+    Batched `between`: assume each triple x, y, z is collinear, test whether z is
+    between 2D-line xy or not.
+    :param x:      np.ndarray (N, 2) or (2, ), points of lines xy (index array if `verts` given)
+    :param y:      np.ndarray (N, 2) or (2, ), points of lines xy (index array if `verts` given)
+    :param z:      np.ndarray (N, 2) or (2, ), tested points (index array if `verts` given)
+    :param verts:  np.ndarray (#verts, 2) or None, shared buffer that x, y, z index into
+    :return:       np.ndarray (N, ) bool mask
+    """
+    x, y, z = _gather(verts, x, y, z)
+    # compare on x-axis unless line xy is vertical
+    axis = np.where(x[..., 0] != y[..., 0], 0, 1)
+    xa = _take_axis(x, axis)
+    ya = _take_axis(y, axis)
+    za = _take_axis(z, axis)
+    return ((xa <= za) & (za <= ya)) | ((xa >= za) & (za >= ya))
 
 
 def left(x: np.ndarray, y: np.ndarray, z: np.ndarray) -> bool:
@@ -17,9 +122,7 @@ def left(x: np.ndarray, y: np.ndarray, z: np.ndarray) -> bool:
     :param z: np.ndarray, a 2D vector (point)
     :return: whether point z is at left of xy
     """
-    xy = y - x
-    yz = z - y
-    return (xy[0] * yz[1] - xy[1] * yz[0]) > 0
+    return orient2d(x, y, z) > 0
 
 
 def left_on(x: np.ndarray, y: np.ndarray, z: np.ndarray) -> bool:
@@ -30,9 +133,7 @@ def left_on(x: np.ndarray, y: np.ndarray, z: np.ndarray) -> bool:
     :param z: np.ndarray, a 2D vector (point)
     :return: whether point z is at left of or on xy
     """
-    xy = y - x
-    yz = z - y
-    return (xy[0] * yz[1] - xy[1] * yz[0]) >= 0
+    return orient2d(x, y, z) >= 0
 
 
 def collinear(x: np.ndarray, y: np.ndarray, z: np.ndarray) -> bool:
@@ -43,14 +144,7 @@ def collinear(x: np.ndarray, y: np.ndarray, z: np.ndarray) -> bool:
     :param z: np.ndarray, a 2D vector (point)
     :return: whether there is a line pass x, y, z at the same time
     """
-    xy = y - x
-    yz = z - y
-
-    area = xy[0] * yz[1] - xy[1] * yz[0]
-    # distance of z to line xy
-    dist = area / (xy[0] * xy[0] + xy[1] * xy[1] + 1e-6)
-
-    return np.abs(dist) < 1e-6
+    return orient2d(x, y, z) == 0
 
 
 def between(x: np.ndarray, y: np.ndarray, z: np.ndarray) -> bool:
@@ -62,14 +156,4 @@ def between(x: np.ndarray, y: np.ndarray, z: np.ndarray) -> bool:
     :param z: np.ndarray, a 2D vector (point)
     :return:
     """
-    if x[0] != y[0]:
-        if x[0] <= z[0] <= y[0]:
-            return True
-        if x[0] >= z[0] >= y[0]:
-            return True
-    else:
-        if x[1] <= z[1] <= y[1]:
-            return True
-        if x[1] >= z[1] >= y[1]:
-            return True
-    return False
+    return between_many(x, y, z)
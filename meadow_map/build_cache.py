@@ -0,0 +1,176 @@
+"""
+On-disk cache of `merge_holes` and `convexify` results, keyed on a hash of their input.
+
+The key is the SHA-256 of the operation name, its options, `ALGORITHM_VERSION` and the
+dtype, shape and bytes of every input array. Results are stored as one `.npz` file per key.
+A hit costs one hash and one file read. The directory is bounded in size: the least recently
+used files (by modification time, refreshed on every hit) are removed first. Unreadable files
+(e.g. truncated by a crash or a full disk) are removed when read, and count as misses.
+"""
+import hashlib
+import os
+import tempfile
+import zipfile
+import numpy as np
+from .convex_no_hole import convexify
+from .convex_with_hole import merge_holes
+
+__all__ = ["BuildCache", "ALGORITHM_VERSION", "cached_convexify", "cached_merge_holes"]
+
+# bump when `merge_holes` or `convexify` may give another result for the same input
+# "2": exact orientation predicates (`predicates.py`)
+# "3": exact integer predicates beyond MAX_COORD
+ALGORITHM_VERSION = "3"
+
+
+class BuildCache:
+    """
+    Size-bounded directory of build results, with LRU eviction.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 256 << 20, enabled: bool = True):
+        """
+        :param directory:  str   cache directory, created if missing
+        :param max_bytes:  int   max total size of the cached files
+        :param enabled:    bool  False to bypass the cache (always compute, never store)
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(op: str, *arrays: np.ndarray, **options) -> str:
+        """
+        :param op:       str         name of the operation
+        :param arrays:   np.ndarray  input arrays
+        :param options:  str/int     other inputs of the operation
+        :return:         str         hex digest identifying the result
+        """
+        digest = hashlib.sha256(f"{op}:{ALGORITHM_VERSION}:{sorted(options.items())}".encode())
+        for arr in arrays:
+            arr = np.ascontiguousarray(arr)
+            digest.update(f"{arr.dtype.str}{arr.shape}".encode())
+            digest.update(arr.tobytes())
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".npz")
+
+    def get(self, key: str, *names: str) -> {str: np.ndarray}:
+        """
+        :param key:    str               key of the result
+        :param names:  str               names of the arrays expected, all stored arrays if
+                                         none given. A file without one of them is invalid.
+        :return:       {str: np.ndarray} the stored arrays, None if missing, invalid (the file
+                                         is then removed) or cache disabled
+        """
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            with np.load(path) as data:
+                arrays = {name: data[name] for name in names or data.files}
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError, EOFError, KeyError, zipfile.BadZipFile):
+            self.misses += 1
+            self._remove(path)
+            return None
+        self.hits += 1
+        return arrays
+
+    def put(self, key: str, **arrays: np.ndarray) -> None:
+        """
+        Store arrays under `key` (atomically), then evict old files beyond `max_bytes`.
+        """
+        if not self.enabled:
+            return
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp, self._path(key))
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".npz"):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def clear(self) -> None:
+        """
+        Remove all cached files.
+        """
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".npz"):
+                os.remove(entry.path)
+
+
+def cached_convexify(verts: np.ndarray, indices: np.ndarray, method: str = "arkin",
+                     cache: BuildCache = None) -> [[np.ndarray], [(int, int)]]:
+    """
+    `convexify` through a BuildCache (computed as usual if `cache` is None).
+    :return:  same as `convexify`
+    """
+    if cache is None or not cache.enabled:
+        return convexify(verts, indices, method=method)
+    indices = np.asarray(indices)
+    key = BuildCache.key("convexify", verts, indices, method=method)
+    hit = cache.get(key, "poly_offsets", "poly_verts", "diags")
+    if hit is not None:
+        offsets = hit["poly_offsets"]
+        polys = [hit["poly_verts"][a:b] for a, b in zip(offsets[:-1], offsets[1:])]
+        return polys, [tuple(d) for d in hit["diags"].tolist()]
+
+    polys, diags = convexify(verts, indices, method=method)
+    offsets = np.zeros(len(polys) + 1, dtype=np.int64)
+    np.cumsum([len(p) for p in polys], out=offsets[1:])
+    cache.put(key, poly_offsets=offsets,
+              poly_verts=np.concatenate([np.asarray(p) for p in polys] + [indices[:0]]),
+              diags=np.array(diags, dtype=np.int64).reshape(-1, 2))
+    return polys, diags
+
+
+def cached_merge_holes(verts_poly: np.ndarray, indices_poly: np.ndarray,
+                       holes: [(np.ndarray, np.ndarray)],
+                       cache: BuildCache = None) -> (np.ndarray, [int], [(int, int)]):
+    """
+    `merge_holes` through a BuildCache (computed as usual if `cache` is None).
+    :return:  same as `merge_holes`
+    """
+    if cache is None or not cache.enabled:
+        return merge_holes(verts_poly, indices_poly, holes)
+    arrays = [verts_poly, np.asarray(indices_poly)]
+    for verts_hole, indices_hole in holes:
+        arrays += [verts_hole, np.asarray(indices_hole)]
+    key = BuildCache.key("merge_holes", *arrays, holes=len(holes))
+    hit = cache.get(key, "verts", "indices", "diags")
+    if hit is not None:
+        return hit["verts"], hit["indices"].tolist(), [tuple(d) for d in hit["diags"].tolist()]
+
+    verts, indices, diags = merge_holes(verts_poly, indices_poly, holes)
+    cache.put(key, verts=verts, indices=np.array(indices, dtype=np.int64),
+              diags=np.array(diags, dtype=np.int64).reshape(-1, 2))
+    return verts, indices, diags
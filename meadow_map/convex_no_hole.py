@@ -13,8 +13,11 @@ The method bases on Arkin, Ronald C.'s report "Path planning for a vision-based
 }
 """
 import numpy as np
+from . import instrument, kernels
 from .diag import diagonal
 from .basic_ops import left_on
+from .edge_index import EdgeIndex
+from .hertel_mehlhorn import hertel_mehlhorn
 
 __all__ = ["find_concave_vertex", "convexify"]
 
@@ -27,6 +30,12 @@ def find_concave_vertex(verts: np.ndarray, indices: np.ndarray) -> int:
     :return:           int                     the index of `indices`
     """
     n = len(indices)
+    if instrument.ACTIVE is not None:
+        instrument.ACTIVE.count("find_concave_vertex")
+    indices = np.asarray(indices, dtype=np.int64)
+    kernel = kernels.active(verts, indices)
+    if kernel is not None:
+        return kernel.find_concave_vertex(verts, indices)
     for ia in range(n):
         ia_prev = ia - 1 if ia - 1 >= 0 else n - 1
         ia_next = ia + 1 if ia + 1 < n else 0
@@ -36,76 +45,111 @@ def find_concave_vertex(verts: np.ndarray, indices: np.ndarray) -> int:
     return -1
 
 
-def convexify(verts: np.ndarray, indices: np.ndarray) -> [[np.ndarray], [(int, int)]]:
+def _find_break(verts: np.ndarray, sub: np.ndarray, i_concave: int,
+                edge_index: EdgeIndex) -> int:
+    """
+    First index i of `sub` such that <i_concave, i> is an internal diagonal, -1 if none.
+    """
+    stats = instrument.ACTIVE
+    if kernels.ACTIVE is not None and edge_index is None and stats is None:
+        sub = np.asarray(sub, dtype=np.int64)
+        kernel = kernels.active(verts, sub)
+        if kernel is not None:
+            # the whole search in one kernel call
+            return kernel.find_break(verts, sub, i_concave)
+    for i in range(len(sub)):
+        if i != i_concave:
+            if stats is not None:
+                stats.count("convexify.diagonals_tested")
+            if diagonal(verts, sub, i_concave, i, edge_index):
+                return i
+    return -1
+
+
+@instrument.timed("convexify")
+def convexify(verts: np.ndarray, indices: np.ndarray, edge_index: EdgeIndex = None,
+              method: str = "arkin") -> [[np.ndarray], [(int, int)]]:
     """
     Turn a simple polygon into a list of convex polygons that shares the same area.
     This divide-and-conquer methods base on Arkin, Ronald C.'s report (1987).
     "Path planning for a vision-based autonomous robot"
 
+    The recursion is driven by an explicit work stack, so polygons with thousands of
+    concave vertices do not hit Python's recursion limit.
+
     :param verts:       np.ndarray (#verts, 2)  a list of 2D-vertices position
     :param indices:     np.ndarray (#vert, )    a list of polygon vertex index (to array `verts`)
+    :param edge_index:  EdgeIndex or None       optional index over the edges of the polygon
+                                                (e.g. `EdgeIndex(verts, indices)`) to speed up
+                                                diagonal tests. It is shared by sub-polygons and
+                                                receives every diagonal that splits the polygon.
+    :param method:      str                     "arkin": divide-and-conquer (default).
+                                                "hm": triangulate + Hertel-Mehlhorn merge, see
+                                                `hertel_mehlhorn.py`. `edge_index` is not used.
     :return:  ([np.ndarray], [(int, int)])
         a list of indices of `verts` that constructs convex areas
         e.g: [np.array(p1_i1, p1_i2, p1_i3, ..), np.array(p2_i1, ...), ..]
 
-        list of diagonals that splits the input polygon.
+        list of diagonals that splits the input polygon, as index of `indices`.
         e.g: [(diag1_a_index, diag1_b_index), ...]
     """
-    n = len(indices)
-    i_concave = find_concave_vertex(verts, indices)
-
-    # if there is no concave vertex, which means current polygon is convex. Return itself directly
-    if i_concave == -1:
-        return [indices], []
-
-    # Find vertex i_break that `<i_concave, i_break>` is an internal edge
-    i_break = -1
-    for i in range(n):
-        if i != i_concave:
-            if diagonal(verts, indices, i_concave, i):
-                i_break = i
-                break
-
-    # Not find (should not happen!)
-    if i_break == -1:
-        # Just keep that weird region for now
-        # TBD: raise a warning
-        return [indices], []
-
-    # Split the simple polygon by <i_concave, i_break>
-    indices1 = []
-    indices2 = []
-    i_now = i_concave
-
-    while i_now != i_break:
-        indices1.append(indices[i_now])
-        i_now = (i_now + 1) % n
-    indices1.append(indices[i_break])
-
-    while i_now != i_concave:
-        indices2.append(indices[i_now])
-        i_now = (i_now + 1) % n
-    indices2.append(indices[i_concave])
-
-    # keep convexifying new-ly generated two areas in a recursive manner
-    i1, diag1 = convexify(verts, indices1)
-    i2, diag2 = convexify(verts, indices2)
-
-    # merge results from recursively convexify
-    ret_diag = [[i_concave, i_break]]
-    for diag in diag1:
-        ret_diag.append(
-            (
-                (diag[0] + i_concave) % n,
-                (diag[1] + i_concave) % n
-            )
-        )
-    for diag in diag2:
-        ret_diag.append(
-            (
-                (diag[0] + i_break) % n,
-                (diag[1] + i_break) % n
-            )
-        )
-
-    return i1 + i2, ret_diag
+    if method == "hm":
+        return hertel_mehlhorn(verts, indices)
+    if method != "arkin":
+        raise ValueError(f"Unknown convexify method: {method}")
+
+    indices = np.asarray(indices)
+    polys = []
+    diags = []
+
+    # Each work item is a sub-polygon, stored as positions in `indices`. A diagonal
+    # found in it is then directly a diagonal of the input polygon (no re-mapping).
+    # The second half of a split is pushed first, so the output keeps the same order
+    # as the depth-first recursion: first half (and all its splits) before second half.
+    stack = [(np.arange(len(indices)), 0)]
+    stats = instrument.ACTIVE
+    while stack:
+        pos, depth = stack.pop()
+        sub = indices[pos]
+        n = len(pos)
+        i_concave = find_concave_vertex(verts, sub)
+        if stats is not None:
+            stats.maximum("convexify.depth", depth)
+            stats.size("convexify.subpolygon", n)
+
+        # if there is no concave vertex, which means current polygon is convex. Keep it
+        if i_concave == -1:
+            polys.append(sub)
+            continue
+
+        # Find vertex i_break that `<i_concave, i_break>` is an internal edge
+        i_break = _find_break(verts, sub, i_concave, edge_index)
+
+        # Not find (should not happen!)
+        if i_break == -1:
+            # Just keep that weird region for now
+            # TBD: raise a warning
+            polys.append(sub)
+            continue
+
+        # sub-polygons share the index, the split diagonal becomes an edge of both
+        if edge_index is not None:
+            edge_index.add_edge(sub[i_concave], sub[i_break])
+
+        diags.append((int(pos[i_concave]), int(pos[i_break])))
+        if stats is not None:
+            stats.count("convexify.diagonals_accepted")
+
+        # Split the simple polygon by <i_concave, i_break>
+        if i_concave < i_break:
+            pos1 = pos[i_concave:i_break + 1]
+            pos2 = np.concatenate((pos[i_break:], pos[:i_concave + 1]))
+        else:
+            pos1 = np.concatenate((pos[i_concave:], pos[:i_break + 1]))
+            pos2 = pos[i_break:i_concave + 1]
+
+        # keep convexifying new-ly generated two areas
+        stack.append((pos2, depth + 1))
+        stack.append((pos1, depth + 1))
+
+    return polys, diags
@@ -15,22 +15,26 @@ Ronald C.'s report "Path planning for a vision-based autonomous robot".
 """
 
 import numpy as np
-from .intersect import intersect
+from . import instrument, kernels
+from .intersect import intersect_many
+from .basic_ops import left_many, left_on_many
+from .edge_index import EdgeIndex
 
 
-__all__ = ["merge_hole"]
+__all__ = ["merge_hole", "merge_holes"]
 
 
 def merge_hole(verts_poly: np.ndarray, indices_poly: np.ndarray,
                verts_hole: np.ndarray, indices_hole: np.ndarray
                ) -> (np.ndarray, np.ndarray, (int,)):
     """
-    Merge hole into polygon. Connect arbitrary vertex on hole to some vertex in polygon in sight.
+    Merge hole into polygon. Connect the leftmost vertex on hole to the nearest vertex
+    in polygon in sight, see `merge_holes`.
 
     This method refer to Recast Navigation's implementation.
 
     Remark: `indices_poly` should be in counter-clock wise.
-    Remark: `indices_hole` should be in counter-clock wise.
+    Remark: `indices_hole` should be in clock wise.
     :param verts_poly:     np.ndarray (#verts, 2)
                            a list of 2D-vertices position of simple polygon
 
@@ -41,70 +45,159 @@ def merge_hole(verts_poly: np.ndarray, indices_poly: np.ndarray,
     :param verts_hole:     np.ndarray (#verts, 2)
                            a list of 2D-vertices position of hole
 
-    :param indices_hole:   np.ndarray (#verts, 2)
+    :param indices_hole:   np.ndarray (#vert, )
                            a list of polygon vertex index (to array `verts`) of hole
 
     :return: (verts_out: np.ndarray (#verts, 2), indices_out: np.ndarray (#vert, ), diag: (0, 1)):
             (1) output a polygon in (verts_out, indices_out) that merges the hole.
             (2) `diag` is index of edge that merges poly and hole.
     """
-    n_poly = len(indices_poly)
-    n_poly_verts = verts_poly.shape[0]
-    n_hole = len(indices_hole)
-    n_hole_verts = verts_hole.shape[0]
-
-    hole_i = indices_hole[0]
-
-    # traverse all vertex in poly to check whether it is in `hole_i`'s line of sight
-    for poly_idx, poly_i in enumerate(indices_poly):
-        okay = True
-        # check whether `hole_i, poly_i` intersects with each poly edge
-        for poly_edge in range(n_poly):
-            poly_ai = indices_poly[poly_edge]
-            poly_bi = indices_poly[(poly_edge + 1) % n_poly]
-            # skip check with shared vertex `poly_i`
-            if poly_i in (poly_ai, poly_bi):
-                continue
-            if intersect(
-                    verts_poly[poly_i], verts_hole[hole_i], verts_poly[poly_ai], verts_poly[poly_bi]
-            ):
-                okay = False
-                break
-        # check whether `hole_i, poly_i` intersects with each hole edge
-        if not okay:
+    verts_out, indices_out, diags = merge_holes(
+        verts_poly, indices_poly, [(verts_hole, indices_hole)]
+    )
+
+    # Fail fallback: discard the hole
+    if not diags:
+        return verts_poly, indices_poly, None
+
+    return verts_out, indices_out, diags[0]
+
+
+def _bridge_cone(pts: np.ndarray, hole_pt: np.ndarray) -> np.ndarray:
+    """
+    `in_cone` of <outline vertex, hole vertex> for every outline vertex at once.
+    :param pts:      np.ndarray (#vert, 2)  outline vertices, CCW
+    :param hole_pt:  np.ndarray (2, )       hole vertex
+    :return:         np.ndarray (#vert, )   bool mask
+    """
+    pts_prev = np.roll(pts, 1, axis=0)
+    pts_next = np.roll(pts, -1, axis=0)
+    convex = left_on_many(pts_prev, pts, pts_next)
+    return np.where(
+        convex,
+        left_many(pts, hole_pt, pts_prev) & left_many(hole_pt, pts, pts_next),
+        ~(left_on_many(pts, hole_pt, pts_next) & left_on_many(hole_pt, pts, pts_prev))
+    )
+
+
+def _find_bridge(verts: np.ndarray, outline: [int], hole_vi: int, edge_index: EdgeIndex) -> int:
+    """
+    Find the nearest vertex of `outline` that could see hole vertex `hole_vi`.
+
+    A candidate vertex should have `hole_vi` in its cone (see `diag.in_cone`), and the
+    line between them should not intersect with any edge in `edge_index` (except for the
+    edges incident to the candidate or to `hole_vi`). Candidates are tried from the
+    nearest one, and the search stops at the first one in sight.
+    :param verts:       np.ndarray (#verts, 2)  a list of 2D-vertices position
+    :param outline:     [int]                   polygon vertex index (to array `verts`), CCW
+    :param hole_vi:     int                     index (to array `verts`) of the hole vertex
+    :param edge_index:  EdgeIndex               index over all edges blocking the line of sight
+    :return:            int                     index of `outline`, -1 if nothing is in sight
+    """
+    outline = np.asarray(outline, dtype=np.int64)
+    hole_pt = verts[hole_vi]
+    kernel = kernels.active(verts, outline, hole_vi)
+    if kernel is not None:
+        cone = kernel.bridge_cone(verts, outline, hole_vi)
+    else:
+        cone = _bridge_cone(verts[outline], hole_pt)
+    candidates = np.flatnonzero(cone)
+    dist = np.sum((verts[outline[candidates]] - hole_pt).astype(np.float64) ** 2, axis=1)
+    candidates = candidates[np.argsort(dist, kind="stable")]
+    stats = instrument.ACTIVE
+    if stats is not None:
+        stats.count("merge_holes.bridge_searches")
+        stats.size("merge_holes.candidates_in_cone", len(candidates))
+
+    for k in candidates:
+        if stats is not None:
+            stats.count("merge_holes.bridges_tested")
+        poly_vi = outline[k]
+        edges_a, edges_b = edge_index.query(verts[poly_vi], hole_pt)
+        kernel = kernels.active(verts, poly_vi, edges_a, edges_b)
+        if kernel is not None:
+            if stats is not None:
+                stats.count("segment_hits.edges", len(edges_a))
+            if not kernel.segment_hits(verts, poly_vi, hole_vi, edges_a, edges_b):
+                return int(k)
             continue
-        for hole_edge in range(n_hole):
-            hole_ai = indices_hole[hole_edge]
-            hole_bi = indices_hole[(hole_edge + 1) % n_hole]
-            # skip check with shared vertex `hole_i`
-            if hole_i in (hole_ai, hole_bi):
-                continue
-            if intersect(verts_poly[poly_i], verts_hole[hole_i],
-                         verts_hole[hole_ai], verts_hole[hole_bi]):
-                okay = False
-                break
+        keep = (edges_a != poly_vi) & (edges_b != poly_vi) & \
+               (edges_a != hole_vi) & (edges_b != hole_vi)
+        if not intersect_many(verts[poly_vi], hole_pt, verts[edges_a[keep]], verts[edges_b[keep]],
+                              any_hit=True):
+            return int(k)
+    return -1
+
+
+@instrument.timed("merge_holes")
+def merge_holes(verts_poly: np.ndarray, indices_poly: np.ndarray,
+                holes: [(np.ndarray, np.ndarray)]
+                ) -> (np.ndarray, [int], [(int, int)]):
+    """
+    Merge all holes into polygon in one pass, like Recast Navigation's `mergeRegionHoles`.
+
+    Holes are merged from left to right (sorted by their leftmost vertex). Each hole is
+    connected from its leftmost vertex to the nearest polygon vertex in sight. If no
+    polygon vertex could be seen, the next vertex of the hole is tried.
 
-        if okay:
-            verts_out = np.concatenate((verts_poly, verts_hole), axis=0)
-            indices_out = [poly_i, hole_i + n_poly_verts]
-            # all hole index applied an offset of nPoly
+    Line of sight is tested against an `EdgeIndex` over the polygon and all holes, built
+    once and extended with every merging edge.
+
+    Remark: `indices_poly` should be in counter-clock wise.
+    Remark: `indices_hole` of each hole should be in clock wise.
+    :param verts_poly:     np.ndarray (#verts, 2)
+                           a list of 2D-vertices position of simple polygon
 
-            # add hole verts to out
-            now_holei = 1 % n_hole
-            while indices_hole[now_holei] != hole_i:
-                indices_out.append(indices_hole[now_holei] + n_poly_verts)
-                now_holei = (now_holei + 1) % n_hole
+    :param indices_poly:   np.ndarray (#vert, )
+                           a list of polygon vertex index (to array `verts_poly`)
+                           of simple polygon
 
-            indices_out.append(hole_i + n_poly_verts)
-            indices_out.append(poly_i)
+    :param holes:          [(np.ndarray (#verts, 2), np.ndarray (#vert, ))]
+                           a list of (verts_hole, indices_hole) of each hole
 
-            # add poly verts to out
-            now_polyi = (poly_idx + 1) % n_poly
-            while indices_poly[now_polyi] != poly_i:
-                indices_out.append(indices_poly[now_polyi])
-                now_polyi = (now_polyi + 1) % n_poly
+    :return: (verts_out: np.ndarray (#verts, 2), indices_out: [int], diags: [(int, int)]):
+            (1) output a polygon in (verts_out, indices_out) that merges all holes.
+                `verts_out` stacks `verts_poly` and `verts_hole` of each hole in input order.
+            (2) `diags` is index (to array `verts_out`) of edges that merge poly and holes,
+                as (hole vertex, poly vertex). A hole that could not be merged is discarded
+                and has no diagonal.
+    """
+    # one shared vertex buffer, hole indices are offset into it
+    verts_out = np.concatenate([verts_poly] + [verts_hole for verts_hole, _ in holes], axis=0)
+    offsets = np.cumsum([verts_poly.shape[0]] + [verts_hole.shape[0] for verts_hole, _ in holes])
+    hole_rings = [np.asarray(indices_hole, dtype=np.int64) + offset
+                  for (_, indices_hole), offset in zip(holes, offsets[:-1])]
+
+    # sort holes by leftmost vertex (min x, then min y) and rotate it to the front
+    leftmost = []
+    for ring in hole_rings:
+        pts = verts_out[ring]
+        leftmost.append(int(np.lexsort((pts[:, 1], pts[:, 0]))[0]))
+    order = sorted(range(len(holes)),
+                   key=lambda h: tuple(verts_out[hole_rings[h][leftmost[h]]]))
+    hole_rings = [np.roll(hole_rings[h], -leftmost[h]) for h in order]
+
+    # polygon edges and all hole edges block the line of sight, merging edges are added
+    # once created. Together they are exactly the edges of the growing outline plus the
+    # holes not merged yet.
+    edge_index = EdgeIndex(verts_out, indices_poly)
+    for ring in hole_rings:
+        edge_index.add_edges(ring, np.roll(ring, -1))
+
+    outline = [int(i) for i in indices_poly]
+    diags = []
+    for ring in hole_rings:
+        for corner, hole_vi in enumerate(ring.tolist()):
+            k = _find_bridge(verts_out, outline, hole_vi, edge_index)
+            if k == -1:
+                continue
 
-            return verts_out, indices_out, (hole_i + n_poly_verts, poly_i)
+            # splice: .., poly_vi, hole_vi, (rest of hole), hole_vi, poly_vi, ..
+            poly_vi = outline[k]
+            hole_seq = np.roll(ring, -corner).tolist()
+            outline = outline[:k + 1] + hole_seq + [hole_vi, poly_vi] + outline[k + 1:]
+            edge_index.add_edge(hole_vi, poly_vi)
+            diags.append((hole_vi, poly_vi))
+            break
 
-    # Fail fallback: discard the hole
-    return verts_poly, indices_poly, None
+    return verts_out, outline, diags
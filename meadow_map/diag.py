@@ -10,13 +10,16 @@ A diagonal of simple polygon is internal iff
 Refer to: https://github.com/w8r/orourke-compc
 """
 import numpy as np
-from .intersect import intersect
+from . import instrument, kernels
+from .intersect import intersect_many
 from .basic_ops import left, left_on
+from .edge_index import EdgeIndex
 
 __all__ = ["diagonalie", "in_cone", "diagonal"]
 
 
-def diagonalie(verts: np.ndarray, indices: np.ndarray, ia: int, ib: int) -> bool:
+def diagonalie(verts: np.ndarray, indices: np.ndarray, ia: int, ib: int,
+               edge_index: EdgeIndex = None) -> bool:
     """
     Check whether diagonal <ia, ib> is internal/external diagonal that
     does not intersect with any edge in poly (except for incident edge of ia, ib).
@@ -34,25 +37,35 @@ def diagonalie(verts: np.ndarray, indices: np.ndarray, ia: int, ib: int) -> bool
     :param ib:       int
                      index of `indices` (index to array `verts`) of tested poly diagonal
 
+    :param edge_index: EdgeIndex or None
+                     if given, only test edges returned by its query instead of every
+                     edge in poly. It should contain all edges of the poly, e.g. built on
+                     a parent poly sharing `verts` plus the diagonals that split it.
+
     :return:         bool
                      whether <ia, ib> is an external or internal diagonal
     """
-    n = len(indices)
-
-    for now_i in range(n):
-        # exclude edges contains point a and point b
-        if indices[now_i] == indices[ia] or indices[now_i] == indices[ib]:
-            continue
-        next_i = (now_i + 1) % n
-        if indices[next_i] == indices[ia] or indices[next_i] == indices[ib]:
-            continue
-
-        if intersect(
-                verts[indices[ia]], verts[indices[ib]],
-                verts[indices[now_i]], verts[indices[next_i]]
-        ):
-            return False
-    return True
+    indices = np.asarray(indices)
+    a, b = indices[ia], indices[ib]
+    if instrument.ACTIVE is not None:
+        instrument.ACTIVE.count("diagonalie")
+
+    if edge_index is None:
+        edges_a = indices
+        edges_b = np.roll(indices, -1)
+    else:
+        edges_a, edges_b = edge_index.query(verts[a], verts[b])
+    kernel = kernels.active(verts, a, b, edges_a, edges_b)
+    if kernel is not None:
+        if instrument.ACTIVE is not None:
+            instrument.ACTIVE.count("segment_hits.edges", len(edges_a))
+        return not kernel.segment_hits(verts, a, b, edges_a, edges_b)
+    # exclude edges contains point a and point b
+    keep = (edges_a != a) & (edges_a != b) & (edges_b != a) & (edges_b != b)
+
+    return not intersect_many(
+        verts[a], verts[b], verts[edges_a[keep]], verts[edges_b[keep]], any_hit=True
+    )
 
 
 def in_cone(verts: np.ndarray, indices: np.ndarray, ia: int, ib: int) -> bool:
@@ -76,6 +89,12 @@ def in_cone(verts: np.ndarray, indices: np.ndarray, ia: int, ib: int) -> bool:
     :return:           bool
                        whether diagonal <ia, ib> is in cone
     """
+    if instrument.ACTIVE is not None:
+        instrument.ACTIVE.count("in_cone")
+    kernel = kernels.active(verts, indices)
+    if kernel is not None:
+        return kernel.in_cone(verts, np.asarray(indices, dtype=np.int64), ia, ib)
+
     # Check whether (ia, ib) is in cone of (ia-, ia, ia+)
     n = len(indices)
     ia_prev = ia - 1 if ia - 1 >= 0 else n - 1
@@ -94,7 +113,8 @@ def in_cone(verts: np.ndarray, indices: np.ndarray, ia: int, ib: int) -> bool:
                 left_on(verts[ib], verts[ia], verts[ia_prev]))
 
 
-def diagonal(verts: np.ndarray, indices: np.ndarray, ia: int, ib: int) -> bool:
+def diagonal(verts: np.ndarray, indices: np.ndarray, ia: int, ib: int,
+             edge_index: EdgeIndex = None) -> bool:
     """
     Check whether diagonal <ia, ib> is internal diagonal
 
@@ -111,9 +131,12 @@ def diagonal(verts: np.ndarray, indices: np.ndarray, ia: int, ib: int) -> bool:
     :param ib:         int
                        index of `indices` (index to array `verts`) of tested poly diagonal
 
+    :param edge_index: EdgeIndex or None
+                       optional edge index passed to `diagonalie`
+
     :return:           bool
                        whether diagonal<ia, ib> is an internal diagonal
     """
     return in_cone(verts, indices, ia, ib) and \
            in_cone(verts, indices, ib, ia) and \
-           diagonalie(verts, indices, ia, ib)
+           diagonalie(verts, indices, ia, ib, edge_index)
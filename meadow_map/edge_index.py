@@ -0,0 +1,135 @@
+"""
+Uniform-grid spatial index over polygon edges.
+
+A segment-vs-edges test (e.g. `diag.diagonalie`) only needs to look at the edges
+whose bounding boxes overlap the tested segment. The index stores edges as pairs of
+vertex index (to array `verts`), so it could be built once for a polygon and shared
+by every sub-polygon split from it, as they all reuse the same `verts` array.
+New edges (e.g. accepted diagonals) could be added after the index is built.
+
+Bounding boxes are slightly padded, so rounding of the boxes never makes the query drop
+an edge that `intersect` (exact, see `predicates.py`) would report.
+"""
+import numpy as np
+
+__all__ = ["EdgeIndex"]
+
+
+class EdgeIndex:
+    """
+    Uniform grid of edge buckets over the bounding box of `verts`.
+    """
+
+    def __init__(self, verts: np.ndarray, indices: np.ndarray = None, cell_size: float = None):
+        """
+        :param verts:      np.ndarray (#verts, 2)  a list of 2D-vertices position
+        :param indices:    np.ndarray (#vert, )    a list of polygon vertex index (to array
+                                                   `verts`), its edges are inserted into the index.
+        :param cell_size:  float                   side length of grid cells. Chosen from the
+                                                   bounding box and #edges if not given.
+        """
+        self.verts = verts
+        n_hint = len(indices) if indices is not None else verts.shape[0]
+
+        self._lo = verts.min(axis=0).astype(np.float64)
+        extent = np.maximum(verts.max(axis=0) - self._lo, 1e-9)
+        if cell_size is None:
+            # about one edge per cell on average
+            cell_size = np.sqrt(extent[0] * extent[1] / max(n_hint, 1))
+            cell_size = max(cell_size, extent.max() / 1024.0)
+        self.cell_size = float(cell_size)
+        self._nx = int(extent[0] // self.cell_size) + 1
+        self._ny = int(extent[1] // self.cell_size) + 1
+
+        self._cells = {}
+        self._n = 0
+        self._edges = np.empty((max(n_hint, 4), 2), dtype=np.int64)
+        self._boxes = np.empty((max(n_hint, 4), 4), dtype=np.float64)
+
+        if indices is not None and len(indices) > 0:
+            indices = np.asarray(indices, dtype=np.int64)
+            self.add_edges(indices, np.roll(indices, -1))
+
+    def __len__(self) -> int:
+        return self._n
+
+    @staticmethod
+    def _padded_boxes(p: np.ndarray, q: np.ndarray) -> np.ndarray:
+        """
+        Bounding boxes (min_x, min_y, max_x, max_y) of segments pq, slightly padded.
+        """
+        pad = 1e-6 * np.hypot(q[..., 0] - p[..., 0], q[..., 1] - p[..., 1]) + 1e-9
+        lo = np.minimum(p, q) - pad[..., None]
+        hi = np.maximum(p, q) + pad[..., None]
+        return np.concatenate((lo, hi), axis=-1)
+
+    def _cell_range(self, box: np.ndarray) -> (int, int, int, int):
+        """
+        Range of grid cells (inclusive) covered by a bounding box.
+        """
+        x0, y0 = ((box[:2] - self._lo) // self.cell_size).astype(np.int64)
+        x1, y1 = ((box[2:] - self._lo) // self.cell_size).astype(np.int64)
+        return (min(max(x0, 0), self._nx - 1), min(max(y0, 0), self._ny - 1),
+                min(max(x1, 0), self._nx - 1), min(max(y1, 0), self._ny - 1))
+
+    def add_edges(self, ia: np.ndarray, ib: np.ndarray) -> None:
+        """
+        Insert edges <ia[k], ib[k]> into the index.
+        :param ia:   np.ndarray (#edges, )  index (to array `verts`) of edge start points
+        :param ib:   np.ndarray (#edges, )  index (to array `verts`) of edge end points
+        """
+        ia = np.atleast_1d(np.asarray(ia, dtype=np.int64))
+        ib = np.atleast_1d(np.asarray(ib, dtype=np.int64))
+        m = ia.shape[0]
+
+        if self._n + m > self._edges.shape[0]:
+            cap = max(2 * self._edges.shape[0], self._n + m)
+            self._edges = np.resize(self._edges, (cap, 2))
+            self._boxes = np.resize(self._boxes, (cap, 4))
+
+        boxes = self._padded_boxes(self.verts[ia], self.verts[ib])
+        self._edges[self._n:self._n + m, 0] = ia
+        self._edges[self._n:self._n + m, 1] = ib
+        self._boxes[self._n:self._n + m] = boxes
+
+        for k in range(m):
+            x0, y0, x1, y1 = self._cell_range(boxes[k])
+            for cy in range(y0, y1 + 1):
+                for cx in range(x0, x1 + 1):
+                    self._cells.setdefault(cy * self._nx + cx, []).append(self._n + k)
+        self._n += m
+
+    def add_edge(self, ia: int, ib: int) -> None:
+        """
+        Insert edge <ia, ib> into the index.
+        :param ia:   int  index (to array `verts`) of edge start point
+        :param ib:   int  index (to array `verts`) of edge end point
+        """
+        self.add_edges([ia], [ib])
+
+    def query(self, p: np.ndarray, q: np.ndarray) -> (np.ndarray, np.ndarray):
+        """
+        Find edges whose bounding boxes overlap the one of segment pq.
+        :param p:  np.ndarray, a 2D vector (point of segment pq)
+        :param q:  np.ndarray, a 2D vector (point of segment pq)
+        :return:   (np.ndarray (#found, ), np.ndarray (#found, ))
+                   index (to array `verts`) of start and end points of found edges
+        """
+        box = self._padded_boxes(np.asarray(p, dtype=np.float64), np.asarray(q, dtype=np.float64))
+        x0, y0, x1, y1 = self._cell_range(box)
+
+        if (x1 - x0 + 1) * (y1 - y0 + 1) * 8 > self._n:
+            # long segment: a linear scan over all boxes is cheaper than visiting cells
+            ids = np.arange(self._n)
+        else:
+            found = []
+            for cy in range(y0, y1 + 1):
+                for cx in range(x0, x1 + 1):
+                    found.extend(self._cells.get(cy * self._nx + cx, ()))
+            ids = np.unique(np.array(found, dtype=np.int64))
+
+        boxes = self._boxes[ids]
+        overlap = (boxes[:, 0] <= box[2]) & (boxes[:, 2] >= box[0]) & \
+                  (boxes[:, 1] <= box[3]) & (boxes[:, 3] >= box[1])
+        ids = ids[overlap]
+        return self._edges[ids, 0], self._edges[ids, 1]
@@ -0,0 +1,94 @@
+"""
+Funnel algorithm (string pulling): turn a polygon corridor into the shortest path.
+
+The path starts at the start point and crosses the portals between consecutive polygons
+of the corridor. A funnel (apex, left side, right side) is narrowed portal by portal;
+once a side crosses over the other one, that corner is a waypoint and becomes the new apex.
+
+Refer to: Mikko Mononen, "Simple Stupid Funnel Algorithm" (2010).
+"""
+import numpy as np
+from .navmesh import NavMesh
+
+__all__ = ["string_pull"]
+
+
+def _cross(a: (float, float), b: (float, float), c: (float, float)) -> float:
+    """
+    Cross product of (b - a) and (c - a), positive iff c is at left of ab.
+    """
+    return (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])
+
+
+def string_pull(navmesh: NavMesh, corridor: [int],
+                start: np.ndarray, goal: np.ndarray) -> np.ndarray:
+    """
+    Shortest path from `start` to `goal` through a polygon corridor (e.g. output of
+    `find_path`). Linear in the corridor length in practice: a restart only goes back to
+    the portal of the new apex.
+    :param navmesh:    NavMesh                the mesh the corridor is on
+    :param corridor:   [int]                  ids of polygons from start to goal polygon
+    :param start:      np.ndarray (2, )       start point, in the first polygon
+    :param goal:       np.ndarray (2, )       goal point, in the last polygon
+    :return:           np.ndarray (#points, 2) waypoints from start to goal (both included),
+                                              empty if the corridor is empty
+    """
+    if len(corridor) == 0:
+        return np.zeros((0, 2))
+
+    start = (float(start[0]), float(start[1]))
+    goal = (float(goal[0]), float(goal[1]))
+    verts = navmesh.verts
+
+    # (left, right) of each portal, the start and goal as portals of zero width
+    lefts = [start]
+    rights = [start]
+    for p, q in zip(corridor[:-1], corridor[1:]):
+        left, right = navmesh.portal(p, q)
+        lefts.append((float(verts[left, 0]), float(verts[left, 1])))
+        rights.append((float(verts[right, 0]), float(verts[right, 1])))
+    lefts.append(goal)
+    rights.append(goal)
+
+    path = [start]
+    apex = left = right = start
+    apex_i = left_i = right_i = 0
+
+    i = 1
+    while i < len(lefts):
+        pl = lefts[i]
+        pr = rights[i]
+
+        # narrow the right side of the funnel
+        if _cross(apex, right, pr) >= 0:
+            if apex == right or _cross(apex, left, pr) < 0:
+                right = pr
+                right_i = i
+            else:
+                # right side crosses over left side: left is a corner of the path
+                if left != path[-1]:
+                    path.append(left)
+                apex = right = left
+                apex_i = right_i = left_i
+                i = apex_i + 1
+                continue
+
+        # narrow the left side of the funnel
+        if _cross(apex, left, pl) <= 0:
+            if apex == left or _cross(apex, right, pl) > 0:
+                left = pl
+                left_i = i
+            else:
+                # left side crosses over right side: right is a corner of the path
+                if right != path[-1]:
+                    path.append(right)
+                apex = left = right
+                apex_i = left_i = right_i
+                i = apex_i + 1
+                continue
+
+        i += 1
+
+    if path[-1] != goal:
+        path.append(goal)
+    return np.array(path)
@@ -0,0 +1,167 @@
+"""
+Turn a simple (concave) polygon into convex polys by triangulation and Hertel-Mehlhorn merge.
+
+(1) The polygon is triangulated by ear clipping. Only concave (reflex) vertices could lie
+    in an ear, so the ear test only checks the list of concave vertices, which shrinks
+    while ears are clipped (a concave vertex may turn convex, never the other way round).
+(2) Diagonals of the triangulation are removed greedily as long as the two polygons
+    sharing it merge into a convex polygon (Hertel-Mehlhorn). The result has at most
+    4x the optimal number of convex pieces.
+
+This corresponds to Recast Navigation's `triangulate` + `mergePolyVerts` in RecastMesh.cpp.
+
+Refer to: Hertel, S. and Mehlhorn, K. "Fast triangulation of simple polygons" (1983).
+"""
+import numpy as np
+from . import instrument
+from .basic_ops import left_on_many
+from .predicates import orient2d
+
+__all__ = ["triangulate", "hertel_mehlhorn"]
+
+
+@instrument.timed("triangulate")
+def triangulate(verts: np.ndarray, indices: np.ndarray) -> [[(int, int, int)], [(int, int)]]:
+    """
+    Triangulate a simple polygon by ear clipping.
+
+    Remark: indices should be in counter-clock wise.
+    :param verts:      np.ndarray (#verts, 2)  a list of 2D-vertices position
+    :param indices:    np.ndarray (#vert, )    a list of polygon vertex index (to array `verts`)
+    :return:  ([(int, int, int)], [(int, int)])
+        a list of triangles, as index of `indices`. If no ear could be found (degenerate
+        input), the last item is the remaining polygon that is not triangulated.
+
+        list of diagonals that splits the input polygon, as index of `indices`.
+    """
+    indices = np.asarray(indices)
+    n = len(indices)
+    pts_arr = verts[indices]
+    pts = pts_arr.tolist()
+
+    prev = [(i - 1) % n for i in range(n)]
+    nxt = [(i + 1) % n for i in range(n)]
+    reflex = [orient2d(pts[prev[i]], pts[i], pts[nxt[i]]) < 0 for i in range(n)]
+    reflex_pos = np.flatnonzero(reflex)
+    reflex_dirty = False
+
+    tris = []
+    diags = []
+    remaining = n
+    i = 0
+    misses = 0
+
+    while remaining > 3:
+        a, b = prev[i], nxt[i]
+        ear = not reflex[i]
+
+        if ear and len(reflex_pos) > 0:
+            if reflex_dirty:
+                reflex_pos = reflex_pos[np.asarray(reflex)[reflex_pos]]
+                reflex_dirty = False
+            # no concave vertex (except for ones sharing a triangle vertex) in the triangle
+            tri_ids = (indices[a], indices[i], indices[b])
+            cand = reflex_pos[(indices[reflex_pos] != tri_ids[0]) &
+                              (indices[reflex_pos] != tri_ids[1]) &
+                              (indices[reflex_pos] != tri_ids[2])]
+            if len(cand) > 0:
+                # (3, #cand) tests against the triangle edges, in a single call
+                tri = pts_arr[[a, i, b]]
+                inside = left_on_many(tri[:, None], tri[[1, 2, 0], None], pts_arr[cand])
+                ear = not inside.all(axis=0).any()
+
+        if not ear:
+            i = b
+            misses += 1
+            if misses > remaining:
+                # no ear found in a whole round (should not happen!)
+                break
+            continue
+
+        # clip the ear <a, i, b>
+        tris.append((a, i, b))
+        diags.append((a, b))
+        nxt[a] = b
+        prev[b] = a
+        remaining -= 1
+        misses = 0
+
+        for j in (a, b):
+            if reflex[j] and orient2d(pts[prev[j]], pts[j], pts[nxt[j]]) >= 0:
+                reflex[j] = False
+                reflex_dirty = True
+        i = a
+
+    # the last triangle (or the weird region left by the fallback)
+    last = [i]
+    j = nxt[i]
+    while j != i:
+        last.append(j)
+        j = nxt[j]
+    tris.append(tuple(last))
+
+    return tris, diags
+
+
+@instrument.timed("hertel_mehlhorn")
+def hertel_mehlhorn(verts: np.ndarray, indices: np.ndarray) -> [[np.ndarray], [(int, int)]]:
+    """
+    Turn a simple polygon into a list of convex polygons that shares the same area.
+    The polygon is triangulated first, then inessential diagonals are removed greedily.
+
+    Remark: indices should be in counter-clock wise.
+    :param verts:       np.ndarray (#verts, 2)  a list of 2D-vertices position
+    :param indices:     np.ndarray (#vert, )    a list of polygon vertex index (to array `verts`)
+    :return:  ([np.ndarray], [(int, int)])
+        a list of indices of `verts` that constructs convex areas
+        e.g: [np.array(p1_i1, p1_i2, p1_i3, ..), np.array(p2_i1, ...), ..]
+
+        list of diagonals that splits the input polygon, as index of `indices`.
+        e.g: [(diag1_a_index, diag1_b_index), ...]
+    """
+    indices = np.asarray(indices)
+    tris, diags = triangulate(verts, indices)
+    pts = verts[indices].tolist()
+
+    # pieces (as index of `indices`) and owner piece of each directed edge
+    pieces = dict(enumerate(list(t) for t in tris))
+    owner = {}
+    for pid, piece in pieces.items():
+        for k, u in enumerate(piece):
+            owner[(u, piece[(k + 1) % len(piece)])] = pid
+
+    kept = []
+    for u, v in diags:
+        pid_a = owner.get((u, v))
+        pid_b = owner.get((v, u))
+        if pid_a is None or pid_b is None or pid_a == pid_b:
+            kept.append((u, v))
+            continue
+
+        # rotate A to [v, a1, .., ak, u] and B to [u, b1, .., bm, v]
+        piece_a = pieces[pid_a]
+        k = piece_a.index(v)
+        rot_a = piece_a[k:] + piece_a[:k]
+        piece_b = pieces[pid_b]
+        k = piece_b.index(u)
+        rot_b = piece_b[k:] + piece_b[:k]
+
+        # the merged polygon stays convex iff both ends of the diagonal stay convex
+        if orient2d(pts[rot_a[-2]], pts[u], pts[rot_b[1]]) < 0 or \
+                orient2d(pts[rot_b[-2]], pts[v], pts[rot_a[1]]) < 0:
+            kept.append((u, v))
+            continue
+
+        merged = rot_a + rot_b[1:-1]
+        del pieces[pid_b]
+        del owner[(u, v)]
+        del owner[(v, u)]
+        pieces[pid_a] = merged
+        for k, w in enumerate(merged):
+            owner[(w, merged[(k + 1) % len(merged)])] = pid_a
+
+    polys = [indices[piece] for piece in pieces.values()]
+    if instrument.ACTIVE is not None:
+        instrument.ACTIVE.count("hertel_mehlhorn.triangles", len(tris))
+        instrument.ACTIVE.count("hertel_mehlhorn.diagonals_kept", len(kept))
+    return polys, kept
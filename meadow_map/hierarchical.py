@@ -0,0 +1,306 @@
+"""
+Hierarchical path finding (HPA*-style) over the polygons of a NavMesh.
+
+(1) Polygons are grouped into clusters: connected groups of polygons whose centers fall in
+    the same cell of a uniform grid.
+(2) Polygons with a neighbour in another cluster are the nodes of an abstract graph. Two
+    nodes are linked by the shortest corridor cost inside their cluster (precomputed), or by
+    the portal cost if they are neighbours in different clusters.
+(3) A query links the start and goal polygons to the nodes of their cluster, searches the
+    abstract graph, then refines each abstract step by a search inside one cluster.
+
+Any corridor splits into steps inside a cluster and steps between clusters, so the abstract
+graph keeps the exact corridor costs: the result is as short as the flat A* one.
+That holds for any grouping of polygons into clusters, so after an update of the NavMesh
+new polygons simply join a cluster of their cell (a new one if none is adjacent), and only
+the clusters with changed polygons or links get their nodes and costs computed again.
+
+Refer to: Botea, A., Mueller, M. and Schaeffer, J. "Near optimal hierarchical path-finding"
+(2004).
+"""
+import heapq
+import numpy as np
+from .navmesh import NavMesh
+
+__all__ = ["HierarchicalPathFinder"]
+
+
+class HierarchicalPathFinder:
+    """
+    Two-level search: clusters of polygons, then polygons inside the clusters on the route.
+    """
+
+    def __init__(self, navmesh: NavMesh, cluster_size: float = None):
+        """
+        :param navmesh:       NavMesh  the mesh to search on
+        :param cluster_size:  float    side length of the grid cells grouping polygons into
+                                       clusters. Chosen for ~64 polygons per cluster if not given.
+        """
+        self.navmesh = navmesh
+        self._build(cluster_size)
+
+    @property
+    def clusters(self) -> np.ndarray:
+        """
+        Cluster id of each polygon (np.ndarray (#polys, )).
+        """
+        return np.array(self._cluster, dtype=np.int64)
+
+    def _build(self, cluster_size: float) -> None:
+        """
+        Cluster the polygons and build the abstract graph, again after the mesh was updated.
+        """
+        navmesh = self.navmesh
+        self._revision = navmesh.revision
+        centers = navmesh.centers
+        self._centers = centers.tolist()
+        self._offsets = navmesh.poly_offsets.tolist()
+        self._neis = navmesh.edge_neighbours.tolist()
+        self._costs = navmesh.edge_costs.tolist()
+
+        n = navmesh.n_polys
+        self._lo = centers.min(axis=0) if n > 0 else np.zeros(2)
+        if cluster_size is None:
+            extent = np.maximum(centers.max(axis=0) - self._lo, 1e-9) if n > 0 else np.ones(2)
+            cluster_size = np.sqrt(extent[0] * extent[1] * 64.0 / max(n, 1))
+        self.cluster_size = float(cluster_size)
+        self._cell_keys = cell_keys = self._cell_keys_of(centers)
+
+        # clusters: connected components of polygons in the same cell
+        cluster = np.full(n, -1, dtype=np.int64)
+        n_clusters = 0
+        for seed in range(n):
+            if cluster[seed] >= 0:
+                continue
+            cluster[seed] = n_clusters
+            stack = [seed]
+            while stack:
+                p = stack.pop()
+                for e in range(self._offsets[p], self._offsets[p + 1]):
+                    q = self._neis[e]
+                    if cluster[q] < 0 <= q and cell_keys[q] == cell_keys[p]:
+                        cluster[q] = n_clusters
+                        stack.append(q)
+            n_clusters += 1
+        self.n_clusters = n_clusters
+        self._cluster = cluster.tolist()
+        self._members = [[] for _ in range(n_clusters)]
+        for p, c in enumerate(self._cluster):
+            self._members[c].append(p)
+
+        # abstract graph: node (polygon id) -> [(node, cost)]
+        self._graph = {}
+        for c in range(n_clusters):
+            self._link_cluster(c)
+
+    def _cell_keys_of(self, centers: np.ndarray) -> [(int, int)]:
+        cells = np.floor((centers - self._lo) / self.cluster_size).astype(np.int64)
+        return list(zip(cells[:, 0].tolist(), cells[:, 1].tolist()))
+
+    def _link_cluster(self, c: int) -> None:
+        """
+        Nodes of cluster `c` (alive polygons with a neighbour in another cluster) and their
+        links in the abstract graph.
+        """
+        alive = self.navmesh.poly_alive
+        nodes = []
+        members = []
+        for p in self._members[c]:
+            links = []
+            if alive[p]:
+                members.append(p)
+                for e in range(self._offsets[p], self._offsets[p + 1]):
+                    q = self._neis[e]
+                    if q >= 0 and self._cluster[q] != c:
+                        links.append((q, self._costs[e]))
+            if links:
+                self._graph[p] = links
+                nodes.append(p)
+            else:
+                self._graph.pop(p, None)
+        self._members[c] = members
+        for u in nodes:
+            dist, _ = self._local(u)
+            self._graph[u].extend((v, dist[v]) for v in nodes if v != u and v in dist)
+
+    def _update(self) -> None:
+        """
+        Patch the clusters and the abstract graph after updates of the NavMesh, see module
+        doc. Built again if polygons were renumbered.
+        """
+        navmesh = self.navmesh
+        if navmesh.renumbered_since(self._revision):
+            self._build(self.cluster_size)
+            return
+        cluster = self._cluster
+        n = len(cluster)
+
+        # polygons whose links changed
+        changed = set(p for p in navmesh.removed_since(self._revision).tolist() if p < n)
+        patched = navmesh.patch_graph(self._revision, self._offsets, self._neis, self._costs,
+                                      self._centers)
+        changed.update(navmesh.edge_polys[patched].tolist())
+        self._revision = navmesh.revision
+        self._cell_keys.extend(self._cell_keys_of(navmesh.centers[n:]))
+
+        # new polygons: connected groups in the same cell join an adjacent cluster there
+        cluster.extend([-1] * (navmesh.n_polys - n))
+        for seed in range(n, navmesh.n_polys):
+            if cluster[seed] >= 0 or not navmesh.poly_alive[seed]:
+                continue
+            group, joined = self._new_group(seed)
+            if joined < 0:
+                joined = self.n_clusters
+                self.n_clusters += 1
+                self._members.append([])
+            for p in group:
+                cluster[p] = joined
+            self._members[joined].extend(group)
+            changed.update(group)
+        dead = [p for p in range(n, navmesh.n_polys) if cluster[p] < 0]
+        if dead:
+            # replaced by a later update, in an empty cluster of their own
+            for p in dead:
+                cluster[p] = self.n_clusters
+            self.n_clusters += 1
+            self._members.append([])
+
+        for c in sorted(set(cluster[p] for p in changed)):
+            self._link_cluster(c)
+
+    def _new_group(self, seed: int) -> ([int], int):
+        """
+        Polygons without a cluster yet connected to `seed` in its cell, and the cluster of a
+        polygon adjacent to them in that cell (-1 if none). Marks them as grouped (-2).
+        """
+        neis, cluster, cell_keys = self._neis, self._cluster, self._cell_keys
+        group, stack, joined = [seed], [seed], -1
+        cluster[seed] = -2
+        while stack:
+            p = stack.pop()
+            for e in range(self._offsets[p], self._offsets[p + 1]):
+                q = neis[e]
+                if q < 0 or cell_keys[q] != cell_keys[p]:
+                    continue
+                if cluster[q] == -1:
+                    cluster[q] = -2
+                    group.append(q)
+                    stack.append(q)
+                elif joined < 0 <= cluster[q]:
+                    joined = cluster[q]
+        return group, joined
+
+    def _local(self, source: int, target: int = -1) -> [dict, dict]:
+        """
+        Dijkstra from `source`, restricted to its cluster, stopped once `target` is settled.
+        :return:  (dict, dict)  cost and parent of each reached polygon
+        """
+        offsets, neis, costs = self._offsets, self._neis, self._costs
+        cluster = self._cluster
+        c = cluster[source]
+        dist = {source: 0.0}
+        parent = {source: -1}
+        heap = [(0.0, source)]
+        while heap:
+            d, p = heapq.heappop(heap)
+            if p == target:
+                break
+            if d > dist[p]:
+                continue
+            for e in range(offsets[p], offsets[p + 1]):
+                q = neis[e]
+                if q < 0 or cluster[q] != c:
+                    continue
+                dq = d + costs[e]
+                if dq < dist.get(q, np.inf):
+                    dist[q] = dq
+                    parent[q] = p
+                    heapq.heappush(heap, (dq, q))
+        return dist, parent
+
+    def _valid(self, p: int) -> bool:
+        """
+        Whether `p` is the id of a live polygon.
+        """
+        return 0 <= p < self.navmesh.n_polys and bool(self.navmesh.poly_alive[p])
+
+    def _distance(self, p: int, q: int) -> float:
+        cp = self._centers[p]
+        cq = self._centers[q]
+        return ((cp[0] - cq[0]) ** 2 + (cp[1] - cq[1]) ** 2) ** 0.5
+
+    def find(self, start: int, goal: int) -> [int]:
+        """
+        Find the polygon corridor between two polygons, same format as `PathFinder.find`.
+        :param start:  int    id of start polygon
+        :param goal:   int    id of goal polygon
+        :return:       [int]  ids of polygons from `start` to `goal` (both included),
+                              empty if `goal` could not be reached, or if `start` or `goal`
+                              is not a polygon of the mesh (out of range or removed)
+        """
+        if self._revision != self.navmesh.revision:
+            self._update()
+        start, goal = int(start), int(goal)
+        if not (self._valid(start) and self._valid(goal)):
+            return []
+        if start == goal:
+            return [start]
+
+        # link start and goal to the abstract nodes of their clusters
+        start_dist, _ = self._local(start)
+        goal_dist, _ = self._local(goal)
+        goal_links = {u: d for u, d in goal_dist.items() if u in self._graph}
+
+        # A* on the abstract graph, goal reached directly when in the start cluster
+        g = {start: 0.0}
+        parent = {start: -1}
+        heap = [(self._distance(start, goal), start)]
+        closed = set()
+        while heap:
+            _, u = heapq.heappop(heap)
+            if u in closed:
+                continue
+            if u == goal:
+                return self._refine(self._abstract_path(parent, goal))
+            closed.add(u)
+
+            links = list(self._graph.get(u, ()))
+            if u == start:
+                links.extend((v, d) for v, d in start_dist.items() if v in self._graph or v == goal)
+            if u in goal_links:
+                links.append((goal, goal_links[u]))
+            for v, cost in links:
+                gv = g[u] + cost
+                if v not in closed and gv < g.get(v, np.inf):
+                    g[v] = gv
+                    parent[v] = u
+                    heapq.heappush(heap, (gv + self._distance(v, goal), v))
+        return []
+
+    @staticmethod
+    def _abstract_path(parent: dict, goal: int) -> [int]:
+        path = []
+        u = goal
+        while u != -1:
+            path.append(u)
+            u = parent[u]
+        path.reverse()
+        return path
+
+    def _refine(self, abstract: [int]) -> [int]:
+        """
+        Expand abstract steps inside a cluster into polygon corridors.
+        """
+        corridor = [abstract[0]]
+        for u, v in zip(abstract[:-1], abstract[1:]):
+            if self._cluster[u] != self._cluster[v]:
+                corridor.append(v)
+                continue
+            _, parent = self._local(u, v)
+            segment = []
+            p = v
+            while p != u:
+                segment.append(p)
+                p = parent[p]
+            corridor.extend(reversed(segment))
+        return corridor
@@ -0,0 +1,126 @@
+"""
+Opt-in instrumentation of the build: call counters, maxima, size samples and stage timers.
+
+Nothing is recorded unless a `collect_stats` block is active. Hooks check the module-level
+`ACTIVE` first, so the cost when disabled is one attribute lookup per hook:
+
+    with collect_stats() as stats:
+        polys, diags = convexify(verts, indices)
+    print(stats.report())
+
+Only the current process is recorded (not the workers of a process pool).
+"""
+import contextlib
+import functools
+import time
+from collections import Counter, defaultdict
+import numpy as np
+
+__all__ = ["BuildStats", "collect_stats", "timed", "stage", "ACTIVE"]
+
+# the BuildStats being recorded to, None if disabled
+ACTIVE = None
+
+
+class BuildStats:
+    """
+    Counters, maxima, size samples and accumulated wall time, by name.
+    """
+
+    def __init__(self):
+        self.counters = Counter()
+        self.maxima = {}
+        self.sizes = defaultdict(list)
+        self.timers = defaultdict(float)
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counters[name] += n
+
+    def maximum(self, name: str, value: float) -> None:
+        if value > self.maxima.get(name, -np.inf):
+            self.maxima[name] = value
+
+    def size(self, name: str, value: int) -> None:
+        self.sizes[name].append(value)
+
+    @contextlib.contextmanager
+    def timer(self, name: str):
+        """
+        Add the wall time of the block to timer `name`.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timers[name] += time.perf_counter() - start
+
+    def histogram(self, name: str, bins: int = 10) -> (np.ndarray, np.ndarray):
+        """
+        :return:  (np.ndarray, np.ndarray)  counts and bin edges of size samples `name`
+        """
+        return np.histogram(self.sizes.get(name, []), bins=bins)
+
+    def as_dict(self) -> dict:
+        """
+        :return:  dict  JSON-serializable summary (size samples as count/min/mean/max)
+        """
+        sizes = {}
+        for name, values in self.sizes.items():
+            arr = np.asarray(values)
+            sizes[name] = {"count": int(arr.size), "min": int(arr.min()),
+                           "mean": float(arr.mean()), "max": int(arr.max())}
+        return {"counters": dict(self.counters), "maxima": dict(self.maxima),
+                "sizes": sizes, "timers": dict(self.timers)}
+
+    def report(self) -> str:
+        """
+        :return:  str  human-readable table of all records
+        """
+        summary = self.as_dict()
+        lines = [f"{name:40s} {value:12d}" for name, value in sorted(summary["counters"].items())]
+        lines += [f"{name:40s} {value:12g} (max)" for name, value in sorted(self.maxima.items())]
+        lines += [f"{name:40s} {s['count']:12d} (n) min {s['min']} mean {s['mean']:.1f} "
+                  f"max {s['max']}" for name, s in sorted(summary["sizes"].items())]
+        lines += [f"{name:40s} {value * 1e3:12.3f} ms" for name, value in
+                  sorted(self.timers.items())]
+        return "\n".join(lines)
+
+
+@contextlib.contextmanager
+def collect_stats(stats: BuildStats = None):
+    """
+    Record the instrumentation of the build while in the block.
+    :param stats:  BuildStats  record into an existing object, a new one if not given
+    :return:       BuildStats  (as the context value)
+    """
+    global ACTIVE  # pylint: disable=global-statement
+    previous = ACTIVE
+    ACTIVE = stats if stats is not None else BuildStats()
+    try:
+        yield ACTIVE
+    finally:
+        ACTIVE = previous
+
+
+def timed(name: str):
+    """
+    Decorator adding the wall time of each call to timer `name`, when recording.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            stats = ACTIVE
+            if stats is None:
+                return func(*args, **kwargs)
+            stats.count(name + ".calls")
+            with stats.timer(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def stage(name: str):
+    """
+    Context manager adding the wall time of the block to timer `name`, when recording.
+    """
+    return ACTIVE.timer(name) if ACTIVE is not None else contextlib.nullcontext()
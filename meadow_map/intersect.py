@@ -5,7 +5,13 @@ Refer to: https://github.com/w8r/orourke-compc
 """
 
 import numpy as np
-from .basic_ops import between, left, collinear
+from . import instrument
+from .basic_ops import between, left, collinear, between_many, left_many, collinear_many
+
+__all__ = ["intersect", "intersect_many"]
+
+# number of edges tested per NumPy call in `any_hit` mode
+_ANY_HIT_BLOCK = 256
 
 
 def intersect(a: np.ndarray, b: np.ndarray, c: np.ndarray, d: np.ndarray) -> bool:
@@ -17,6 +23,8 @@ def intersect(a: np.ndarray, b: np.ndarray, c: np.ndarray, d: np.ndarray) -> boo
     :param d:  np.ndarray, a 2D vector (point of line cd)
     :return: whether line intersects
     """
+    if instrument.ACTIVE is not None:
+        instrument.ACTIVE.count("intersect")
     if collinear(a, b, c):
         return between(a, b, c)
 
@@ -33,3 +41,60 @@ def intersect(a: np.ndarray, b: np.ndarray, c: np.ndarray, d: np.ndarray) -> boo
     ab_cross = np.logical_xor(left(c, d, a), left(c, d, b))
 
     return ab_cross and cd_cross
+
+
+def _intersect_block(a: np.ndarray, b: np.ndarray, c: np.ndarray, d: np.ndarray) -> np.ndarray:
+    """
+    Vectorized body of `intersect`, the cases are resolved in the same order.
+    """
+    # same order as `intersect`: the first collinear case decides the answer
+    cases = [
+        collinear_many(a, b, c),
+        collinear_many(a, b, d),
+        collinear_many(c, d, a),
+        collinear_many(c, d, b),
+    ]
+    answers = [
+        between_many(a, b, c),
+        between_many(a, b, d),
+        between_many(c, d, a),
+        between_many(c, d, b),
+    ]
+    cd_cross = np.logical_xor(left_many(a, b, c), left_many(a, b, d))
+    ab_cross = np.logical_xor(left_many(c, d, a), left_many(c, d, b))
+
+    return np.select(cases, answers, default=ab_cross & cd_cross)
+
+
+def intersect_many(a: np.ndarray, b: np.ndarray,
+                   edges_start: np.ndarray, edges_end: np.ndarray,
+                   any_hit: bool = False):
+    """
+    Check whether 2D-line ab intersects with each 2D-line of an edge set.
+    Gives the same answers as calling `intersect(a, b, c, d)` edge by edge.
+    :param a:            np.ndarray (2, ), a 2D vector (point of line ab)
+    :param b:            np.ndarray (2, ), a 2D vector (point of line ab)
+    :param edges_start:  np.ndarray (M, 2), start points of the edges
+    :param edges_end:    np.ndarray (M, 2), end points of the edges
+    :param any_hit:      bool, if True, stop at the first intersected edge and
+                         return a single bool
+    :return:             np.ndarray (M, ) bool mask of intersected edges,
+                         or bool whether any edge intersects if `any_hit`
+    """
+    a = np.asarray(a)
+    b = np.asarray(b)
+    edges_start = np.asarray(edges_start)
+    edges_end = np.asarray(edges_end)
+    if instrument.ACTIVE is not None:
+        instrument.ACTIVE.count("intersect_many")
+        instrument.ACTIVE.count("intersect_many.edges", edges_start.shape[0])
+
+    if not any_hit:
+        return _intersect_block(a, b, edges_start, edges_end)
+
+    m = edges_start.shape[0]
+    for start in range(0, m, _ANY_HIT_BLOCK):
+        end = start + _ANY_HIT_BLOCK
+        if _intersect_block(a, b, edges_start[start:end], edges_end[start:end]).any():
+            return True
+    return False
@@ -0,0 +1,267 @@
+"""
+Compiled kernels for the hot loops of the build: concave vertex search, cone tests and
+segment-vs-edges test (`diag`, `convex_no_hole`, `convex_with_hole`).
+
+These loops run over tiny NumPy scalar ops, the worst case for interpreter overhead.
+The kernels below are plain loops over `verts` / `indices` arrays, JIT-compiled by Numba
+when it is installed. They use the same exact orientation test as `predicates.py`
+(float filter, then exact expansion arithmetic), so all backends give the same results.
+
+Backends:
+(1) "numba":  the compiled kernels. Default when Numba is installed.
+(2) "numpy":  no kernels, the vectorized NumPy code paths. Default otherwise.
+(3) "python": the kernels run by the interpreter (slow), to test them without Numba.
+
+The default could be overridden by the environment variable MEADOW_MAP_BACKEND, e.g. to
+run the test suite against a given backend. Call sites get the kernel functions of the
+current backend from `kernels.active(verts, ...)` (None for "numpy").
+
+The kernels convert coordinates to float64, which is exact for integer coordinates within
+[-MAX_COORD, MAX_COORD] only. `active` returns None for integer vertices beyond that range,
+so that they take the NumPy path (exact Python int arithmetic, see `predicates.py`).
+"""
+import os
+from types import SimpleNamespace
+import numpy as np
+from .predicates import MAX_COORD, _filter, _two_product
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+__all__ = ["ACTIVE", "BACKENDS", "active", "backend", "set_backend"]
+
+BACKENDS = ("numba", "numpy", "python")
+ACTIVE = None
+_BACKEND = "numpy"
+
+
+def _jit(fn):
+    """
+    Compile `fn` in nopython mode if Numba is installed (the Python function is then
+    `fn.py_func`).
+    """
+    if numba is None:
+        return fn
+    return numba.njit(cache=True)(fn)
+
+
+@_jit
+def _two_sum(a, b):
+    """
+    Exact sum a + b as head + tail (Knuth).
+    """
+    head = a + b
+    b_virtual = head - a
+    a_virtual = head - b_virtual
+    return head, (a - a_virtual) + (b - b_virtual)
+
+
+_two_product = _jit(_two_product)
+_filter = _jit(_filter)
+
+
+@_jit
+def _orient_exact(a, b, c):
+    """
+    Sign-exact determinant: the six coordinate products (as exact head + tail pairs) are
+    accumulated in a non-overlapping expansion (Shewchuk's grow-expansion with zero
+    elimination), whose largest component has the sign of the exact sum.
+    """
+    (ax, ay), (bx, by), (cx, cy) = a, b, c
+    factors = ((ax, by, 1.0), (ay, bx, -1.0), (bx, cy, 1.0),
+               (by, cx, -1.0), (cx, ay, 1.0), (cy, ax, -1.0))
+    expansion = np.zeros(12)
+    n = 0
+    for p, q, sign in factors:
+        head, tail = _two_product(p, q)
+        for term in (sign * tail, sign * head):
+            m = 0
+            for i in range(n):
+                term, small = _two_sum(term, expansion[i])
+                if small != 0.0:
+                    expansion[m] = small
+                    m += 1
+            if term != 0.0:
+                expansion[m] = term
+                m += 1
+            n = m
+    return expansion[n - 1] if n > 0 else 0.0
+
+
+@_jit
+def _orient(verts, i, j, k):
+    """
+    `predicates.orient2d` of verts[i], verts[j], verts[k].
+    """
+    a = (float(verts[i, 0]), float(verts[i, 1]))
+    b = (float(verts[j, 0]), float(verts[j, 1]))
+    c = (float(verts[k, 0]), float(verts[k, 1]))
+    det, certain = _filter(a, b, c)
+    if certain:
+        return det
+    return _orient_exact(a, b, c)
+
+
+@_jit
+def _between(verts, i, j, k):
+    """
+    `basic_ops.between` of verts[i], verts[j], verts[k].
+    """
+    axis = 0 if verts[i, 0] != verts[j, 0] else 1
+    x, y, z = verts[i, axis], verts[j, axis], verts[k, axis]
+    return (x <= z <= y) or (x >= z >= y)
+
+
+@_jit
+def _intersect(verts, a, b, c, d):
+    """
+    `intersect.intersect` of segments verts[a] verts[b] and verts[c] verts[d].
+    """
+    abc = _orient(verts, a, b, c)
+    if abc == 0.0:
+        return _between(verts, a, b, c)
+    abd = _orient(verts, a, b, d)
+    if abd == 0.0:
+        return _between(verts, a, b, d)
+    cda = _orient(verts, c, d, a)
+    if cda == 0.0:
+        return _between(verts, c, d, a)
+    cdb = _orient(verts, c, d, b)
+    if cdb == 0.0:
+        return _between(verts, c, d, b)
+    return ((abc > 0.0) != (abd > 0.0)) and ((cda > 0.0) != (cdb > 0.0))
+
+
+@_jit
+def find_concave_vertex(verts, indices):
+    """
+    `convex_no_hole.find_concave_vertex`.
+    """
+    n = indices.shape[0]
+    for ia in range(n):
+        ia_prev = ia - 1 if ia - 1 >= 0 else n - 1
+        ia_next = ia + 1 if ia + 1 < n else 0
+        if _orient(verts, indices[ia_prev], indices[ia], indices[ia_next]) < 0.0:
+            return ia
+    return -1
+
+
+@_jit
+def in_cone(verts, indices, ia, ib):
+    """
+    `diag.in_cone`.
+    """
+    n = indices.shape[0]
+    a_prev = indices[ia - 1 if ia - 1 >= 0 else n - 1]
+    a_next = indices[ia + 1 if ia + 1 < n else 0]
+    a, b = indices[ia], indices[ib]
+    if _orient(verts, a_prev, a, a_next) >= 0.0:
+        return _orient(verts, a, b, a_prev) > 0.0 and _orient(verts, b, a, a_next) > 0.0
+    return not (_orient(verts, a, b, a_next) >= 0.0 and _orient(verts, b, a, a_prev) >= 0.0)
+
+
+@_jit
+def bridge_cone(verts, outline, h):
+    """
+    `diag.in_cone` of <outline vertex, verts[h]> for every vertex of the polygon `outline`
+    (see `convex_with_hole._find_bridge`).
+    """
+    n = outline.shape[0]
+    cone = np.empty(n, dtype=np.bool_)
+    for k in range(n):
+        p = outline[k - 1 if k - 1 >= 0 else n - 1]
+        q = outline[k + 1 if k + 1 < n else 0]
+        v = outline[k]
+        if _orient(verts, p, v, q) >= 0.0:
+            cone[k] = _orient(verts, v, h, p) > 0.0 and _orient(verts, h, v, q) > 0.0
+        else:
+            cone[k] = not (_orient(verts, v, h, q) >= 0.0 and _orient(verts, h, v, p) >= 0.0)
+    return cone
+
+
+@_jit
+def segment_hits(verts, a, b, edges_a, edges_b):
+    """
+    Whether segment verts[a] verts[b] intersects any edge <edges_a[k], edges_b[k]>,
+    except for the edges incident to a or b (see `diag.diagonalie`).
+    """
+    for k in range(edges_a.shape[0]):
+        c, d = edges_a[k], edges_b[k]
+        if c == a or c == b or d == a or d == b:
+            continue
+        if _intersect(verts, a, b, c, d):
+            return True
+    return False
+
+
+@_jit
+def find_break(verts, indices, i_concave):
+    """
+    First index i of `indices` such that <i_concave, i> is an internal diagonal, -1 if
+    none (see `convex_no_hole.convexify`). Every edge of the polygon is tested.
+    """
+    n = indices.shape[0]
+    edges_b = np.empty_like(indices)
+    edges_b[:n - 1] = indices[1:]
+    edges_b[n - 1] = indices[0]
+    for i in range(n):
+        if i != i_concave and in_cone(verts, indices, i_concave, i) and \
+                in_cone(verts, indices, i, i_concave) and \
+                not segment_hits(verts, indices[i_concave], indices[i], indices, edges_b):
+            return i
+    return -1
+
+
+_KERNELS = (find_concave_vertex, in_cone, bridge_cone, segment_hits, find_break)
+
+
+def set_backend(name: str) -> str:
+    """
+    Select the backend of the build kernels.
+    :param name:  str  "numba", "numpy" or "python", see module doc
+    :return:      str  the previous backend
+    """
+    global ACTIVE, _BACKEND  # pylint: disable=global-statement
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend: {name}")
+    if name == "numba" and numba is None:
+        raise ValueError("Backend numba is not available, Numba is not installed")
+
+    previous = _BACKEND
+    _BACKEND = name
+    if name == "numpy":
+        ACTIVE = None
+    elif name == "numba":
+        ACTIVE = SimpleNamespace(**{fn.__name__: fn for fn in _KERNELS})
+    else:
+        ACTIVE = SimpleNamespace(**{fn.__name__: getattr(fn, "py_func", fn) for fn in _KERNELS})
+    return previous
+
+
+def active(verts: np.ndarray, *ids) -> SimpleNamespace:
+    """
+    Kernels of the current backend, if they are exact on the vertices used.
+    :param verts:  np.ndarray (#verts, 2)  a list of 2D-vertices position
+    :param ids:    int or np.ndarray       index (to array `verts`) of the vertices used
+    :return:       SimpleNamespace         `ACTIVE`, None for the NumPy path (backend "numpy",
+                                           or integer coordinates beyond MAX_COORD)
+    """
+    if ACTIVE is None or verts.dtype.kind not in "iu":
+        return ACTIVE
+    for i in ids:
+        pts = verts[i]
+        if pts.size > 0 and (pts.min() < -MAX_COORD or pts.max() > MAX_COORD):
+            return None
+    return ACTIVE
+
+
+def backend() -> str:
+    """
+    :return:  str  the current backend
+    """
+    return _BACKEND
+
+
+set_backend(os.environ.get("MEADOW_MAP_BACKEND", "numba" if numba is not None else "numpy"))
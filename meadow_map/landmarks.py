@@ -0,0 +1,119 @@
+"""
+ALT heuristic (A*, Landmarks, Triangle inequality) for `PathFinder`.
+
+Shortest corridor costs d(L, p) from K landmark polygons L to every polygon are computed
+once by Dijkstra. By the triangle inequality |d(L, goal) - d(L, p)| <= d(p, goal) for any
+landmark, so the max over landmarks (and the straight-line distance) is an admissible and
+consistent heuristic, much tighter than the straight line around obstacles.
+
+Landmarks are picked by farthest-point selection: each new landmark is the polygon
+farthest from the landmarks picked so far.
+
+Refer to: Goldberg, A. V. and Harrelson, C. "Computing the shortest path: A* search meets
+graph theory" (2005).
+"""
+import heapq
+import numpy as np
+from .navmesh import NavMesh
+
+__all__ = ["LandmarkTable", "dijkstra"]
+
+
+def dijkstra(navmesh: NavMesh, source: int) -> np.ndarray:
+    """
+    Shortest corridor cost from a polygon to every polygon of the NavMesh.
+    :param navmesh:  NavMesh                the mesh
+    :param source:   int                    id of the source polygon
+    :return:         np.ndarray (#polys, )  cost to each polygon, inf if unreachable
+    """
+    offsets = navmesh.poly_offsets.tolist()
+    neis = navmesh.edge_neighbours.tolist()
+    costs = navmesh.edge_costs.tolist()
+
+    dist = [float("inf")] * navmesh.n_polys
+    dist[source] = 0.0
+    heap = [(0.0, source)]
+    while heap:
+        d, p = heapq.heappop(heap)
+        if d > dist[p]:
+            continue
+        for e in range(offsets[p], offsets[p + 1]):
+            q = neis[e]
+            if q >= 0 and d + costs[e] < dist[q]:
+                dist[q] = d + costs[e]
+                heapq.heappush(heap, (dist[q], q))
+    return np.array(dist)
+
+
+class LandmarkTable:
+    """
+    Precomputed costs from K landmark polygons, used as an A* heuristic.
+    """
+
+    def __init__(self, navmesh: NavMesh, k: int = 8, landmarks: [int] = None):
+        """
+        :param navmesh:    NavMesh  the mesh
+        :param k:          int      number of landmarks to pick, if `landmarks` is not given
+        :param landmarks:  [int]    ids of landmark polygons
+        """
+        self.navmesh = navmesh
+        # the table no longer bounds corridor costs once the mesh is updated
+        self.revision = navmesh.revision
+        n = navmesh.n_polys
+        if landmarks is None:
+            landmarks, rows = self._pick(navmesh, k)
+        else:
+            rows = [dijkstra(navmesh, int(l)) for l in landmarks]
+
+        self.landmarks = np.asarray(landmarks, dtype=np.int64)
+        # (K, #polys) costs from each landmark, inf if unreachable
+        self.distances = np.array(rows, dtype=np.float32).reshape(len(rows), n)
+        finite = self.distances[np.isfinite(self.distances)]
+        # float32 rounding must not make the heuristic overestimate
+        self._slack = 2.5e-7 * float(finite.max()) if finite.size > 0 else 0.0
+        self._rows = self.distances.astype(np.float64).tolist()
+        self._centers = navmesh.centers.tolist()
+
+    @staticmethod
+    def _pick(navmesh: NavMesh, k: int) -> [[int], [np.ndarray]]:
+        """
+        Farthest-point selection of `k` landmarks (fewer if the mesh has fewer polygons).
+        :return:  ([int], [np.ndarray])  landmarks, and costs from each of them
+        """
+        if navmesh.n_polys == 0 or k <= 0:
+            return [], []
+        # start from the polygon farthest from an arbitrary one
+        far = dijkstra(navmesh, 0)
+        landmarks = [int(np.argmax(np.where(np.isinf(far), -1.0, far)))]
+        rows = [dijkstra(navmesh, landmarks[0])]
+        nearest = rows[0]
+        while len(landmarks) < k:
+            # polygons unreachable from all landmarks (inf) come first
+            cand = int(np.argmax(nearest))
+            if nearest[cand] <= 0.0:
+                break
+            landmarks.append(cand)
+            rows.append(dijkstra(navmesh, cand))
+            nearest = np.minimum(nearest, rows[-1])
+        return landmarks, rows
+
+    def heuristic(self, goal: int):
+        """
+        :param goal:  int       id of the goal polygon
+        :return:      callable  p -> lower bound of the corridor cost from polygon p to `goal`
+        """
+        rows = self._rows
+        goal_costs = [row[goal] for row in rows]
+        cg = self._centers[goal]
+        centers = self._centers
+        slack = self._slack
+
+        def h(p: int) -> float:
+            cp = centers[p]
+            best = ((cp[0] - cg[0]) ** 2 + (cp[1] - cg[1]) ** 2) ** 0.5
+            for row, dg in zip(rows, goal_costs):
+                # nan (both unreachable from this landmark) never compares greater
+                best = max(best, abs(dg - row[p]) - slack)
+            return best
+
+        return h
@@ -0,0 +1,195 @@
+"""
+Point location on a NavMesh: which polygon is each point in.
+
+Polygons are bucketed into a uniform grid by their bounding boxes (candidate lists in
+a CSR-style layout). A batch of points is located in one vectorized pass: every
+(point, candidate polygon) pair is expanded into (point, polygon edge) tests, and the
+point is inside the convex polygon iff it is at left of or on all its edges.
+
+Incremental updates of the NavMesh are patched in: dead polygons are skipped, and new ones
+are inserted in the cells of their bounding boxes (a small sorted side table, searched for
+the points not found in the main grid). The grid is built again once the inserted polygons
+outnumber a quarter of it, so insertion is amortized O(#cells of the box).
+"""
+import numpy as np
+from .basic_ops import left_on_many
+
+__all__ = ["PointLocator"]
+
+
+class PointLocator:
+    """
+    Uniform grid of candidate polygon lists over the bounding box of a NavMesh.
+    """
+
+    def __init__(self, navmesh, cell_size: float = None):
+        """
+        :param navmesh:    NavMesh  the mesh to locate points on
+        :param cell_size:  float    side length of grid cells. Chosen from the bounding box
+                                    and #polys if not given.
+        """
+        self.navmesh = navmesh
+        self._cell_size = cell_size
+        self._build()
+
+    def _build(self) -> None:
+        """
+        Bucket the polygons of the mesh into the grid.
+        """
+        navmesh = self.navmesh
+        cell_size = self._cell_size
+        n_polys = navmesh.n_polys
+        verts = navmesh.verts
+
+        pts = verts[navmesh.poly_verts]
+        if n_polys > 0:
+            poly_lo = np.minimum.reduceat(pts, navmesh.poly_offsets[:-1], axis=0)
+            poly_hi = np.maximum.reduceat(pts, navmesh.poly_offsets[:-1], axis=0)
+        else:
+            poly_lo = poly_hi = np.zeros((0, 2))
+
+        self._lo = poly_lo.min(axis=0) if n_polys > 0 else np.zeros(2)
+        extent = np.maximum((poly_hi.max(axis=0) if n_polys > 0 else np.zeros(2)) - self._lo,
+                            1e-9)
+        if cell_size is None:
+            # about one polygon per cell on average
+            cell_size = np.sqrt(extent[0] * extent[1] / max(n_polys, 1))
+            cell_size = max(cell_size, extent.max() / 1024.0)
+        self.cell_size = float(cell_size)
+
+        cell_lo = self._cells(poly_lo)
+        cell_hi = self._cells(poly_hi)
+        self._nx = int(cell_hi[:, 0].max()) + 1 if n_polys > 0 else 1
+        self._ny = int(cell_hi[:, 1].max()) + 1 if n_polys > 0 else 1
+
+        cells = [[] for _ in range(self._nx * self._ny)]
+        for p in np.flatnonzero(navmesh.poly_alive).tolist():
+            for cy in range(cell_lo[p, 1], cell_hi[p, 1] + 1):
+                for cx in range(cell_lo[p, 0], cell_hi[p, 0] + 1):
+                    cells[cy * self._nx + cx].append(p)
+
+        # candidate polygons of cell c: cell_polys[cell_offsets[c]:cell_offsets[c + 1]]
+        self.cell_offsets = np.zeros(len(cells) + 1, dtype=np.int64)
+        np.cumsum([len(c) for c in cells], out=self.cell_offsets[1:])
+        self.cell_polys = np.fromiter((p for c in cells for p in c), dtype=np.int64,
+                                      count=self.cell_offsets[-1])
+
+        # polygons inserted since: cell -> [polygon], as sorted cells and CSR lists when used
+        self._inserted = {}
+        self._n_inserted = 0
+        self._limit = max(64, n_polys // 4)
+        self._side = None
+
+    def insert(self, polys: np.ndarray) -> None:
+        """
+        Add polygons appended to the mesh by an update.
+        :param polys:  np.ndarray  polygon ids
+        """
+        mesh = self.navmesh
+        self._n_inserted += len(polys)
+        if self._n_inserted > self._limit:
+            self._build()
+            return
+        for p in polys.tolist():
+            pts = mesh.verts[mesh.poly(p)]
+            lo, hi = self._cells(np.stack((pts.min(axis=0), pts.max(axis=0)))).tolist()
+            for cy in range(max(lo[1], 0), min(hi[1], self._ny - 1) + 1):
+                for cx in range(max(lo[0], 0), min(hi[0], self._nx - 1) + 1):
+                    self._inserted.setdefault(cy * self._nx + cx, []).append(p)
+        self._side = None
+
+    def _side_table(self) -> (np.ndarray, np.ndarray, np.ndarray):
+        """
+        Inserted polygons as sorted cells and CSR candidate lists.
+        """
+        if self._side is None:
+            cells = np.array(sorted(self._inserted), dtype=np.int64)
+            lists = [self._inserted[c] for c in cells.tolist()]
+            offsets = np.zeros(len(lists) + 1, dtype=np.int64)
+            np.cumsum([len(l) for l in lists], out=offsets[1:])
+            polys = np.fromiter((p for l in lists for p in l), dtype=np.int64,
+                                count=offsets[-1])
+            self._side = (cells, offsets, polys)
+        return self._side
+
+    def _cells(self, points: np.ndarray) -> np.ndarray:
+        """
+        (x, y) grid cell of each point. Same rounding for polygon boxes and queried points.
+        """
+        return np.floor((points - self._lo) / self.cell_size).astype(np.int64)
+
+    def locate(self, points: np.ndarray) -> np.ndarray:
+        """
+        Find the polygon each point is in. A point on an edge shared by several polygons
+        is assigned to the one with the smallest id.
+        :param points:  np.ndarray (N, 2)  2D points
+        :return:        np.ndarray (N, )   polygon id of each point, -1 if outside of the mesh
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        n = points.shape[0]
+        result = np.full(n, -1, dtype=np.int64)
+
+        cxy = self._cells(points)
+        valid = (cxy[:, 0] >= 0) & (cxy[:, 0] < self._nx) & \
+                (cxy[:, 1] >= 0) & (cxy[:, 1] < self._ny)
+        point_ids = np.flatnonzero(valid)
+        cells = cxy[valid, 1] * self._nx + cxy[valid, 0]
+        hits, polys = self._test(points, point_ids, self.cell_offsets[cells],
+                                 self.cell_offsets[cells + 1], self.cell_polys)
+        result[hits] = polys
+
+        if self._inserted:
+            # points not found yet, in a cell with inserted polygons
+            side_cells, side_offsets, side_polys = self._side_table()
+            todo = result[point_ids] < 0
+            point_ids, cells = point_ids[todo], cells[todo]
+            k = np.minimum(np.searchsorted(side_cells, cells), len(side_cells) - 1)
+            has = side_cells[k] == cells
+            hits, polys = self._test(points, point_ids[has], side_offsets[k[has]],
+                                     side_offsets[k[has] + 1], side_polys)
+            result[hits] = polys
+        return result
+
+    def _test(self, points: np.ndarray, point_ids: np.ndarray, starts: np.ndarray,
+              ends: np.ndarray, cand_polys: np.ndarray) -> (np.ndarray, np.ndarray):
+        """
+        Locate points `point_ids` among their candidates cand_polys[starts:ends] (ascending
+        ids).
+        :return:  (np.ndarray, np.ndarray)  the points found, and the polygon of each
+        """
+        mesh = self.navmesh
+        # expand (point, candidate polygon) pairs, of alive polygons
+        counts = ends - starts
+        pair_point = np.repeat(point_ids, counts)
+        pair_poly = cand_polys[_ranges(starts, counts)]
+        alive = mesh.poly_alive[pair_poly]
+        pair_point, pair_poly = pair_point[alive], pair_poly[alive]
+        if pair_point.shape[0] == 0:
+            return pair_point, pair_poly
+
+        # expand (point, polygon edge) tests
+        poly_starts = mesh.poly_offsets[pair_poly]
+        poly_sizes = mesh.poly_offsets[pair_poly + 1] - poly_starts
+        slots = _ranges(poly_starts, poly_sizes)
+        test_points = points[np.repeat(pair_point, poly_sizes)]
+        edges = mesh.edges[slots]
+        on_left = left_on_many(mesh.verts[edges[:, 0]], mesh.verts[edges[:, 1]], test_points)
+
+        group_starts = np.zeros(pair_poly.shape[0], dtype=np.int64)
+        np.cumsum(poly_sizes[:-1], out=group_starts[1:])
+        inside = np.logical_and.reduceat(on_left, group_starts)
+
+        # pairs are grouped by point, and by ascending polygon id in each cell
+        hit_points, first = np.unique(pair_point[inside], return_index=True)
+        return hit_points, pair_poly[inside][first]
+
+
+def _ranges(starts: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """
+    Concatenation of [starts[k], starts[k] + counts[k]) for all k.
+    """
+    total = int(counts.sum())
+    if total == 0:
+        return np.zeros(0, dtype=np.int64)
+    offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+    return offsets + np.arange(total)
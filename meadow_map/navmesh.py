@@ -0,0 +1,546 @@
+"""
+NavMesh: convex polygons from `convexify` with their adjacency, stored in compact arrays.
+
+Polygons are stored in a CSR-style layout, like Recast Navigation's `rcPolyMesh`:
+    poly_offsets:     np.ndarray (#polys + 1, )  polygon p owns slots [offsets[p], offsets[p + 1])
+    poly_verts:       np.ndarray (#slots, )      vertex index (to array `verts`) of each slot
+
+Slot e of polygon p is also the edge from `poly_verts[e]` to the next vertex of p:
+    edges:            np.ndarray (#slots, 2)     (start, end) vertex index of each edge
+    edge_polys:       np.ndarray (#slots, )      polygon owning the edge
+    edge_neighbours:  np.ndarray (#slots, )      polygon on the other side, -1 for walls
+    edge_costs:       np.ndarray (#slots, )      distance between centers of the two polygons
+
+Two polygons are neighbours iff they share an edge (same pair of vertex index). That covers
+both diagonals found by `convexify` and the edges that merge holes by `merge_holes`.
+The shared edge is the portal between them.
+
+Obstacles can be added and removed in place (`add_obstacle` / `remove_obstacle`): only the
+polygons overlapping the obstacle are re-decomposed. Replaced polygons stay in the arrays
+but are marked dead in `poly_alive` and unlinked; the new ones are appended and linked to
+their neighbours through a map from vertex pair to edges, so ids of other polygons are kept.
+An update costs O(size of the re-decomposed area):
+(1) arrays live in buffers with spare capacity, doubled when full, so appending is
+    amortized O(#new slots), and the arrays above are views of the used part;
+(2) the point locator, if built, gets the new polygons inserted in its cells;
+(3) each update is logged (removed polygons, re-linked slots), so that `PathFinder` and
+    `HierarchicalPathFinder` patch their copies of the graph instead of copying it again.
+`compact` drops the dead polygons from the arrays, renumbering the others.
+"""
+import numpy as np
+from shapely.geometry import Polygon
+from shapely.ops import unary_union
+from .build_cache import BuildCache, cached_convexify, cached_merge_holes
+from .locate import PointLocator
+from .quantize import Quantizer
+from .regions import convex_pieces, region_pieces
+
+__all__ = ["NavMesh"]
+
+# arrays appended to by incremental updates, kept in buffers with spare capacity
+_GROWN = ("verts", "poly_offsets", "poly_verts", "edges", "edge_polys", "edge_neighbours",
+          "edge_costs", "centers", "poly_alive", "_boxes")
+
+
+class NavMesh:
+    """
+    Convex polygons with their adjacency.
+    """
+
+    def __init__(self, verts: np.ndarray, polys: [np.ndarray]):
+        """
+        :param verts:  np.ndarray (#verts, 2)  a list of 2D-vertices position
+        :param polys:  [np.ndarray]            a list of convex polygons in counter-clock wise,
+                                               as vertex index (to array `verts`), e.g. output
+                                               of `convexify`
+        """
+        self.verts = np.asarray(verts, dtype=np.float64)
+        sizes = np.array([len(p) for p in polys], dtype=np.int64)
+
+        self.poly_offsets = np.zeros(len(polys) + 1, dtype=np.int64)
+        np.cumsum(sizes, out=self.poly_offsets[1:])
+        self.poly_verts = np.concatenate(
+            [np.asarray(p, dtype=np.int64) for p in polys] + [np.zeros(0, np.int64)]
+        )
+
+        # slot of the next vertex in the same polygon
+        slots = np.arange(self.poly_verts.shape[0])
+        owner = np.repeat(np.arange(len(polys)), sizes)
+        self.edge_polys = owner
+        next_slot = slots + 1
+        last = self.poly_offsets[1:] - 1
+        next_slot[last[sizes > 0]] = self.poly_offsets[:-1][sizes > 0]
+        self.edges = np.stack((self.poly_verts, self.poly_verts[next_slot]), axis=1)
+
+        # polygon centers (mean of vertices)
+        sums = np.add.reduceat(self.verts[self.poly_verts], self.poly_offsets[:-1], axis=0) \
+            if len(polys) > 0 else np.zeros((0, 2))
+        self.centers = sums / np.maximum(sizes, 1)[:, None]
+
+        self.edge_neighbours = np.full(self.poly_verts.shape[0], -1, dtype=np.int64)
+        self._link(slots)
+
+        # cost of crossing each portal: distance between the two polygon centers
+        self.edge_costs = np.zeros(self.poly_verts.shape[0], dtype=np.float64)
+        linked = self.edge_neighbours >= 0
+        self.edge_costs[linked] = np.linalg.norm(
+            self.centers[owner[linked]] - self.centers[self.edge_neighbours[linked]], axis=1
+        )
+
+        # polygons replaced by an incremental update are dead (kept so that ids are stable)
+        self.poly_alive = np.ones(len(polys), dtype=bool)
+        self._init_state()
+
+    def _init_state(self) -> None:
+        """
+        State that is not part of the mesh arrays: lookups, caches and update history.
+        """
+        # point location index, built on first `locate`
+        self._locator = None
+
+        # bumped on every in-place modification, so that caches built on it can tell
+        self.revision = 0
+
+        # (revision, ids of the polygons it removed, slots it re-linked, whether it freed
+        # area) of each incremental update since the last `compact`
+        self._updates = []
+        # revision of the last `compact`: polygon ids from before are not valid since
+        self._renumbered = 0
+        # obstacle id -> (obstacle, area it removed from the mesh), as shapely polygons
+        self._obstacles = {}
+        self._next_obstacle = 0
+        # incremental update lookups, built on first update
+        self._edge_map = None
+        self._vert_ids = None
+        self._boxes = None
+        self._weld = 1.0
+        # name -> buffer whose first rows are the array `name`, see `_extend`
+        self._buffers = None
+
+    def __getstate__(self) -> dict:
+        # lookups are rebuilt on demand, e.g. after being sent to a worker
+        state = self.__dict__.copy()
+        state["_locator"] = None
+        state["_edge_map"] = state["_vert_ids"] = state["_boxes"] = state["_buffers"] = None
+        return state
+
+    @classmethod
+    def from_arrays(cls, arrays: {str: np.ndarray}) -> "NavMesh":
+        """
+        NavMesh over existing arrays, without copy nor linking again. E.g. arrays
+        memory-mapped by `load_navmesh`. Read-only arrays are copied on the first update.
+        :param arrays:  {str: np.ndarray}  verts, poly_offsets, poly_verts, edges, edge_polys,
+                                           edge_neighbours, edge_costs, centers and
+                                           poly_alive, see the module doc
+        :return:        NavMesh
+        """
+        mesh = cls.__new__(cls)
+        for name in ("verts", "poly_offsets", "poly_verts", "edges", "edge_polys",
+                     "edge_neighbours", "edge_costs", "centers", "poly_alive"):
+            setattr(mesh, name, arrays[name])
+        mesh._init_state()  # pylint: disable=protected-access
+        return mesh
+
+    @classmethod
+    def build(cls, verts_poly: np.ndarray, indices_poly: np.ndarray,
+              holes: [(np.ndarray, np.ndarray)] = (), method: str = "arkin",
+              cache: BuildCache = None, *, cell_size: float = None) -> "NavMesh":
+        """
+        Merge holes into the polygon, convexify it and build the NavMesh.
+
+        With `cell_size`, vertices are first snapped to an integer grid (see `quantize.py`)
+        and the build runs on exact integer predicates. Vertices of the NavMesh are the
+        grid points, in world coordinates.
+        :param verts_poly:     np.ndarray (#verts, 2)  a list of 2D-vertices position of polygon
+        :param indices_poly:   np.ndarray (#vert, )    polygon vertex index, counter-clock wise
+        :param holes:          [(np.ndarray (#verts, 2), np.ndarray (#vert, ))]
+                               a list of (verts_hole, indices_hole) of each hole, clock wise
+        :param method:         str                     `convexify` method
+        :param cache:          BuildCache              optional on-disk cache of the results
+        :param cell_size:      float                   grid cell size of integer coordinates,
+                                                       None to build on float coordinates
+        :return:               NavMesh
+        """
+        quantizer = None
+        if cell_size is not None:
+            quantizer = Quantizer(cell_size)
+            verts_poly = quantizer.quantize_ring(verts_poly, indices_poly)
+            holes = [(quantizer.quantize_ring(verts_hole, indices_hole), indices_hole)
+                     for verts_hole, indices_hole in holes]
+
+        verts, indices, _ = cached_merge_holes(verts_poly, indices_poly, list(holes), cache)
+        polys, _ = cached_convexify(verts, indices, method, cache)
+        if quantizer is not None:
+            verts = quantizer.dequantize(verts)
+        return cls(verts, polys)
+
+    def _link(self, slots: np.ndarray) -> None:
+        """
+        Link edges in `slots` to the edges sharing the same pair of vertex index.
+        One hash lookup per edge, keyed on the sorted vertex pair.
+        """
+        n_verts = max(self.verts.shape[0], 1)
+        lo = np.minimum(self.edges[slots, 0], self.edges[slots, 1])
+        hi = np.maximum(self.edges[slots, 0], self.edges[slots, 1])
+        keys = (lo * n_verts + hi).tolist()
+
+        pending = {}
+        for slot, key in zip(slots.tolist(), keys):
+            other = pending.pop(key, None)
+            if other is None:
+                pending[key] = slot
+                continue
+            p, q = self.edge_polys[slot], self.edge_polys[other]
+            if p != q:
+                self.edge_neighbours[slot] = q
+                self.edge_neighbours[other] = p
+
+    @property
+    def n_polys(self) -> int:
+        """
+        Number of polygons.
+        """
+        return self.poly_offsets.shape[0] - 1
+
+    def locate(self, points: np.ndarray) -> np.ndarray:
+        """
+        Find the polygon each point is in, see `PointLocator.locate`.
+        :param points:  np.ndarray (N, 2)  2D points
+        :return:        np.ndarray (N, )   polygon id of each point, -1 if outside of the mesh
+        """
+        if self._locator is None:
+            self._locator = PointLocator(self)
+        return self._locator.locate(points)
+
+    def poly(self, p: int) -> np.ndarray:
+        """
+        :param p:   int         polygon id
+        :return:    np.ndarray  vertex index (to array `verts`) of polygon `p`, counter-clock wise
+        """
+        return self.poly_verts[self.poly_offsets[p]:self.poly_offsets[p + 1]]
+
+    def neighbours(self, p: int) -> np.ndarray:
+        """
+        :param p:   int         polygon id
+        :return:    np.ndarray  ids of polygons sharing an edge with polygon `p`
+        """
+        neis = self.edge_neighbours[self.poly_offsets[p]:self.poly_offsets[p + 1]]
+        return neis[neis >= 0]
+
+    def portal(self, p: int, q: int) -> (int, int):
+        """
+        Shared edge of two neighbouring polygons, seen when moving from `p` to `q`.
+        :param p:   int         polygon id
+        :param q:   int         polygon id of a neighbour of `p`
+        :return:    (int, int)  vertex index (to array `verts`) of the (left, right) end of
+                                the portal. -1, -1 if `p` and `q` are not neighbours.
+        """
+        start, end = self.poly_offsets[p], self.poly_offsets[p + 1]
+        hits = np.flatnonzero(self.edge_neighbours[start:end] == q)
+        if len(hits) == 0:
+            return -1, -1
+        # polygons are counter-clock wise: the inside is at left of each edge
+        a, b = self.edges[start + hits[0]]
+        return int(b), int(a)
+
+    def removed_since(self, revision: int) -> np.ndarray:
+        """
+        :param revision:  int         a past value of `revision`
+        :return:          np.ndarray  ids of the polygons removed by updates after `revision`
+        """
+        removed = [dead for rev, dead, _, _ in self._updates if rev > revision]
+        return np.concatenate(removed + [np.zeros(0, np.int64)])
+
+    def relinked_since(self, revision: int) -> np.ndarray:
+        """
+        :param revision:  int         a past value of `revision`
+        :return:          np.ndarray  slots whose neighbour or cost was changed by updates
+                                      after `revision` (may repeat)
+        """
+        relinked = [slots for rev, _, slots, _ in self._updates if rev > revision]
+        return np.concatenate(relinked + [np.zeros(0, np.int64)])
+
+    def patch_graph(self, revision: int, offsets: [int], neis: [int], costs: [float],
+                    centers: [[float]]) -> [int]:
+        """
+        Bring copies of the graph as lists (e.g. made by `PathFinder`) at `revision` up to
+        date, in place: re-linked slots are patched, and appended polygons and slots copied.
+        Polygons should not have been renumbered since (`renumbered_since`).
+        :param revision:  int        `revision` of the copies
+        :param offsets:   [int]      copy of `poly_offsets`
+        :param neis:      [int]      copy of `edge_neighbours`
+        :param costs:     [float]    copy of `edge_costs`
+        :param centers:   [[float]]  copy of `centers`
+        :return:          [int]      the patched slots
+        """
+        n, n_slots = len(centers), len(neis)
+        patched = [s for s in set(self.relinked_since(revision).tolist()) if s < n_slots]
+        for s in patched:
+            neis[s] = int(self.edge_neighbours[s])
+            costs[s] = float(self.edge_costs[s])
+        offsets.extend(self.poly_offsets[n + 1:].tolist())
+        neis.extend(self.edge_neighbours[n_slots:].tolist())
+        costs.extend(self.edge_costs[n_slots:].tolist())
+        centers.extend(self.centers[n:].tolist())
+        return patched
+
+    def freed_since(self, revision: int) -> bool:
+        """
+        :param revision:  int   a past value of `revision`
+        :return:          bool  whether an update after `revision` gave area back to the mesh
+                                (`remove_obstacle`), so that shorter routes may exist
+        """
+        return any(freed for rev, _, _, freed in self._updates if rev > revision)
+
+    def renumbered_since(self, revision: int) -> bool:
+        """
+        :param revision:  int   a past value of `revision`
+        :return:          bool  whether polygons were renumbered by `compact` after `revision`,
+                                so that ids (and the update log) from then are not valid
+        """
+        return self._renumbered > revision
+
+    def compact(self) -> np.ndarray:
+        """
+        Drop the dead polygons left by updates from the arrays. The other polygons are
+        renumbered in the same order: ids from before are no longer valid.
+        :return:  np.ndarray (#polys, )  new id of each former polygon, -1 for dead ones
+        """
+        alive = np.flatnonzero(self.poly_alive)
+        remap = np.full(self.n_polys, -1, dtype=np.int64)
+        remap[alive] = np.arange(len(alive))
+        if len(alive) == self.n_polys:
+            return remap
+
+        # slots of each polygon are contiguous and in polygon order
+        kept = self.poly_alive[self.edge_polys]
+        sizes = np.diff(self.poly_offsets)[alive]
+        self.poly_offsets = np.zeros(len(alive) + 1, dtype=np.int64)
+        np.cumsum(sizes, out=self.poly_offsets[1:])
+        self.poly_verts = self.poly_verts[kept]
+        self.edges = self.edges[kept]
+        self.edge_polys = remap[self.edge_polys[kept]]
+        neis = self.edge_neighbours[kept]
+        self.edge_neighbours = np.where(neis >= 0, remap[neis], -1)
+        self.edge_costs = self.edge_costs[kept]
+        self.centers = self.centers[alive]
+        self.poly_alive = np.ones(len(alive), dtype=bool)
+
+        self.revision += 1
+        self._renumbered = self.revision
+        self._updates = []
+        self._locator = None
+        self._edge_map = self._vert_ids = self._boxes = self._buffers = None
+        return remap
+
+    def add_obstacle(self, verts_hole: np.ndarray, method: str = "arkin") -> int:
+        """
+        Cut an obstacle out of the mesh. Only the polygons it overlaps are re-decomposed.
+        :param verts_hole:  np.ndarray (#vert, 2)  vertices of a simple polygon, in any order
+        :param method:      str                    `convexify` method
+        :return:            int                    obstacle id, for `remove_obstacle`
+        """
+        obstacle = Polygon(np.asarray(verts_hole, dtype=np.float64))
+        if not obstacle.is_valid or obstacle.area <= 0:
+            raise ValueError("Obstacle should be a simple polygon")
+        self._prepare_update()
+
+        affected = self._overlapping(obstacle, touching=False)
+        region = unary_union([self._shape(p) for p in affected])
+        carved = region.intersection(obstacle)
+        if affected:
+            self._replace(affected, region.difference(obstacle), method)
+
+        oid = self._next_obstacle
+        self._next_obstacle += 1
+        self._obstacles[oid] = (obstacle, carved)
+        return oid
+
+    def remove_obstacle(self, oid: int, method: str = "arkin") -> None:
+        """
+        Give back the area cut out by `add_obstacle`, except for the parts still covered by
+        other obstacles. The polygons around it are re-decomposed with it.
+        :param oid:     int  obstacle id returned by `add_obstacle`
+        :param method:  str  `convexify` method
+        """
+        if oid not in self._obstacles:
+            raise KeyError(f"Unknown obstacle: {oid}")
+        _, carved = self._obstacles.pop(oid)
+        if carved.is_empty:
+            return
+        self._prepare_update()
+
+        affected = self._overlapping(carved, touching=True)
+        region = unary_union([self._shape(p) for p in affected] + [carved])
+        for other, (obstacle, other_carved) in self._obstacles.items():
+            if obstacle.intersects(carved):
+                # that part is now removed by the other obstacle
+                self._obstacles[other] = (obstacle,
+                                          other_carved.union(carved.intersection(obstacle)))
+                region = region.difference(obstacle)
+        self._replace(affected, region, method, freed=True)
+
+    def _shape(self, p: int) -> Polygon:
+        return Polygon(self.verts[self.poly(p)])
+
+    def _prepare_update(self) -> None:
+        """
+        Build the lookups used by incremental updates, once.
+        """
+        if self._edge_map is not None:
+            return
+        self._edge_map = {}
+        alive = self.poly_alive[self.edge_polys]
+        for slot, (a, b) in enumerate(self.edges.tolist()):
+            if alive[slot]:
+                self._edge_map.setdefault((min(a, b), max(a, b)), []).append(slot)
+
+        # vertices are welded by position, on a grid much finer than the mesh
+        extent = float(np.ptp(self.verts, axis=0).max()) if self.verts.shape[0] > 0 else 1.0
+        self._weld = 1e-9 * max(extent, 1e-9)
+        self._vert_ids = {}
+        for i, key in enumerate(np.round(self.verts / self._weld).astype(np.int64).tolist()):
+            self._vert_ids.setdefault(tuple(key), i)
+
+        pts = self.verts[self.poly_verts]
+        if self.n_polys > 0:
+            self._boxes = np.concatenate(
+                (np.minimum.reduceat(pts, self.poly_offsets[:-1], axis=0),
+                 np.maximum.reduceat(pts, self.poly_offsets[:-1], axis=0)), axis=1
+            )
+        else:
+            self._boxes = np.zeros((0, 4))
+
+        # copied into writable buffers (arrays may be read-only, e.g. memory-mapped)
+        self._buffers = {}
+        for name in _GROWN:
+            arr = getattr(self, name)
+            buf = np.empty((max(2 * arr.shape[0], 16),) + arr.shape[1:], dtype=arr.dtype)
+            buf[:arr.shape[0]] = arr
+            self._buffers[name] = buf
+            setattr(self, name, buf[:arr.shape[0]])
+
+    def _extend(self, name: str, rows: np.ndarray) -> None:
+        """
+        Append rows to array `name` in its buffer, reallocated with twice the capacity when
+        full (amortized O(#rows)).
+        """
+        arr = getattr(self, name)
+        buf = self._buffers[name]
+        n, m = arr.shape[0], arr.shape[0] + len(rows)
+        if m > buf.shape[0]:
+            buf = np.empty((max(m, 2 * buf.shape[0]),) + buf.shape[1:], dtype=buf.dtype)
+            buf[:n] = arr
+            self._buffers[name] = buf
+        buf[n:m] = rows
+        setattr(self, name, buf[:m])
+
+    def _overlapping(self, shape: Polygon, touching: bool) -> [int]:
+        """
+        Alive polygons overlapping `shape` (with a positive area, or at all if `touching`).
+        """
+        x0, y0, x1, y1 = shape.bounds
+        boxes = self._boxes
+        cand = np.flatnonzero(self.poly_alive & (boxes[:, 0] <= x1) & (boxes[:, 2] >= x0) &
+                              (boxes[:, 1] <= y1) & (boxes[:, 3] >= y0))
+        min_area = (self._weld * 1e3) ** 2
+        res = []
+        for p in cand.tolist():
+            poly = self._shape(p)
+            if touching:
+                if poly.intersects(shape):
+                    res.append(p)
+            elif poly.intersection(shape).area > min_area:
+                res.append(p)
+        return res
+
+    def _replace(self, dead: [int], region, method: str, freed: bool = False) -> None:
+        """
+        Replace polygons `dead` by the convex decomposition of `region` and patch adjacency.
+        `freed` tells that `region` is larger than the area of `dead`.
+        """
+        edge_map = self._edge_map
+        relinked = []
+        # unlink removed polygons
+        for p in dead:
+            self.poly_alive[p] = False
+            for s in range(self.poly_offsets[p], self.poly_offsets[p + 1]):
+                a, b = self.edges[s].tolist()
+                slots = edge_map[(min(a, b), max(a, b))]
+                slots.remove(s)
+                for o in slots:
+                    if self.edge_neighbours[o] == p:
+                        self.edge_neighbours[o] = -1
+                        self.edge_costs[o] = 0.0
+                        relinked.append(o)
+                self.edge_neighbours[s] = -1
+                self.edge_costs[s] = 0.0
+                relinked.append(s)
+
+        # new polygons, their vertices welded to the existing ones
+        new_verts = []
+        polys = []
+        for verts, local_polys in (convex_pieces(piece, method) for piece in
+                                   region_pieces(region, (self._weld * 1e3) ** 2)):
+            ids = []
+            for x, y in verts.tolist():
+                key = (round(x / self._weld), round(y / self._weld))
+                vid = self._vert_ids.get(key)
+                if vid is None:
+                    vid = self.verts.shape[0] + len(new_verts)
+                    self._vert_ids[key] = vid
+                    new_verts.append((x, y))
+                ids.append(vid)
+            ids = np.array(ids, dtype=np.int64)
+            polys.extend(ids[np.asarray(p)] for p in local_polys)
+        first_poly = self.n_polys
+        if polys:
+            relinked.extend(self._append(np.array(new_verts, dtype=np.float64).reshape(-1, 2),
+                                         polys))
+        if self._locator is not None:
+            self._locator.insert(np.arange(first_poly, self.n_polys))
+
+        self.revision += 1
+        self._updates.append((self.revision, np.array(dead, dtype=np.int64),
+                              np.array(relinked, dtype=np.int64), freed))
+
+    def _append(self, new_verts: np.ndarray, polys: [np.ndarray]) -> [int]:
+        """
+        Append polygons to the arrays and link them to the edges they share.
+        :return:  [int]  former slots linked to the new polygons
+        """
+        first_poly = self.n_polys
+        first_slot = self.poly_verts.shape[0]
+        sizes = np.array([len(p) for p in polys], dtype=np.int64)
+        poly_verts = np.concatenate(polys)
+        next_verts = np.concatenate([np.roll(p, -1) for p in polys])
+        owner = np.repeat(np.arange(first_poly, first_poly + len(polys)), sizes)
+
+        self._extend("verts", new_verts)
+        pts = [self.verts[p] for p in polys]
+        self._extend("poly_offsets", first_slot + np.cumsum(sizes))
+        self._extend("poly_verts", poly_verts)
+        self._extend("edges", np.stack((poly_verts, next_verts), axis=1))
+        self._extend("edge_polys", owner)
+        self._extend("centers", [p.mean(axis=0) for p in pts])
+        self._extend("poly_alive", np.ones(len(polys), dtype=bool))
+        self._extend("_boxes", [np.concatenate((p.min(axis=0), p.max(axis=0))) for p in pts])
+        self._extend("edge_neighbours", np.full(len(poly_verts), -1, dtype=np.int64))
+        self._extend("edge_costs", np.zeros(len(poly_verts)))
+
+        relinked = []
+        centers = self.centers
+        for s, a, b, p in zip(range(first_slot, first_slot + len(poly_verts)),
+                              poly_verts.tolist(), next_verts.tolist(), owner.tolist()):
+            slots = self._edge_map.setdefault((min(a, b), max(a, b)), [])
+            for o in slots:
+                q = int(self.edge_polys[o])
+                if q != p and self.edge_neighbours[o] < 0:
+                    cost = float(np.linalg.norm(centers[p] - centers[q]))
+                    self.edge_neighbours[s] = q
+                    self.edge_neighbours[o] = p
+                    self.edge_costs[s] = self.edge_costs[o] = cost
+                    if o < first_slot:
+                        relinked.append(o)
+            slots.append(s)
+        return relinked
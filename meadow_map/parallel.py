@@ -0,0 +1,157 @@
+"""
+Batched path queries, optionally spread over a process pool.
+
+`PathWorkers` keeps a pool of worker processes across batches. The NavMesh is written once
+to a temporary file (`save_navmesh`) that every worker memory-maps (`load_navmesh`), so
+the arrays are not pickled to each worker and the pages of the file are shared between
+processes. Each worker keeps one `PathFinder`, so the search buffers are allocated once
+per worker and reused by every query it runs. Queries are sent in contiguous chunks, one
+task per chunk, and the results are returned in query order.
+
+If the mesh is updated (`NavMesh.revision` changed), the file is written again and the
+pool restarted on the next batch.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import os
+import tempfile
+import numpy as np
+from .navmesh import NavMesh
+from .pathfind import PathFinder, shared_finder
+from .funnel import string_pull
+from .serialize import save_navmesh, load_navmesh
+
+__all__ = ["PathWorkers", "find_paths"]
+
+# per-process state of pool workers
+_WORKER_FINDER = None
+
+
+def _init_worker(path: str) -> None:
+    global _WORKER_FINDER  # pylint: disable=global-statement
+    _WORKER_FINDER = PathFinder(load_navmesh(path))
+
+
+def _run_chunk(finder: PathFinder, start_polys: np.ndarray, goal_polys: np.ndarray,
+               starts: np.ndarray, goals: np.ndarray) -> [([int], np.ndarray)]:
+    """
+    Corridor and funnel path of each query of a chunk.
+    """
+    res = []
+    for sp, gp, start, goal in zip(start_polys.tolist(), goal_polys.tolist(), starts, goals):
+        corridor = finder.find(sp, gp)
+        res.append((corridor, string_pull(finder.navmesh, corridor, start, goal)))
+    return res
+
+
+def _worker_chunk(start_polys: np.ndarray, goal_polys: np.ndarray,
+                  starts: np.ndarray, goals: np.ndarray) -> [([int], np.ndarray)]:
+    return _run_chunk(_WORKER_FINDER, start_polys, goal_polys, starts, goals)
+
+
+class PathWorkers:
+    """
+    Pool of worker processes answering batches of path queries on one NavMesh.
+    Use as a context manager, or call `close` when done.
+    """
+
+    def __init__(self, navmesh: NavMesh, workers: int = None):
+        """
+        :param navmesh:  NavMesh  the mesh to search on
+        :param workers:  int      number of worker processes. Queries run in this process
+                                  (no pool) if None or <= 1.
+        """
+        self.navmesh = navmesh
+        self.workers = workers if workers is not None and workers > 1 else 1
+        self._pool = None
+        self._path = None
+        self._revision = None
+
+    def __enter__(self) -> "PathWorkers":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Shut the worker processes down and delete the mesh file.
+        """
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        if self._path is not None:
+            os.remove(self._path)
+            self._path = None
+
+    def _start(self) -> ProcessPoolExecutor:
+        """
+        The pool, started (again if the mesh was updated since) on first use.
+        """
+        if self._pool is not None and self._revision == self.navmesh.revision:
+            return self._pool
+        self.close()
+        fd, self._path = tempfile.mkstemp(suffix=".navmesh")
+        os.close(fd)
+        save_navmesh(self.navmesh, self._path)
+        self._revision = self.navmesh.revision
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                         initargs=(self._path,))
+        return self._pool
+
+    def find_paths(self, starts: np.ndarray, goals: np.ndarray,
+                   chunk_size: int = None) -> [[[int]], [np.ndarray]]:
+        """
+        Find the corridors and the funnel paths of many queries at once, see `find_paths`.
+        :param starts:      np.ndarray (N, 2)  start point of each query
+        :param goals:       np.ndarray (N, 2)  goal point of each query
+        :param chunk_size:  int                number of queries per task sent to a worker,
+                                               by default the queries are split evenly
+        :return:  ([[int]], [np.ndarray])  corridor and path of each query
+        """
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError(f"chunk_size should be at least 1, got {chunk_size}")
+        starts = np.asarray(starts, dtype=np.float64).reshape(-1, 2)
+        goals = np.asarray(goals, dtype=np.float64).reshape(-1, 2)
+        if starts.shape != goals.shape:
+            raise ValueError(f"{starts.shape[0]} starts but {goals.shape[0]} goals")
+        start_polys = self.navmesh.locate(starts)
+        goal_polys = self.navmesh.locate(goals)
+        n = starts.shape[0]
+
+        if self.workers <= 1 or n <= 1:
+            res = _run_chunk(shared_finder(self.navmesh), start_polys, goal_polys,
+                             starts, goals)
+        else:
+            chunk_size = int(chunk_size) if chunk_size is not None else -(-n // self.workers)
+            bounds = range(0, n, chunk_size)
+            chunks = self._start().map(_worker_chunk,
+                                       [start_polys[i:i + chunk_size] for i in bounds],
+                                       [goal_polys[i:i + chunk_size] for i in bounds],
+                                       [starts[i:i + chunk_size] for i in bounds],
+                                       [goals[i:i + chunk_size] for i in bounds])
+            res = [item for chunk in chunks for item in chunk]
+
+        return [c for c, _ in res], [p for _, p in res]
+
+
+def find_paths(navmesh: NavMesh, starts: np.ndarray, goals: np.ndarray,
+               workers: int = None, chunk_size: int = None) -> [[[int]], [np.ndarray]]:
+    """
+    Find the corridors and the funnel paths of many queries at once.
+    Start and goal polygons are located in one batch (`NavMesh.locate`).
+    The pool lives for this call only, keep a `PathWorkers` to answer several batches.
+    :param navmesh:     NavMesh            the mesh to search on (read-only)
+    :param starts:      np.ndarray (N, 2)  start point of each query
+    :param goals:       np.ndarray (N, 2)  goal point of each query
+    :param workers:     int                number of worker processes. Queries run in this
+                                           process if None or <= 1.
+    :param chunk_size:  int                number of queries per task sent to a worker (at
+                                           least 1), by default the queries are split evenly
+    :return:  ([[int]], [np.ndarray])
+        corridor of each query (polygon ids from start to goal polygon), empty if the start
+        or goal is out of the mesh or the goal could not be reached
+
+        path of each query (np.ndarray (#points, 2)), empty if the corridor is empty
+    """
+    with PathWorkers(navmesh, workers) as pool:
+        return pool.find_paths(starts, goals, chunk_size)
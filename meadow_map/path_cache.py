@@ -0,0 +1,88 @@
+"""
+LRU cache of polygon corridors, keyed on (start polygon, goal polygon).
+
+The cache is bound to one NavMesh at a time: it is cleared when asked about another
+NavMesh (e.g. a rebuilt one). When the NavMesh was updated in place (its `revision`
+changed):
+(1) obstacles were only added: the corridors through polygons removed by the update are
+    dropped, and so are the empty ones (unreachable goals).
+(2) an obstacle was removed: freed area may give shorter routes to any corridor, so the
+    cache is cleared. So it is when polygons were renumbered (`NavMesh.compact`).
+"""
+from collections import OrderedDict
+import weakref
+from .navmesh import NavMesh
+
+__all__ = ["PathCache"]
+
+
+class PathCache:
+    """
+    Bounded-size LRU cache of corridors found by `find_path`.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        """
+        :param maxsize:  int  max number of corridors kept
+        """
+        if maxsize <= 0:
+            raise ValueError(f"maxsize should be positive, got {maxsize}")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._corridors = OrderedDict()
+        self._navmesh = None
+        self._revision = None
+
+    def __len__(self) -> int:
+        return len(self._corridors)
+
+    def clear(self) -> None:
+        """
+        Drop all corridors (hit/miss counters are kept).
+        """
+        self._corridors.clear()
+        self._navmesh = None
+        self._revision = None
+
+    def _bind(self, navmesh: NavMesh) -> None:
+        """
+        Drop the corridors found on another NavMesh, or out of date since, see module doc.
+        """
+        bound = self._navmesh() if self._navmesh is not None else None
+        if bound is not navmesh or (self._revision != navmesh.revision and (
+                navmesh.freed_since(self._revision) or
+                navmesh.renumbered_since(self._revision))):
+            self._corridors.clear()
+            self._navmesh = weakref.ref(navmesh)
+        elif self._revision != navmesh.revision:
+            removed = set(navmesh.removed_since(self._revision).tolist())
+            for key in [k for k, c in self._corridors.items()
+                        if not c or not removed.isdisjoint(c)]:
+                del self._corridors[key]
+        self._revision = navmesh.revision
+
+    def get(self, navmesh: NavMesh, start_poly: int, goal_poly: int) -> [int]:
+        """
+        :return:  [int]  the cached corridor (marked as most recently used), None if missing
+        """
+        self._bind(navmesh)
+        key = (int(start_poly), int(goal_poly))
+        corridor = self._corridors.get(key)
+        if corridor is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._corridors.move_to_end(key)
+        return list(corridor)
+
+    def put(self, navmesh: NavMesh, start_poly: int, goal_poly: int, corridor: [int]) -> None:
+        """
+        Store a corridor, evicting the least recently used one if the cache is full.
+        """
+        self._bind(navmesh)
+        key = (int(start_poly), int(goal_poly))
+        self._corridors[key] = tuple(corridor)
+        self._corridors.move_to_end(key)
+        if len(self._corridors) > self.maxsize:
+            self._corridors.popitem(last=False)
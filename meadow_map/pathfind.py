@@ -0,0 +1,267 @@
+"""
+A* search over the polygons of a NavMesh.
+
+The search state lives in flat arrays indexed by polygon id (g, f, parent, heap position),
+allocated once per NavMesh and reused by every query. Each query bumps an epoch counter:
+an entry is only valid if its stamp equals the current epoch, so the arrays never need
+to be cleared between queries. After an update of the NavMesh, only the changed slots and
+the appended polygons are copied again (see `NavMesh.relinked_since`).
+
+The open list is an indexed binary heap of polygon ids keyed on f, with O(log n)
+decrease-key through the heap position array. It is the same algorithm as
+`utils.MinBinaryHeap.IndexedMinBinaryHeap`, inlined on purpose: the keys are read from the
+f array of the search state instead of a priority list of its own, and the heap needs no
+reset between queries (positions are only read for polygons seen in the current epoch).
+On A* queries this is 10-25% faster than the shared heap, see `benchmarks/bench_heap.py`.
+"""
+import functools
+import weakref
+import numpy as np
+from .navmesh import NavMesh
+from .path_cache import PathCache
+from .landmarks import LandmarkTable
+
+__all__ = ["PathFinder", "find_path", "shared_finder"]
+
+
+class PathFinder:
+    """
+    A* search over a NavMesh, with search buffers reused across queries.
+    """
+
+    def __init__(self, navmesh: NavMesh, landmarks: LandmarkTable = None):
+        """
+        :param navmesh:    NavMesh        the mesh to search on
+        :param landmarks:  LandmarkTable  optional ALT heuristic, straight-line distance
+                                          between polygon centers if not given (or out of
+                                          date after an update of the mesh)
+        """
+        self.navmesh = navmesh
+        self.landmarks = landmarks
+        self._epoch = 0
+        self._load()
+
+        # number of polygons expanded by the last query
+        self.expanded = 0
+
+    def _load(self) -> None:
+        """
+        Copy the graph of the NavMesh and allocate search buffers, again after it was updated.
+        """
+        navmesh = self.navmesh
+        n = navmesh.n_polys
+        self._revision = navmesh.revision
+
+        # graph, as plain lists for fast scalar access in the search loop
+        self._offsets = navmesh.poly_offsets.tolist()
+        self._neis = navmesh.edge_neighbours.tolist()
+        self._costs = navmesh.edge_costs.tolist()
+        self._centers = navmesh.centers.tolist()
+        self._alive = navmesh.poly_alive.tolist()
+
+        # search state, valid for polygon p iff _seen[p] == _epoch
+        self._seen = [0] * n
+        self._closed = [0] * n
+        self._g = [0.0] * n
+        self._f = [0.0] * n
+        self._parent = [-1] * n
+
+        # open list: heap of polygon ids and position of each polygon in the heap
+        self._heap = [0] * n
+        self._heap_pos = [0] * n
+        self._heap_size = 0
+
+    def _update(self) -> None:
+        """
+        Patch the copy of the graph after updates of the NavMesh: re-linked slots, removed
+        polygons, and polygons appended since. Loaded again if polygons were renumbered.
+        """
+        navmesh = self.navmesh
+        if navmesh.renumbered_since(self._revision):
+            self._load()
+            return
+        alive = self._alive
+        n, added = len(alive), navmesh.n_polys - len(alive)
+        for p in navmesh.removed_since(self._revision).tolist():
+            if p < n:
+                alive[p] = False
+        navmesh.patch_graph(self._revision, self._offsets, self._neis, self._costs,
+                            self._centers)
+        alive.extend(navmesh.poly_alive[n:].tolist())
+        self._revision = navmesh.revision
+        for buf, value in ((self._seen, 0), (self._closed, 0), (self._g, 0.0), (self._f, 0.0),
+                           (self._parent, -1), (self._heap, 0), (self._heap_pos, 0)):
+            buf.extend([value] * added)
+
+    def _sift_up(self, i: int) -> None:
+        heap, pos, f = self._heap, self._heap_pos, self._f
+        p = heap[i]
+        while i > 0:
+            parent = (i - 1) >> 1
+            q = heap[parent]
+            if f[q] <= f[p]:
+                break
+            heap[i] = q
+            pos[q] = i
+            i = parent
+        heap[i] = p
+        pos[p] = i
+
+    def _sift_down(self, i: int) -> None:
+        heap, pos, f = self._heap, self._heap_pos, self._f
+        size = self._heap_size
+        p = heap[i]
+        while True:
+            child = 2 * i + 1
+            if child >= size:
+                break
+            if child + 1 < size and f[heap[child + 1]] < f[heap[child]]:
+                child += 1
+            q = heap[child]
+            if f[p] <= f[q]:
+                break
+            heap[i] = q
+            pos[q] = i
+            i = child
+        heap[i] = p
+        pos[p] = i
+
+    def _push(self, p: int) -> None:
+        self._heap[self._heap_size] = p
+        self._heap_size += 1
+        self._sift_up(self._heap_size - 1)
+
+    def _pop(self) -> int:
+        p = self._heap[0]
+        self._heap_size -= 1
+        if self._heap_size > 0:
+            self._heap[0] = self._heap[self._heap_size]
+            self._sift_down(0)
+        return p
+
+    def _valid(self, p: int) -> bool:
+        """
+        Whether `p` is the id of a live polygon.
+        """
+        return 0 <= p < len(self._alive) and self._alive[p]
+
+    def _heuristic(self, p: int, goal: int) -> float:
+        """
+        Straight-line distance between polygon centers, consistent with the edge costs.
+        """
+        cp = self._centers[p]
+        cg = self._centers[goal]
+        return ((cp[0] - cg[0]) ** 2 + (cp[1] - cg[1]) ** 2) ** 0.5
+
+    def find(self, start: int, goal: int) -> [int]:
+        """
+        Find the polygon corridor between two polygons.
+        :param start:  int    id of start polygon
+        :param goal:   int    id of goal polygon
+        :return:       [int]  ids of polygons from `start` to `goal` (both included),
+                              empty if `goal` could not be reached, or if `start` or `goal`
+                              is not a polygon of the mesh (out of range or removed)
+        """
+        if self._revision != self.navmesh.revision:
+            self._update()
+        self._epoch += 1
+        self.expanded = 0
+        if not (self._valid(start) and self._valid(goal)):
+            return []
+        epoch = self._epoch
+        seen, closed = self._seen, self._closed
+        g, f, parent = self._g, self._f, self._parent
+        offsets, neis, costs = self._offsets, self._neis, self._costs
+        if self.landmarks is not None and self.landmarks.revision == self._revision:
+            heuristic = self.landmarks.heuristic(goal)
+        else:
+            heuristic = functools.partial(self._heuristic, goal=goal)
+
+        seen[start] = epoch
+        g[start] = 0.0
+        f[start] = heuristic(start)
+        parent[start] = -1
+        self._heap_size = 0
+        self._push(start)
+
+        while self._heap_size > 0:
+            p = self._pop()
+            if p == goal:
+                return self._corridor(goal)
+            closed[p] = epoch
+            self.expanded += 1
+
+            for e in range(offsets[p], offsets[p + 1]):
+                q = neis[e]
+                if q < 0 or closed[q] == epoch:
+                    continue
+                gq = g[p] + costs[e]
+                if seen[q] != epoch:
+                    seen[q] = epoch
+                    g[q] = gq
+                    f[q] = gq + heuristic(q)
+                    parent[q] = p
+                    self._push(q)
+                elif gq < g[q]:
+                    # decrease-key
+                    f[q] -= g[q] - gq
+                    g[q] = gq
+                    parent[q] = p
+                    self._sift_up(self._heap_pos[q])
+        return []
+
+    def _corridor(self, goal: int) -> [int]:
+        path = []
+        p = goal
+        while p != -1:
+            path.append(p)
+            p = self._parent[p]
+        path.reverse()
+        return path
+
+    def cost(self, goal: int) -> float:
+        """
+        :param goal:  int    id of the goal polygon of the last query
+        :return:      float  cost of the last found corridor
+        """
+        if not self._valid(goal) or self._seen[goal] != self._epoch:
+            return np.inf
+        return self._g[goal]
+
+
+_FINDERS = weakref.WeakKeyDictionary()
+
+
+def find_path(navmesh: NavMesh, start_poly: int, goal_poly: int,
+              cache: PathCache = None) -> [int]:
+    """
+    Find the polygon corridor between two polygons of a NavMesh by A*.
+    Search buffers are kept per NavMesh and reused by later queries.
+    :param navmesh:      NavMesh    the mesh to search on
+    :param start_poly:   int        id of start polygon
+    :param goal_poly:    int        id of goal polygon
+    :param cache:        PathCache  optional cache of corridors, looked up before searching
+    :return:             [int]      ids of polygons from start to goal (both included),
+                                    empty if goal could not be reached, or if start or goal
+                                    is not a polygon of the mesh (out of range or removed)
+    """
+    if cache is not None:
+        corridor = cache.get(navmesh, start_poly, goal_poly)
+        if corridor is None:
+            corridor = shared_finder(navmesh).find(start_poly, goal_poly)
+            cache.put(navmesh, start_poly, goal_poly, corridor)
+        return corridor
+    return shared_finder(navmesh).find(start_poly, goal_poly)
+
+
+def shared_finder(navmesh: NavMesh) -> PathFinder:
+    """
+    The PathFinder kept for `navmesh` (the one used by `find_path`), created on first use.
+    :param navmesh:  NavMesh     the mesh to search on
+    :return:         PathFinder
+    """
+    finder = _FINDERS.get(navmesh)
+    if finder is None:
+        finder = PathFinder(navmesh)
+        _FINDERS[navmesh] = finder
+    return finder
@@ -0,0 +1,170 @@
+"""
+Robust orientation predicate with adaptive precision.
+
+orient2d(a, b, c) is the determinant
+    | ax - cx  ay - cy |
+    | bx - cx  by - cy |
+positive iff a, b, c are in counter-clock wise order (c at left of ab), zero iff they are
+collinear. Its sign is exact for any float64 input.
+
+(1) A fast filter evaluates the determinant in floating point. Its sign is certain when
+    the magnitude exceeds the forward error bound (Shewchuk's `ccwerrboundA`).
+(2) Only inconclusive triples go to the exact stage: the determinant is expanded into six
+    coordinate products, each product is split into an exact (head, tail) pair
+    (Dekker's two-product), and the twelve terms are summed with `math.fsum`, which is
+    exactly rounded (Shewchuk's expansion arithmetic), so the sign of the sum is exact.
+
+Exactness assumes that products of coordinates neither overflow nor underflow, i.e.
+coordinate magnitudes within about [1e-140, 1e140] (or zero).
+
+Integer coordinates (e.g. quantized by `quantize.Quantizer`) skip both stages: the
+determinant is computed exactly in int64 (or Python int), which does not overflow for
+coordinates within [-MAX_COORD, MAX_COORD]. Integer arrays beyond that range are computed
+exactly in Python ints instead (slow, but never a wrong sign).
+
+Refer to: Jonathan R. Shewchuk, "Adaptive Precision Floating-Point Arithmetic and Fast
+Robust Geometric Predicates" (1997).
+"""
+import math
+import numpy as np
+
+__all__ = ["MAX_COORD", "orient2d", "orient2d_many"]
+
+# largest integer coordinate magnitude: differences fit in 31 bits, products in 62 bits
+MAX_COORD = 2 ** 30 - 1
+
+_EPSILON = 2.0 ** -53
+# relative error bound of the floating point determinant
+_CCW_ERRBOUND_A = (3.0 + 16.0 * _EPSILON) * _EPSILON
+# 2^27 + 1, splits a float64 into two non-overlapping 26-bit halves
+_SPLITTER = 134217729.0
+_INTEGERS = (int, np.integer)
+
+
+def _two_product(a, b):
+    """
+    Exact product a * b as head + tail (Dekker). Works on floats and arrays alike.
+    """
+    head = a * b
+    c = _SPLITTER * a
+    a_hi = c - (c - a)
+    a_lo = a - a_hi
+    c = _SPLITTER * b
+    b_hi = c - (c - b)
+    b_lo = b - b_hi
+    tail = a_lo * b_lo - (((head - a_hi * b_hi) - a_lo * b_hi) - a_hi * b_lo)
+    return head, tail
+
+
+def _exact_terms(a: tuple, b: tuple, c: tuple) -> list:
+    """
+    Twelve floats (or arrays) that exactly sum up to orient2d(a, b, c):
+        ax * by - ay * bx + bx * cy - by * cx + cx * ay - cy * ax
+    """
+    (ax, ay), (bx, by), (cx, cy) = a, b, c
+    terms = []
+    for p, q, sign in ((ax, by, 1.0), (ay, bx, -1.0), (bx, cy, 1.0),
+                       (by, cx, -1.0), (cx, ay, 1.0), (cy, ax, -1.0)):
+        head, tail = _two_product(p, q)
+        terms.append(sign * head)
+        terms.append(sign * tail)
+    return terms
+
+
+def _filter(a: tuple, b: tuple, c: tuple) -> (float, bool):
+    """
+    Floating point determinant of float coordinates, and whether its sign is certain.
+    """
+    (ax, ay), (bx, by), (cx, cy) = a, b, c
+    det_left = (ax - cx) * (by - cy)
+    det_right = (ay - cy) * (bx - cx)
+    det = det_left - det_right
+    # a zero difference is exact: both products are exactly zero, so is the determinant
+    certain = abs(det) > _CCW_ERRBOUND_A * (abs(det_left) + abs(det_right)) or \
+        ((ax == cx or by == cy) and (ay == cy or bx == cx))
+    return det, certain
+
+
+def _xy(p) -> (float, float):
+    """
+    Coordinates of a 2D-point as Python numbers (much faster arithmetic than NumPy scalars).
+    """
+    return p.tolist() if isinstance(p, np.ndarray) else p
+
+
+def orient2d(a, b, c) -> float:
+    """
+    Orientation of three 2D-points, scalar version.
+    :param a:  (float, float)  a 2D-point
+    :param b:  (float, float)  a 2D-point
+    :param c:  (float, float)  a 2D-point
+    :return:   float           approximation of the determinant with the exact sign:
+                               > 0 iff c is at left of ab, 0 iff a, b, c are collinear.
+                               The exact determinant (int) for integer coordinates.
+    """
+    (ax, ay), (bx, by), (cx, cy) = _xy(a), _xy(b), _xy(c)
+    if isinstance(ax, _INTEGERS) and isinstance(bx, _INTEGERS) and isinstance(cx, _INTEGERS):
+        ax, ay, bx, by, cx, cy = int(ax), int(ay), int(bx), int(by), int(cx), int(cy)
+        return (ax - cx) * (by - cy) - (ay - cy) * (bx - cx)
+
+    a = (float(ax), float(ay))
+    b = (float(bx), float(by))
+    c = (float(cx), float(cy))
+    det, certain = _filter(a, b, c)
+    if certain:
+        return det
+    return math.fsum(_exact_terms(a, b, c))
+
+
+def orient2d_many(a: np.ndarray, b: np.ndarray, c: np.ndarray) -> np.ndarray:
+    """
+    Orientation of batches of three 2D-points. Inputs broadcast as in `basic_ops`.
+    :param a:  np.ndarray (N, 2) or (2, )  2D-points
+    :param b:  np.ndarray (N, 2) or (2, )  2D-points
+    :param c:  np.ndarray (N, 2) or (2, )  2D-points
+    :return:   np.ndarray (N, )            approximations of the determinants with the
+                                           exact signs, see `orient2d`. Exact determinants
+                                           (int64) if all inputs are integer arrays within
+                                           [-MAX_COORD, MAX_COORD].
+    """
+    a, b, c = np.asarray(a), np.asarray(b), np.asarray(c)
+    if a.dtype.kind in "iu" and b.dtype.kind in "iu" and c.dtype.kind in "iu":
+        if all(v.size == 0 or (v.min() >= -MAX_COORD and v.max() <= MAX_COORD)
+               for v in (a, b, c)):
+            dtype = np.int64
+        else:
+            # int64 products may overflow: exact Python ints, rounded to float64 at the end
+            dtype = object
+        a, b, c = (v.astype(dtype, copy=False) for v in (a, b, c))
+        det = (a[..., 0] - c[..., 0]) * (b[..., 1] - c[..., 1]) - \
+            (a[..., 1] - c[..., 1]) * (b[..., 0] - c[..., 0])
+        return det if dtype is np.int64 else np.asarray(det, dtype=np.float64)
+
+    a = a.astype(np.float64, copy=False)
+    b = b.astype(np.float64, copy=False)
+    c = c.astype(np.float64, copy=False)
+    acx = a[..., 0] - c[..., 0]
+    acy = a[..., 1] - c[..., 1]
+    bcx = b[..., 0] - c[..., 0]
+    bcy = b[..., 1] - c[..., 1]
+
+    det_left = acx * bcy
+    det_right = acy * bcx
+    det = det_left - det_right
+
+    uncertain = np.abs(det) <= _CCW_ERRBOUND_A * (np.abs(det_left) + np.abs(det_right))
+    if not uncertain.any():
+        return det
+    # a zero difference is exact: both products are exactly zero, so is the determinant
+    uncertain &= ((acx != 0) & (bcy != 0)) | ((acy != 0) & (bcx != 0))
+    if not uncertain.any():
+        return det
+
+    shape = det.shape
+    det = det.reshape(-1)  # an array, also for 0-d (scalar) results
+    uncertain = uncertain.reshape(-1)
+    coords = [np.broadcast_to(v, shape).reshape(-1)[uncertain] for v in
+              (a[..., 0], a[..., 1], b[..., 0], b[..., 1], c[..., 0], c[..., 1])]
+    terms = np.stack(_exact_terms(coords[0:2], coords[2:4], coords[4:6]), axis=-1)
+    det[uncertain] = [math.fsum(row) for row in terms.tolist()]
+    return det.reshape(shape)
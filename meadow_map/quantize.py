@@ -0,0 +1,71 @@
+"""
+Integer (fixed-point) coordinates, as in Recast Navigation's voxel grid.
+
+World coordinates are snapped to a grid of `cell_size` and stored as int32 (or int64).
+The geometry pipeline (`basic_ops`, `intersect`, `diag`, `merge_holes`, `convexify`)
+accepts such integer `verts` as-is: every orientation test is then an exact integer
+determinant, without a floating point filter (see `predicates.py`), and vertex buffers
+are half the size in int32. Results are converted back to world coordinates at the API
+boundary, e.g. by `NavMesh.build(..., cell_size=...)`.
+
+Grid coordinates are limited to [-MAX_COORD, MAX_COORD] (about 1e9 cells per axis), so
+that determinants never overflow int64.
+"""
+import numpy as np
+from .predicates import MAX_COORD
+
+__all__ = ["Quantizer"]
+
+
+class Quantizer:
+    """
+    Conversion between world coordinates and an integer grid.
+    """
+
+    def __init__(self, cell_size: float, origin: (float, float) = (0.0, 0.0),
+                 dtype: np.dtype = np.int32):
+        """
+        :param cell_size:  float            side length of grid cells, in world units
+        :param origin:     (float, float)   world position of grid point (0, 0)
+        :param dtype:      np.dtype         np.int32 or np.int64, dtype of grid coordinates
+        """
+        if not cell_size > 0:
+            raise ValueError(f"cell_size should be positive, got {cell_size}")
+        if np.dtype(dtype) not in (np.dtype(np.int32), np.dtype(np.int64)):
+            raise ValueError(f"dtype should be int32 or int64, got {np.dtype(dtype)}")
+        self.cell_size = float(cell_size)
+        self.origin = np.asarray(origin, dtype=np.float64).reshape(2)
+        self.dtype = np.dtype(dtype)
+
+    def quantize(self, points: np.ndarray) -> np.ndarray:
+        """
+        Snap world positions to the nearest grid point.
+        :param points:  np.ndarray (N, 2)  world positions
+        :return:        np.ndarray (N, 2)  grid coordinates (`dtype`)
+        """
+        grid = np.rint((np.asarray(points, dtype=np.float64) - self.origin) / self.cell_size)
+        if not np.all(np.abs(grid) <= MAX_COORD):
+            raise ValueError(f"Coordinates out of range for cell_size {self.cell_size}: "
+                             f"at most {MAX_COORD} cells from the origin")
+        return grid.astype(self.dtype)
+
+    def quantize_ring(self, verts: np.ndarray, indices: np.ndarray) -> np.ndarray:
+        """
+        `quantize` the vertices of a polygon (or hole), checking that no edge collapses.
+        :param verts:    np.ndarray (#verts, 2)  world positions
+        :param indices:  np.ndarray (#vert, )    polygon vertex index (to array `verts`)
+        :return:         np.ndarray (#verts, 2)  grid coordinates (`dtype`)
+        """
+        grid = self.quantize(verts)
+        ring = grid[np.asarray(indices, dtype=np.int64)]
+        if np.any(np.all(ring == np.roll(ring, -1, axis=0), axis=1)):
+            raise ValueError(f"Polygon edges collapse on the grid, cell_size {self.cell_size} "
+                             f"is too large")
+        return grid
+
+    def dequantize(self, grid: np.ndarray) -> np.ndarray:
+        """
+        :param grid:    np.ndarray (N, 2)  grid coordinates
+        :return:        np.ndarray (N, 2)  world positions (float64)
+        """
+        return np.asarray(grid, dtype=np.float64) * self.cell_size + self.origin
@@ -0,0 +1,54 @@
+"""
+Convex decomposition of shapely regions (polygons with holes), shared by the tiled build
+and the incremental NavMesh update.
+"""
+import numpy as np
+from shapely.geometry import Polygon
+from shapely.geometry.polygon import orient
+from .build_cache import BuildCache, cached_convexify, cached_merge_holes
+
+__all__ = ["region_pieces", "convex_pieces"]
+
+
+def _ring(coords) -> np.ndarray:
+    """
+    Vertices of a shapely ring, without the closing vertex and repeated vertices.
+    """
+    pts = np.asarray(coords, dtype=np.float64)[:-1]
+    keep = np.any(pts != np.roll(pts, 1, axis=0), axis=1)
+    return pts[keep] if keep.any() else pts[:1]
+
+
+def region_pieces(region, min_area: float) -> [(np.ndarray, [np.ndarray])]:
+    """
+    Polygons of a shapely geometry (e.g. result of an intersection), as (outline, holes).
+    :param region:    shapely geometry  Polygon, MultiPolygon or GeometryCollection
+    :param min_area:  float             polygons with an area not larger are dropped
+    :return:          [(np.ndarray (#vert, 2), [np.ndarray (#vert, 2)])]
+                      outline of each polygon in counter-clock wise, and its holes in clock wise
+    """
+    pieces = []
+    for part in getattr(region, "geoms", [region]):
+        if not isinstance(part, Polygon) or part.area <= min_area:
+            continue
+        part = orient(part, sign=1.0)
+        holes = [_ring(r.coords) for r in part.interiors]
+        pieces.append((_ring(part.exterior.coords), [h for h in holes if len(h) >= 3]))
+    return pieces
+
+
+def convex_pieces(piece: (np.ndarray, [np.ndarray]), method: str = "arkin",
+                  cache: BuildCache = None) -> [np.ndarray, [np.ndarray]]:
+    """
+    Convex polygons of one piece from `region_pieces`, by `merge_holes` + `convexify`.
+    :param piece:   (np.ndarray, [np.ndarray])  outline and holes
+    :param method:  str                         `convexify` method
+    :param cache:   BuildCache                  optional on-disk cache of the results
+    :return:        (np.ndarray (#verts, 2), [np.ndarray])
+                    vertices, and convex polygons as vertex index (to the vertices)
+    """
+    outline, holes = piece
+    verts, indices, _ = cached_merge_holes(outline, np.arange(len(outline)),
+                                           [(h, np.arange(len(h))) for h in holes], cache)
+    polys, _ = cached_convexify(verts, np.asarray(indices), method, cache)
+    return verts, polys
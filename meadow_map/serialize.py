@@ -0,0 +1,99 @@
+"""
+Binary file format of a built NavMesh, loaded by memory mapping.
+
+Layout (all little-endian):
+    header (128 bytes):
+        magic               8 bytes   b"MEADOWNM"
+        version             uint32
+        reserved            uint32
+        #verts, #polys, #slots, revision                  uint64 x 4
+        offset of each array (in the order of `_ARRAYS`)  uint64 x 9
+    arrays, each starting at a 64-byte aligned offset, C-contiguous:
+        verts (#verts, 2) f8, poly_offsets (#polys + 1, ) i8, poly_verts (#slots, ) i8,
+        edges (#slots, 2) i8, edge_polys (#slots, ) i8, edge_neighbours (#slots, ) i8,
+        edge_costs (#slots, ) f8, centers (#polys, 2) f8, poly_alive (#polys, ) u1
+
+The loaded arrays are read-only views of one `np.memmap` of the file: loading does not read
+the file, and processes loading the same file share its pages in the OS page cache.
+Obstacles added by `NavMesh.add_obstacle` are not stored, only the resulting mesh.
+"""
+import struct
+import numpy as np
+from .navmesh import NavMesh
+
+__all__ = ["save_navmesh", "load_navmesh", "FORMAT_VERSION"]
+
+FORMAT_VERSION = 1
+_MAGIC = b"MEADOWNM"
+_HEADER = struct.Struct("<8sII4Q9Q")
+_HEADER_SIZE = 128
+_ALIGN = 64
+
+# (name, dtype, shape as a function of (#verts, #polys, #slots))
+_ARRAYS = (
+    ("verts", "<f8", lambda v, p, s: (v, 2)),
+    ("poly_offsets", "<i8", lambda v, p, s: (p + 1,)),
+    ("poly_verts", "<i8", lambda v, p, s: (s,)),
+    ("edges", "<i8", lambda v, p, s: (s, 2)),
+    ("edge_polys", "<i8", lambda v, p, s: (s,)),
+    ("edge_neighbours", "<i8", lambda v, p, s: (s,)),
+    ("edge_costs", "<f8", lambda v, p, s: (s,)),
+    ("centers", "<f8", lambda v, p, s: (p, 2)),
+    ("poly_alive", "u1", lambda v, p, s: (p,)),
+)
+
+
+def save_navmesh(navmesh: NavMesh, path: str) -> None:
+    """
+    Write a NavMesh to a file.
+    :param navmesh:  NavMesh  the mesh
+    :param path:     str      file path
+    """
+    counts = (navmesh.verts.shape[0], navmesh.n_polys, navmesh.poly_verts.shape[0])
+    arrays = []
+    offsets = []
+    end = _HEADER_SIZE
+    for name, dtype, shape in _ARRAYS:
+        arr = np.ascontiguousarray(getattr(navmesh, name), dtype=dtype).reshape(shape(*counts))
+        end = -(-end // _ALIGN) * _ALIGN
+        offsets.append(end)
+        arrays.append(arr)
+        end += arr.nbytes
+
+    header = _HEADER.pack(_MAGIC, FORMAT_VERSION, 0, *counts, navmesh.revision, *offsets)
+    with open(path, "wb") as f:
+        f.write(header.ljust(_HEADER_SIZE, b"\0"))
+        for offset, arr in zip(offsets, arrays):
+            f.write(b"\0" * (offset - f.tell()))
+            f.write(arr.tobytes())
+
+
+def load_navmesh(path: str) -> NavMesh:
+    """
+    Memory-map a file written by `save_navmesh`.
+    :param path:  str      file path
+    :return:      NavMesh  a mesh over read-only views of the file
+    """
+    raw = np.memmap(path, dtype=np.uint8, mode="r")
+    if raw.shape[0] < _HEADER_SIZE:
+        raise ValueError(f"{path} is not a NavMesh file")
+    magic, version, _, n_verts, n_polys, n_slots, revision, *offsets = \
+        _HEADER.unpack(raw[:_HEADER.size].tobytes())
+    if magic != _MAGIC:
+        raise ValueError(f"{path} is not a NavMesh file")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported NavMesh file version {version} "
+                         f"(expected {FORMAT_VERSION})")
+
+    arrays = {}
+    for (name, dtype, shape), offset in zip(_ARRAYS, offsets):
+        shape = shape(n_verts, n_polys, n_slots)
+        nbytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        if offset + nbytes > raw.shape[0]:
+            raise ValueError(f"{path} is truncated")
+        arrays[name] = raw[offset:offset + nbytes].view(dtype).reshape(shape)
+    arrays["poly_alive"] = arrays["poly_alive"].view(bool)
+
+    mesh = NavMesh.from_arrays(arrays)
+    mesh.revision = revision
+    return mesh
@@ -0,0 +1,90 @@
+"""
+Tiled NavMesh build: the walkable area is cut into square tiles and each tile is
+convexified on its own, possibly in parallel, like Recast Navigation's tile cache.
+
+(1) The polygon with holes is clipped to each tile (shapely). A tile may hold several
+    pieces; holes cut by the tile border become part of the piece outline.
+(2) Each piece is processed by `merge_holes` + `convexify`, in a process pool if asked.
+(3) Vertices of all tiles are welded by position. Pieces of neighbouring tiles are clipped
+    by the same tile border, so the border vertices match and `NavMesh` links the shared
+    border edges as portals across tiles.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from shapely.geometry import Polygon, box
+from . import instrument
+from .build_cache import BuildCache
+from .navmesh import NavMesh
+from .regions import convex_pieces, region_pieces
+
+__all__ = ["build_tiled"]
+
+
+def build_tiled(verts_poly: np.ndarray, indices_poly: np.ndarray,
+                holes: [(np.ndarray, np.ndarray)] = (), *, tile_size: float = None,
+                workers: int = None, method: str = "arkin",
+                cache: BuildCache = None) -> NavMesh:
+    """
+    Build a NavMesh tile by tile, same input as `NavMesh.build`.
+    :param verts_poly:     np.ndarray (#verts, 2)  a list of 2D-vertices position of polygon
+    :param indices_poly:   np.ndarray (#vert, )    polygon vertex index, counter-clock wise
+    :param holes:          [(np.ndarray (#verts, 2), np.ndarray (#vert, ))]
+                           a list of (verts_hole, indices_hole) of each hole, clock wise
+    :param tile_size:      float                   side length of the tiles. A single tile
+                                                   covering the polygon if not given.
+    :param workers:        int                     number of worker processes. Tiles are built
+                                                   in this process if None or <= 1.
+    :param method:         str                     `convexify` method
+    :param cache:          BuildCache              optional on-disk cache of per-tile results,
+                                                   so that unchanged tiles are not rebuilt
+    :return:               NavMesh
+    """
+    if tile_size is not None and not tile_size > 0:
+        raise ValueError(f"tile_size should be positive, got {tile_size}")
+    verts_poly = np.asarray(verts_poly, dtype=np.float64)
+    area = Polygon(verts_poly[np.asarray(indices_poly)],
+                   [np.asarray(v, dtype=np.float64)[np.asarray(i)] for v, i in holes])
+    x0, y0, x1, y1 = area.bounds
+    scale = max(x1 - x0, y1 - y0, 1e-9)
+    if tile_size is None:
+        tile_size = scale
+    nx = max(int(np.ceil((x1 - x0) / tile_size)), 1)
+    ny = max(int(np.ceil((y1 - y0) / tile_size)), 1)
+
+    min_area = 1e-12 * scale * scale
+    pieces = []
+    with instrument.stage("build_tiled.clip"):
+        for ty in range(ny):
+            for tx in range(nx):
+                tile = box(x0 + tx * tile_size, y0 + ty * tile_size,
+                           x0 + (tx + 1) * tile_size, y0 + (ty + 1) * tile_size)
+                pieces.extend(region_pieces(area.intersection(tile), min_area))
+    if instrument.ACTIVE is not None:
+        instrument.ACTIVE.count("build_tiled.pieces", len(pieces))
+        for outline, piece_holes in pieces:
+            instrument.ACTIVE.size("build_tiled.piece_verts",
+                                   len(outline) + sum(len(h) for h in piece_holes))
+
+    with instrument.stage("build_tiled.convexify"):
+        if workers is None or workers <= 1 or len(pieces) <= 1:
+            built = [convex_pieces(piece, method, cache) for piece in pieces]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                built = list(pool.map(convex_pieces, pieces, [method] * len(pieces),
+                                      [cache] * len(pieces),
+                                      chunksize=max(len(pieces) // (4 * workers), 1)))
+
+    # weld vertices of all tiles by position
+    all_verts = np.concatenate([v for v, _ in built] + [np.zeros((0, 2))])
+    keys = np.round((all_verts - [x0, y0]) / (1e-9 * scale)).astype(np.int64)
+    _, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    verts = all_verts[first]
+
+    polys = []
+    base = 0
+    for v, tile_polys in built:
+        polys.extend(inverse[base + np.asarray(p)] for p in tile_polys)
+        base += len(v)
+    with instrument.stage("build_tiled.link"):
+        return NavMesh(verts, polys)
@@ -54,3 +54,33 @@ class TestBasicOps(unittest.TestCase):
         self.assertEqual(op.collinear(a, d, e) and op.between(a, d, e), True)
         self.assertEqual(op.collinear(a, d, e) and op.between(d, a, e), True)
         self.assertEqual(op.collinear(a, d, e) and op.between(a, e, d), False)
+
+    def test_batched(self):
+        rng = np.random.default_rng(0)
+        # use a coarse grid so that collinear triples appear frequently
+        x = rng.integers(0, 4, (256, 2)).astype(np.float64)
+        y = rng.integers(0, 4, (256, 2)).astype(np.float64)
+        z = rng.integers(0, 4, (256, 2)).astype(np.float64)
+
+        for op_many, op_one in [(op.left_many, op.left), (op.left_on_many, op.left_on),
+                                (op.collinear_many, op.collinear),
+                                (op.between_many, op.between)]:
+            mask = op_many(x, y, z)
+            self.assertEqual(mask.shape, (256, ))
+            for i in range(256):
+                self.assertEqual(mask[i], op_one(x[i], y[i], z[i]))
+
+    def test_batched_indexed(self):
+        verts = np.array([[0, 0], [8, 4], [0, 1], [4, 1.5], [4, 2]], dtype=np.float64)
+        ix = np.array([0, 0, 0, 0])
+        iy = np.array([1, 1, 1, 1])
+        iz = np.array([2, 3, 4, 1])
+
+        self.assertEqual(op.left_many(ix, iy, iz, verts).tolist(), [True, False, False, False])
+        self.assertEqual(op.left_on_many(ix, iy, iz, verts).tolist(), [True, False, True, True])
+        self.assertEqual(op.collinear_many(ix, iy, iz, verts).tolist(),
+                         [False, False, True, True])
+
+        # a single point broadcasts against a batch
+        self.assertEqual(op.left_many(verts[0], verts[1], verts[2:]).tolist(),
+                         [True, False, False])
@@ -0,0 +1,102 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from meadow_map import BuildCache, NavMesh, build_tiled, convexify, merge_holes
+from meadow_map.build_cache import cached_convexify, cached_merge_holes
+from tests.test_navmesh import demo_map
+
+
+class TestBuildCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = BuildCache(os.path.join(self.tmp.name, "cache"))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_same_results(self):
+        verts_poly, indices_poly, holes = demo_map()
+        expected = merge_holes(verts_poly, indices_poly, holes)
+        for _ in range(2):
+            verts, indices, diags = cached_merge_holes(verts_poly, indices_poly, holes,
+                                                       self.cache)
+            np.testing.assert_array_equal(verts, expected[0])
+            self.assertEqual(indices, expected[1])
+            self.assertEqual(diags, expected[2])
+
+        polys_exp, diags_exp = convexify(verts, indices, method="hm")
+        for _ in range(2):
+            polys, diags = cached_convexify(verts, indices, "hm", self.cache)
+            self.assertEqual([p.tolist() for p in polys], [p.tolist() for p in polys_exp])
+            self.assertEqual(diags, diags_exp)
+        self.assertEqual((self.cache.hits, self.cache.misses), (2, 2))
+
+        # another method is another key
+        cached_convexify(verts, indices, "arkin", self.cache)
+        self.assertEqual(self.cache.misses, 3)
+
+    def test_build(self):
+        mesh = NavMesh.build(*demo_map(), cache=self.cache)
+        again = NavMesh.build(*demo_map(), cache=self.cache)
+        self.assertEqual(self.cache.hits, 2)
+        np.testing.assert_array_equal(mesh.poly_verts, again.poly_verts)
+
+        build_tiled(*demo_map(), tile_size=1.0, cache=self.cache)
+        hits, misses = self.cache.hits, self.cache.misses
+        tiled = build_tiled(*demo_map(), tile_size=1.0, cache=self.cache)
+        # every tile is a hit the second time
+        self.assertEqual(self.cache.misses, misses)
+        self.assertEqual(self.cache.hits - hits, misses - 2)
+        self.assertEqual(tiled.n_polys, build_tiled(*demo_map(), tile_size=1.0).n_polys)
+
+    def test_bypass(self):
+        self.cache.enabled = False
+        NavMesh.build(*demo_map(), cache=self.cache)
+        self.assertEqual(os.listdir(self.cache.directory), [])
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 0))
+
+    def test_eviction(self):
+        cache = BuildCache(self.cache.directory, max_bytes=2000)
+        keys = [BuildCache.key("test", np.arange(i)) for i in range(6)]
+        for i, key in enumerate(keys):
+            cache.put(key, data=np.zeros(100))
+            os.utime(cache._path(key), (i, i))
+        sizes = [e.stat().st_size for e in os.scandir(cache.directory)]
+        self.assertLessEqual(sum(sizes), 2000)
+        # the most recently used one is kept, the oldest ones are evicted
+        self.assertIsNotNone(cache.get(keys[-1]))
+        self.assertIsNone(cache.get(keys[0]))
+
+    def test_corrupt(self):
+        verts_poly, indices_poly, holes = demo_map()
+        verts, indices, _ = merge_holes(verts_poly, indices_poly, holes)
+        expected, _ = convexify(verts, indices)
+        cached_convexify(verts, indices, cache=self.cache)
+        key = BuildCache.key("convexify", verts, np.asarray(indices), method="arkin")
+        path = self.cache._path(key)  # pylint: disable=protected-access
+
+        # truncated entry: a miss, the file is removed and written again
+        with open(path, "r+b") as f:
+            f.truncate(os.path.getsize(path) // 2)
+        polys, _ = cached_convexify(verts, indices, cache=self.cache)
+        self.assertEqual([p.tolist() for p in polys], [p.tolist() for p in expected])
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 2))
+        self.assertIsNotNone(self.cache.get(key))
+
+        # not a zip file, or without the expected arrays
+        for content in (b"garbage", None):
+            if content is None:
+                self.cache.put(key, other=np.zeros(3))
+            else:
+                with open(path, "wb") as f:
+                    f.write(content)
+            misses = self.cache.misses
+            self.assertIsNone(self.cache.get(key, "poly_offsets"))
+            self.assertEqual(self.cache.misses, misses + 1)
+            self.assertFalse(os.path.exists(path))
+
+
+if __name__ == '__main__':
+    unittest.main()
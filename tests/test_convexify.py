@@ -1,3 +1,5 @@
+import sys
+import inspect
 import unittest
 import numpy as np
 from meadow_map.convex_no_hole import convexify
@@ -65,3 +67,60 @@ class TestConvexify(unittest.TestCase):
             area_sum += pgon.area
 
         self.assertAlmostEqual(area_sum, area_original)
+
+    def test_convexify_deep(self):
+        # comb-like corridor whose top side zig-zags, every valley is a concave vertex
+        m = 80
+        bottom = [[0., 0.], [2. * m, 0.]]
+        top = [[float(x), 3. if x % 2 == 0 else 1.] for x in range(2 * m, -1, -1)]
+        verts_poly = np.array(bottom + top[1:-1] + [[0., 3.]])
+        indices_poly = list(range(verts_poly.shape[0]))  # CCW
+
+        # the split chain is much deeper than the stack frames left to the call
+        limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(len(inspect.stack()) + 40)
+        try:
+            polys, diags = convexify(verts_poly, indices_poly)
+        finally:
+            sys.setrecursionlimit(limit)
+
+        self.assertEqual(len(polys), len(diags) + 1)
+        area_sum = 0
+        for p in polys:
+            self.assertEqual(is_convex(verts_poly, p), True)
+            area_sum += Polygon(verts_poly[p]).area
+        self.assertAlmostEqual(area_sum, Polygon(verts_poly).area)
+
+        # diagonals are positions in `indices_poly`
+        for ia, ib in diags:
+            self.assertTrue(0 <= ia < len(indices_poly) and 0 <= ib < len(indices_poly))
+
+    def test_convexify_hm(self):
+        verts_poly = np.array(
+            [
+                [0., 0.], [0., 4.], [2., 4.],
+                [1., 3.], [2., 1.], [3., 3.], [4., 1.],
+                [1., 0.]
+            ]
+        )
+        indices_poly = [verts_poly.shape[0] - i - 1 for i in range(verts_poly.shape[0])]  # CCW
+
+        polys, diags = convexify(verts_poly, indices_poly, method="hm")
+        self.assertEqual(len(polys), len(diags) + 1)
+
+        area_sum = 0
+        for p in polys:
+            self.assertEqual(is_convex(verts_poly, p), True)
+            area_sum += Polygon(verts_poly[p]).area
+        self.assertAlmostEqual(area_sum, Polygon(verts_poly).area)
+
+        # every kept diagonal is needed: merging the two pieces sharing it is not convex
+        for ia, ib in diags:
+            u, v = indices_poly[ia], indices_poly[ib]
+            sides = [p for p in polys if u in p.tolist() and v in p.tolist()]
+            self.assertEqual(len(sides), 2)
+            merged = Polygon(verts_poly[sides[0]]).union(Polygon(verts_poly[sides[1]]))
+            self.assertGreater(merged.convex_hull.area - merged.area, 1e-9)
+
+        with self.assertRaises(ValueError):
+            convexify(verts_poly, indices_poly, method="unknown")
@@ -0,0 +1,83 @@
+import unittest
+import numpy as np
+from meadow_map import convexify, merge_hole
+from meadow_map.diag import diagonalie
+from meadow_map.edge_index import EdgeIndex
+from meadow_map.intersect import intersect
+
+
+def star_polygon(n: int, seed: int = 0) -> np.ndarray:
+    """
+    Random star-shaped polygon in counter-clock wise, with lots of concave vertices.
+    :param n:      int                     #verts
+    :param seed:   int                     random seed
+    :return:       np.ndarray (#verts, 2)  a list of 2D-vertices position
+    """
+    rng = np.random.default_rng(seed)
+    angles = np.sort(rng.uniform(0, 2 * np.pi, n))
+    radius = rng.uniform(2.0, 10.0, n)
+    return np.stack((radius * np.cos(angles), radius * np.sin(angles)), axis=1)
+
+
+class TestEdgeIndex(unittest.TestCase):
+
+    def test_query(self):
+        verts = star_polygon(64)
+        indices = list(range(64))
+        index = EdgeIndex(verts, indices)
+        self.assertEqual(len(index), 64)
+
+        rng = np.random.default_rng(1)
+        for _ in range(50):
+            p, q = rng.uniform(-10, 10, (2, 2))
+            found = set(zip(*[e.tolist() for e in index.query(p, q)]))
+            for i in range(64):
+                edge = (indices[i], indices[(i + 1) % 64])
+                if intersect(p, q, verts[edge[0]], verts[edge[1]]):
+                    self.assertIn(edge, found)
+
+    def test_add_edge(self):
+        verts = star_polygon(16)
+        index = EdgeIndex(verts, list(range(16)))
+        index.add_edge(0, 8)
+        found = set(zip(*[e.tolist() for e in index.query(verts[0], verts[8])]))
+        self.assertIn((0, 8), found)
+
+    def test_diagonalie(self):
+        verts = star_polygon(48, seed=2)
+        indices = list(range(48))
+        index = EdgeIndex(verts, indices)
+        for ia in range(48):
+            for ib in range(48):
+                if ia != ib:
+                    self.assertEqual(diagonalie(verts, indices, ia, ib, index),
+                                     diagonalie(verts, indices, ia, ib))
+
+    def test_convexify(self):
+        verts = star_polygon(80, seed=3)
+        indices = list(range(80))
+
+        polys, diags = convexify(verts, indices)
+        polys_idx, diags_idx = convexify(verts, indices, EdgeIndex(verts, indices))
+
+        self.assertEqual([list(p) for p in polys], [list(p) for p in polys_idx])
+        self.assertEqual([tuple(d) for d in diags], [tuple(d) for d in diags_idx])
+
+    def test_convexify_hole(self):
+        verts_poly = np.array(
+            [
+                [0., 0.], [0., 4.], [2., 4.],
+                [1., 3.], [2., 1.], [3., 3.], [4., 1.],
+                [1., 0.]
+            ]
+        )
+        indices_poly = [verts_poly.shape[0] - i - 1 for i in range(verts_poly.shape[0])]  # CCW
+        verts_hole = np.array([[0.5, 0.5], [0.2, 1.5], [0.4, 2.], [1.8, 0.5]])
+        indices_hole = [(i + 2) % 4 for i in range(verts_hole.shape[0])]  # CW
+
+        verts, indices, _ = merge_hole(verts_poly, indices_poly, verts_hole, indices_hole)
+        polys, diags = convexify(verts, indices)
+        polys_idx, diags_idx = convexify(verts, indices, EdgeIndex(verts, indices))
+
+        self.assertEqual([list(p) for p in polys], [list(p) for p in polys_idx])
+        self.assertEqual([tuple(d) for d in diags], [tuple(d) for d in diags_idx])
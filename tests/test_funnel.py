@@ -0,0 +1,78 @@
+import unittest
+import numpy as np
+from shapely.geometry import LineString, Polygon
+from meadow_map import NavMesh, find_path, string_pull
+
+
+class TestFunnel(unittest.TestCase):
+
+    def setUp(self):
+        # an L-shaped room, the inner corner is (4, 4)
+        verts_poly = np.array([[0., 0.], [10., 0.], [10., 4.], [4., 4.], [4., 10.], [0., 10.]])
+        self.mesh = NavMesh.build(verts_poly, [0, 1, 2, 3, 4, 5], method="hm")
+
+    def _corridor(self, start, goal):
+        polys = [self._locate(start), self._locate(goal)]
+        return find_path(self.mesh, polys[0], polys[1])
+
+    def _locate(self, point):
+        for p in range(self.mesh.n_polys):
+            pts = self.mesh.verts[self.mesh.poly(p)]
+            edges = np.roll(pts, -1, axis=0) - pts
+            rel = np.asarray(point) - pts
+            if np.all(edges[:, 0] * rel[:, 1] - edges[:, 1] * rel[:, 0] >= 0):
+                return p
+        return -1
+
+    def test_corner(self):
+        start, goal = np.array([8., 2.]), np.array([2., 8.])
+        path = string_pull(self.mesh, self._corridor(start, goal), start, goal)
+        np.testing.assert_allclose(path, [[8., 2.], [4., 4.], [2., 8.]])
+
+    def test_straight(self):
+        start, goal = np.array([9., 1.]), np.array([1., 5.])
+        path = string_pull(self.mesh, self._corridor(start, goal), start, goal)
+        np.testing.assert_allclose(path, [[9., 1.], [1., 5.]])
+
+        start, goal = np.array([1., 1.]), np.array([3., 9.])
+        path = string_pull(self.mesh, self._corridor(start, goal), start, goal)
+        np.testing.assert_allclose(path, [[1., 1.], [3., 9.]])
+
+    def test_degenerate(self):
+        start = np.array([1., 1.])
+        self.assertEqual(string_pull(self.mesh, [], start, start).shape, (0, 2))
+        path = string_pull(self.mesh, [self._locate(start)], start, [2., 2.])
+        np.testing.assert_allclose(path, [[1., 1.], [2., 2.]])
+
+    def test_obstacles(self):
+        # a square room with a grid of square obstacles
+        verts_poly = np.array([[0., 0.], [10., 0.], [10., 10.], [0., 10.]])
+        holes = []
+        for x in range(1, 9, 2):
+            for y in range(1, 9, 2):
+                holes.append((np.array([[x, y], [x + 1, y], [x + 1, y + 1], [x, y + 1]]) +
+                              [0.1 * x, 0.05 * y], [3, 2, 1, 0]))  # CW
+        self.mesh = NavMesh.build(verts_poly, [0, 1, 2, 3], holes)
+        walkable = Polygon(verts_poly, [h[0] for h in holes]).buffer(1e-9)
+
+        rng = np.random.default_rng(0)
+        for _ in range(20):
+            start, goal = self._random_point(rng), self._random_point(rng)
+            corridor = self._corridor(start, goal)
+            path = string_pull(self.mesh, corridor, start, goal)
+
+            np.testing.assert_allclose(path[0], start)
+            np.testing.assert_allclose(path[-1], goal)
+            self.assertTrue(walkable.contains(LineString(path)))
+            # never longer than walking through the portal midpoints
+            mids = [self.mesh.verts[list(self.mesh.portal(p, q))].mean(axis=0)
+                    for p, q in zip(corridor[:-1], corridor[1:])]
+            mids = np.array([start] + mids + [goal])
+            self.assertLessEqual(np.linalg.norm(np.diff(path, axis=0), axis=1).sum(),
+                                 np.linalg.norm(np.diff(mids, axis=0), axis=1).sum() + 1e-9)
+
+    def _random_point(self, rng):
+        while True:
+            point = rng.uniform(0, 10, 2)
+            if self._locate(point) != -1:
+                return point
@@ -0,0 +1,92 @@
+import unittest
+import numpy as np
+from meadow_map import HierarchicalPathFinder, NavMesh, string_pull
+from tests.test_pathfind import grid_map, dijkstra
+
+
+class TestHierarchical(unittest.TestCase):
+
+    def check_corridor(self, mesh, path, start, goal, cost):
+        self.assertEqual(path[0], start)
+        self.assertEqual(path[-1], goal)
+        total = 0.0
+        for p, q in zip(path[:-1], path[1:]):
+            self.assertIn(q, mesh.neighbours(p).tolist())
+            total += np.linalg.norm(mesh.centers[p] - mesh.centers[q])
+        self.assertAlmostEqual(total, cost)
+
+    def test_same_cost_as_flat(self):
+        mesh = grid_map(seed=5)
+        rng = np.random.default_rng(6)
+        for cluster_size in (None, 1.5, 4.0, 100.0):
+            finder = HierarchicalPathFinder(mesh, cluster_size=cluster_size)
+            for _ in range(15):
+                start, goal = rng.integers(0, mesh.n_polys, 2)
+                path = finder.find(start, goal)
+                self.check_corridor(mesh, path, start, goal, dijkstra(mesh, start)[goal])
+
+    def test_clusters(self):
+        mesh = grid_map()
+        finder = HierarchicalPathFinder(mesh, cluster_size=2.0)
+        self.assertGreater(finder.n_clusters, 1)
+        self.assertTrue((finder.clusters >= 0).all())
+        # polygons of a cluster are connected through polygons of the same cluster
+        for c in range(finder.n_clusters):
+            members = np.flatnonzero(finder.clusters == c)
+            dist, _ = finder._local(int(members[0]))
+            self.assertEqual(set(dist), set(members.tolist()))
+
+    def test_updates(self):
+        mesh = grid_map(seed=3)
+        finder = HierarchicalPathFinder(mesh, cluster_size=2.0)
+        rng = np.random.default_rng(7)
+        oids = []
+        for step in range(9):
+            if step % 3 == 2:
+                mesh.remove_obstacle(oids.pop(0))
+            else:
+                x, y = rng.uniform(0.5, 9.5, 2)
+                oids.append(mesh.add_obstacle([[x, y], [x + .8, y], [x + .8, y + .8],
+                                               [x, y + .8]]))
+            self.assertTrue((finder.clusters >= 0).all())
+            alive = np.flatnonzero(mesh.poly_alive)
+            for start, goal in rng.choice(alive, size=(6, 2)).tolist():
+                path = finder.find(start, goal)
+                self.assertEqual(finder.n_clusters, finder.clusters.max() + 1)
+                self.check_corridor(mesh, path, start, goal, dijkstra(mesh, start)[goal])
+
+    def test_funnel(self):
+        mesh = grid_map()
+        finder = HierarchicalPathFinder(mesh, cluster_size=2.0)
+        start, goal = [0.2, 0.2], [9.8, 9.8]
+        sp, gp = mesh.locate([start, goal])
+        path = string_pull(mesh, finder.find(sp, gp), start, goal)
+        np.testing.assert_allclose(path[0], start)
+        np.testing.assert_allclose(path[-1], goal)
+
+    def test_same_and_unreachable(self):
+        verts = np.array([[0., 0.], [1., 0.], [1., 1.], [0., 1.],
+                          [2., 0.], [3., 0.], [3., 1.], [2., 1.]])
+        mesh = NavMesh(verts, [np.array([0, 1, 2, 3]), np.array([4, 5, 6, 7])])
+        finder = HierarchicalPathFinder(mesh)
+        self.assertEqual(finder.find(0, 0), [0])
+        self.assertEqual(finder.find(0, 1), [])
+
+    def test_invalid_ids(self):
+        mesh = grid_map()
+        finder = HierarchicalPathFinder(mesh, cluster_size=2.0)
+        n = mesh.n_polys
+        for start, goal in ((-1, -1), (n, n), (-1, 0), (0, n)):
+            self.assertEqual(finder.find(start, goal), [])
+
+        # polygons removed by an update of the mesh
+        mesh.add_obstacle(np.array([[4.2, 4.2], [4.8, 4.2], [4.8, 4.8], [4.2, 4.8]]))
+        dead = int(np.flatnonzero(~mesh.poly_alive)[0])
+        alive = int(np.flatnonzero(mesh.poly_alive)[0])
+        self.assertEqual(finder.find(dead, dead), [])
+        self.assertEqual(finder.find(dead, alive), [])
+        self.assertEqual(finder.find(alive, dead), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
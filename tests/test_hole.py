@@ -1,6 +1,6 @@
 import unittest
 import numpy as np
-from meadow_map import convexify, merge_hole
+from meadow_map import convexify, merge_hole, merge_holes
 from shapely.geometry import Polygon
 
 
@@ -52,8 +52,11 @@ class TestHole(unittest.TestCase):
         indices_hole = [(i + 2) % 4 for i in range(verts_hole.shape[0])]  # CW
 
         verts, indices, mergeLineSeg = merge_hole(verts_poly, indices_poly, verts_hole, indices_hole)
-        polys, diags = convexify(verts, indices)
+        for method in ["arkin", "hm"]:
+            polys, diags = convexify(verts, indices, method=method)
+            self._check_area(verts, polys, verts_poly, verts_hole)
 
+    def _check_area(self, verts, polys, verts_poly, verts_hole):
         # Area of the whole polygon
         area_original = Polygon(verts_poly).area - Polygon(verts_hole).area
         # Compute sum of area of split polygons
@@ -72,3 +75,55 @@ class TestHole(unittest.TestCase):
             area_sum += Polygon(zip(x, y)).area
 
         self.assertAlmostEqual(area_sum, area_original)
+
+    def test_merge_holes(self):
+        # a square room with a grid of small (jittered) square obstacles
+        verts_poly = np.array([[0., 0.], [10., 0.], [10., 10.], [0., 10.]])
+        indices_poly = [0, 1, 2, 3]  # CCW
+
+        rng = np.random.default_rng(0)
+        holes = []
+        for x in range(1, 9, 2):
+            for y in range(1, 9, 2):
+                ox, oy = rng.uniform(0, 0.5, 2)
+                verts_hole = np.array([[x, y], [x + 1, y], [x + 1, y + 1], [x, y + 1]]) + [ox, oy]
+                holes.append((verts_hole, [3, 2, 1, 0]))  # CW
+
+        verts, indices, diags = merge_holes(verts_poly, indices_poly, holes)
+        self.assertEqual(len(diags), len(holes))
+        self.assertEqual(len(indices), 4 + len(holes) * (4 + 2))
+
+        area_original = Polygon(verts_poly).area - sum(Polygon(h[0]).area for h in holes)
+        for method in ["arkin", "hm"]:
+            polys, _ = convexify(verts, indices, method=method)
+            area_sum = 0
+            for p in polys:
+                self.assertEqual(is_convex(verts, p), True)
+                area_sum += Polygon(verts[p]).area
+            self.assertAlmostEqual(area_sum, area_original)
+
+    def test_merge_hole_nearest(self):
+        # an L-shaped room, the hole sits near the inner corner (vertex 3)
+        verts_poly = np.array([[0., 0.], [10., 0.], [10., 4.], [4., 4.], [4., 10.], [0., 10.]])
+        indices_poly = [0, 1, 2, 3, 4, 5]  # CCW
+        verts_hole = np.array([[2.5, 5.], [3., 5.], [3., 6.], [2.5, 6.]])
+        indices_hole = [3, 2, 1, 0]  # CW
+
+        _, indices, diag = merge_hole(verts_poly, indices_poly, verts_hole, indices_hole)
+        # leftmost-lowest hole vertex (2.5, 5) to the nearest vertex in sight: (4, 4)
+        self.assertEqual(diag, (6, 3))
+        self.assertEqual(len(indices), 6 + 4 + 2)
+
+    def test_merge_holes_blocked(self):
+        verts_poly = np.array([[0., 0.], [10., 0.], [10., 10.], [0., 10.]])
+        indices_poly = [0, 1, 2, 3]  # CCW
+        # hole b (merged later) blocks the way from hole a to its nearest vertex (10, 10)
+        verts_hole_a = np.array([[5.5, 8.], [6., 8.], [6., 8.5], [5.5, 8.5]])
+        verts_hole_b = np.array([[7., 8.5], [8., 8.5], [8., 9.5], [7., 9.5]])
+        holes = [(verts_hole_b, [3, 2, 1, 0]), (verts_hole_a, [3, 2, 1, 0])]  # CW
+
+        verts, indices, diags = merge_holes(verts_poly, indices_poly, holes)
+        # hole a is merged first to (0, 10), then hole b to the nearest vertex of hole a
+        self.assertEqual(diags, [(8, 3), (4, 10)])
+        self.assertEqual(len(indices), 4 + 2 * (4 + 2))
+        np.testing.assert_array_equal(verts[8], [5.5, 8.])
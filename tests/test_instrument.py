@@ -0,0 +1,64 @@
+import json
+import unittest
+import numpy as np
+from meadow_map import BuildStats, build_tiled, collect_stats, convexify, merge_holes
+from meadow_map import instrument
+from tests.test_navmesh import demo_map
+
+
+class TestInstrument(unittest.TestCase):
+
+    def test_disabled(self):
+        self.assertIsNone(instrument.ACTIVE)
+        verts_poly, indices_poly, holes = demo_map()
+        merge_holes(verts_poly, indices_poly, holes)
+        self.assertIsNone(instrument.ACTIVE)
+
+    def test_convexify(self):
+        verts_poly, indices_poly, holes = demo_map()
+        verts, indices, _ = merge_holes(verts_poly, indices_poly, holes)
+        with collect_stats() as stats:
+            polys, diags = convexify(verts, indices)
+        self.assertIsNone(instrument.ACTIVE)
+
+        self.assertEqual(stats.counters["convexify.calls"], 1)
+        self.assertEqual(stats.counters["convexify.diagonals_accepted"], len(diags))
+        self.assertGreaterEqual(stats.counters["convexify.diagonals_tested"], len(diags))
+        self.assertGreater(stats.counters["in_cone"], 0)
+        # edges tested by NumPy code or by kernels, see `kernels.py`
+        self.assertGreater(stats.counters["intersect_many.edges"] +
+                           stats.counters["segment_hits.edges"], 0)
+        # every sub-polygon is either split or kept
+        self.assertEqual(len(stats.sizes["convexify.subpolygon"]), len(polys) + len(diags))
+        self.assertEqual(stats.sizes["convexify.subpolygon"][0], len(indices))
+        self.assertGreaterEqual(stats.maxima["convexify.depth"], 1)
+        self.assertGreater(stats.timers["convexify"], 0.0)
+
+        json.dumps(stats.as_dict())
+        self.assertIn("convexify.diagonals_tested", stats.report())
+        counts, _ = stats.histogram("convexify.subpolygon", bins=4)
+        self.assertEqual(counts.sum(), len(polys) + len(diags))
+
+    def test_nested_and_stages(self):
+        verts_poly, indices_poly, holes = demo_map()
+        outer = BuildStats()
+        with collect_stats(outer):
+            with collect_stats() as inner:
+                merge_holes(verts_poly, indices_poly, holes)
+            self.assertIs(instrument.ACTIVE, outer)
+            build_tiled(verts_poly, indices_poly, holes, tile_size=1.0)
+
+        self.assertEqual(inner.counters["merge_holes.calls"], 1)
+        self.assertEqual(inner.counters["merge_holes.bridge_searches"], 2)
+        self.assertNotIn("build_tiled.clip", inner.timers)
+        self.assertEqual(outer.counters["build_tiled.pieces"],
+                         outer.counters["merge_holes.calls"])
+        for name in ("build_tiled.clip", "build_tiled.convexify", "build_tiled.link"):
+            self.assertIn(name, outer.timers)
+        self.assertEqual(len(outer.sizes["build_tiled.piece_verts"]),
+                         outer.counters["build_tiled.pieces"])
+        self.assertTrue(np.all(np.asarray(outer.sizes["build_tiled.piece_verts"]) >= 3))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,6 @@
 import unittest
 import numpy as np
-from meadow_map.intersect import intersect
+from meadow_map.intersect import intersect, intersect_many
 
 
 class TestBasicOps(unittest.TestCase):
@@ -50,3 +50,44 @@ class TestBasicOps(unittest.TestCase):
         self.assertEqual(intersect(c1, c2, a2, a1), False)
         self.assertEqual(intersect(d1, d2, a2, a1), True)
         self.assertEqual(intersect(a1, a2, d2, d1), True)
+
+    def test_world_space(self):
+        # a 50 km wall and segments passing a few cm from it
+        offset = np.array([40000.0, 40000.0])
+        a = offset + [0.0, 0.0]
+        b = offset + [50000.0, 0.0]
+
+        # a vertex 1 cm above the wall does not touch it
+        c = offset + [25000.0, 0.01]
+        d = offset + [25000.0, 100.0]
+        self.assertEqual(intersect(a, b, c, d), False)
+        self.assertEqual(intersect(c, d, a, b), False)
+
+        # crossing near the end of the wall, from a vertex just beyond its end
+        c = offset + [50000.5, 0.04]
+        d = offset + [49990.0, -0.04]
+        self.assertEqual(intersect(a, b, c, d), True)
+        self.assertEqual(intersect(c, d, a, b), True)
+        self.assertEqual(intersect_many(a, b, np.stack([c]), np.stack([d])).tolist(), [True])
+
+    def test_intersect_many(self):
+        rng = np.random.default_rng(0)
+        # use a coarse grid so that collinear/between cases appear frequently
+        starts = rng.integers(0, 5, (600, 2)).astype(np.float64)
+        ends = rng.integers(0, 5, (600, 2)).astype(np.float64)
+        a = np.array([1.0, 1.0])
+        b = np.array([3.0, 3.0])
+
+        mask = intersect_many(a, b, starts, ends)
+        expected = [intersect(a, b, c, d) for c, d in zip(starts, ends)]
+        self.assertEqual(mask.tolist(), expected)
+
+        self.assertEqual(intersect_many(a, b, starts, ends, any_hit=True), True)
+        # only the last edge (outside of the first block) is hit
+        far_starts = np.tile([[10.0, 0.0]], (600, 1))
+        far_ends = np.tile([[11.0, 0.0]], (600, 1))
+        self.assertEqual(intersect_many(a, b, far_starts, far_ends, any_hit=True), False)
+        far_starts[-1] = [0.0, 3.0]
+        far_ends[-1] = [3.0, 0.0]
+        self.assertEqual(intersect_many(a, b, far_starts, far_ends, any_hit=True), True)
+        self.assertEqual(intersect_many(a, b, far_starts[:0], far_ends[:0], any_hit=True), False)
@@ -0,0 +1,108 @@
+import unittest
+import numpy as np
+from meadow_map import kernels
+from meadow_map.convex_no_hole import find_concave_vertex
+from meadow_map.diag import diagonalie, in_cone
+import tests.test_convexify as test_convexify
+import tests.test_diag as test_diag
+import tests.test_hole as test_hole
+import tests.test_quantize as test_quantize
+
+# backends with kernels, "numba" only if it is installed
+BACKENDS = ["python"] + (["numba"] if kernels.numba is not None else [])
+
+
+def run_predicates(backend: str, verts: np.ndarray, indices: np.ndarray) -> list:
+    """
+    `find_concave_vertex`, then `in_cone` and `diagonalie` of every diagonal, with `backend`.
+    """
+    previous = kernels.set_backend(backend)
+    try:
+        n = len(indices)
+        return [find_concave_vertex(verts, indices)] + \
+               [(in_cone(verts, indices, ia, ib), diagonalie(verts, indices, ia, ib))
+                for ia in range(n) for ib in range(n) if ia != ib]
+    finally:
+        kernels.set_backend(previous)
+
+
+class KernelBackend:
+    """
+    Mixin running a test case with the kernels of `backend`.
+    """
+    backend = "python"
+
+    def setUp(self):
+        previous = kernels.set_backend(self.backend)
+        self.addCleanup(kernels.set_backend, previous)
+        super().setUp()
+
+
+class TestKernels(unittest.TestCase):
+
+    def test_same_as_numpy(self):
+        rng = np.random.default_rng(0)
+        for verts in [rng.integers(0, 4, (12, 2)).astype(np.float64),  # many collinear
+                      rng.uniform(0, 10, (12, 2)),
+                      rng.integers(0, 4, (12, 2)).astype(np.int32),
+                      # beyond 2**53, rounded if converted to float
+                      rng.integers(0, 4, (12, 2)).astype(np.int64) + 2**60]:
+            for _ in range(20):
+                indices = rng.permutation(12)
+                expected = run_predicates("numpy", verts, indices)
+                for backend in BACKENDS:
+                    self.assertEqual(run_predicates(backend, verts, indices), expected)
+
+    def test_set_backend(self):
+        previous = kernels.set_backend("numpy")
+        self.addCleanup(kernels.set_backend, previous)
+        self.assertIsNone(kernels.ACTIVE)
+        self.assertEqual(kernels.set_backend("python"), "numpy")
+        self.assertEqual(kernels.backend(), "python")
+        self.assertIsNotNone(kernels.ACTIVE)
+        with self.assertRaises(ValueError):
+            kernels.set_backend("cuda")
+        if kernels.numba is None:
+            with self.assertRaises(ValueError):
+                kernels.set_backend("numba")
+
+
+# the build test cases, run again with the kernels of each backend
+class TestConvexifyPython(KernelBackend, test_convexify.TestConvexify):
+    pass
+
+
+class TestDiagPython(KernelBackend, test_diag.TestDiag):
+    pass
+
+
+class TestHolePython(KernelBackend, test_hole.TestHole):
+    pass
+
+
+class TestQuantizePython(KernelBackend, test_quantize.TestQuantize):
+    pass
+
+
+@unittest.skipIf(kernels.numba is None, "Numba is not installed")
+class TestConvexifyNumba(KernelBackend, test_convexify.TestConvexify):
+    backend = "numba"
+
+
+@unittest.skipIf(kernels.numba is None, "Numba is not installed")
+class TestDiagNumba(KernelBackend, test_diag.TestDiag):
+    backend = "numba"
+
+
+@unittest.skipIf(kernels.numba is None, "Numba is not installed")
+class TestHoleNumba(KernelBackend, test_hole.TestHole):
+    backend = "numba"
+
+
+@unittest.skipIf(kernels.numba is None, "Numba is not installed")
+class TestQuantizeNumba(KernelBackend, test_quantize.TestQuantize):
+    backend = "numba"
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+import numpy as np
+from meadow_map import LandmarkTable, NavMesh, PathFinder
+from meadow_map.landmarks import dijkstra as landmark_dijkstra
+from tests.test_pathfind import grid_map, dijkstra
+
+
+class TestLandmarks(unittest.TestCase):
+
+    def test_table(self):
+        mesh = grid_map()
+        table = LandmarkTable(mesh, k=4)
+        self.assertEqual(table.distances.shape, (4, mesh.n_polys))
+        self.assertEqual(table.distances.dtype, np.float32)
+        self.assertEqual(len(set(table.landmarks.tolist())), 4)
+        for row, l in zip(table.distances, table.landmarks):
+            np.testing.assert_allclose(row, dijkstra(mesh, l), rtol=1e-6)
+        np.testing.assert_allclose(landmark_dijkstra(mesh, 3), dijkstra(mesh, 3))
+
+    def test_alt_search(self):
+        mesh = grid_map(seed=2)
+        alt = PathFinder(mesh, landmarks=LandmarkTable(mesh, k=6))
+        plain = PathFinder(mesh)
+        rng = np.random.default_rng(4)
+
+        expanded_alt = expanded_plain = 0
+        for _ in range(30):
+            start, goal = rng.integers(0, mesh.n_polys, 2)
+            dist = dijkstra(mesh, start)
+            path = alt.find(start, goal)
+            self.assertEqual(path[0], start)
+            self.assertEqual(path[-1], goal)
+            self.assertAlmostEqual(alt.cost(goal), dist[goal], places=5)
+            expanded_alt += alt.expanded
+            plain.find(start, goal)
+            expanded_plain += plain.expanded
+        self.assertLess(expanded_alt, expanded_plain)
+
+    def test_disconnected(self):
+        verts = np.array([[0., 0.], [1., 0.], [1., 1.], [0., 1.],
+                          [2., 0.], [3., 0.], [3., 1.], [2., 1.]])
+        mesh = NavMesh(verts, [np.array([0, 1, 2, 3]), np.array([4, 5, 6, 7])])
+        table = LandmarkTable(mesh, k=4)
+        # one landmark in each component
+        self.assertEqual(sorted(table.landmarks.tolist()), [0, 1])
+        finder = PathFinder(mesh, landmarks=table)
+        self.assertEqual(finder.find(0, 1), [])
+        self.assertEqual(finder.find(1, 1), [1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+import numpy as np
+from meadow_map import NavMesh, PointLocator
+from meadow_map.basic_ops import left_on
+from tests.test_navmesh import demo_map
+
+
+def brute_locate(mesh, points):
+    """
+    Reference point location: first polygon having the point at left of or on all edges.
+    """
+    res = []
+    for pt in points:
+        found = -1
+        for p in np.flatnonzero(mesh.poly_alive):
+            poly = mesh.poly(p)
+            if all(left_on(mesh.verts[poly[i]], mesh.verts[poly[(i + 1) % len(poly)]], pt)
+                   for i in range(len(poly))):
+                found = p
+                break
+        res.append(found)
+    return np.array(res)
+
+
+class TestLocate(unittest.TestCase):
+
+    def test_demo_map(self):
+        mesh = NavMesh.build(*demo_map())
+        rng = np.random.default_rng(0)
+        points = rng.uniform(-0.5, 4.5, size=(500, 2))
+        np.testing.assert_array_equal(mesh.locate(points), brute_locate(mesh, points))
+
+        # polygon 0 is found, points out of the mesh or in holes are -1
+        inside0 = mesh.centers[0]
+        res = mesh.locate([inside0, [-1., -1.], [0.5, 1.2], [3., 1.5]])
+        np.testing.assert_array_equal(res, [0, -1, -1, -1])
+
+    def test_cell_sizes(self):
+        mesh = NavMesh.build(*demo_map())
+        rng = np.random.default_rng(1)
+        points = np.concatenate((rng.uniform(0., 4., size=(200, 2)), mesh.verts, mesh.centers))
+        expected = brute_locate(mesh, points)
+        for cell_size in (0.1, 0.7, 10.):
+            locator = PointLocator(mesh, cell_size=cell_size)
+            np.testing.assert_array_equal(locator.locate(points), expected)
+
+    def test_empty(self):
+        mesh = NavMesh.build(*demo_map())
+        self.assertEqual(mesh.locate(np.zeros((0, 2))).shape, (0,))
+        self.assertEqual(mesh.locate([[100., 100.]])[0], -1)
+
+    def test_updates(self):
+        mesh = NavMesh.build(*demo_map())
+        rng = np.random.default_rng(2)
+        points = np.concatenate((rng.uniform(0., 4., size=(300, 2)), mesh.centers))
+        locator = mesh._locator = PointLocator(mesh)  # pylint: disable=protected-access
+        oids = []
+        for center in ([1.1, 2.6], [3.5, 2.5], [0.5, 3.5], [1.6, 2.9]):
+            oids.append(mesh.add_obstacle(np.array(center) + [[-.3, -.3], [.3, -.3], [.3, .3],
+                                                                [-.3, .3]]))
+            np.testing.assert_array_equal(mesh.locate(points), brute_locate(mesh, points))
+        for oid in oids[::2]:
+            mesh.remove_obstacle(oid)
+            np.testing.assert_array_equal(mesh.locate(points), brute_locate(mesh, points))
+        # patched, not built again
+        self.assertIs(mesh._locator, locator)  # pylint: disable=protected-access
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import heapq
+import random
+import unittest
+from utils.MinBinaryHeap import IndexedMinBinaryHeap
+
+
+class TestIndexedMinBinaryHeap(unittest.TestCase):
+
+    def test_pop_order(self):
+        rng = random.Random(0)
+        heap = IndexedMinBinaryHeap(200)
+        priorities = {}
+        for key in range(200):
+            priorities[key] = rng.uniform(0, 100)
+            heap.insert(key, priorities[key])
+        for _ in range(300):
+            key = rng.randrange(200)
+            priorities[key] -= rng.uniform(0, 5)
+            heap.decrease_key(key, priorities[key])
+        for key in range(0, 200, 7):
+            heap.remove(key)
+            del priorities[key]
+
+        self.assertEqual(len(heap), len(priorities))
+        expected = heapq.nsmallest(len(priorities), priorities.items(), key=lambda kv: kv[1])
+        popped = [heap.pop_min() for _ in range(len(priorities))]
+        self.assertEqual(popped, expected)
+        # positions are cleared once popped or removed
+        self.assertFalse(any(heap.contains(key) for key in range(200)))
+
+    def test_errors(self):
+        heap = IndexedMinBinaryHeap(4)
+        heap.insert(1, 5.0)
+        heap.insert(2, 3.0)
+        self.assertTrue(heap.contains(1))
+        self.assertFalse(heap.contains(0))
+        self.assertEqual(heap.get_min(), (2, 3.0))
+        self.assertEqual(heap.priority(1), 5.0)
+
+        with self.assertRaises(ValueError):
+            heap.insert(1, 1.0)
+        with self.assertRaises(ValueError):
+            heap.decrease_key(1, 6.0)
+        with self.assertRaises(KeyError):
+            heap.remove(3)
+
+        heap.decrease_key(1, 1.0)
+        self.assertEqual(heap.pop_min(), (1, 1.0))
+        self.assertEqual(heap.pop_min(), (2, 3.0))
+        with self.assertRaises(IndexError):
+            heap.pop_min()
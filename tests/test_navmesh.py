@@ -0,0 +1,153 @@
+import unittest
+import numpy as np
+from shapely.geometry import Polygon
+from meadow_map import convexify, merge_holes, NavMesh, PathFinder
+from meadow_map.landmarks import dijkstra
+
+
+def demo_map():
+    """
+    The polygon with 2 holes used in `demo.py`.
+    :return: (verts_poly, indices_poly, holes)
+    """
+    verts_poly = np.array(
+        [
+            [0., 0.], [0., 4.], [2., 4.],
+            [1., 3.], [2., 1.], [3., 3.], [4., 1.],
+            [1., 0.]
+        ]
+    )
+    indices_poly = [verts_poly.shape[0] - i - 1 for i in range(verts_poly.shape[0])]  # CCW
+    verts_hole = np.array([[0.5, 0.5], [0.2, 1.5], [0.4, 2.], [1.8, 0.5]])
+    verts_hole1 = np.array([[2.5, 1.], [3., 2], [3.5, 1]])
+    holes = [
+        (verts_hole, [(i + 2) % 4 for i in range(4)]),  # CW
+        (verts_hole1, [(i + 2) % 3 for i in range(3)]),  # CW
+    ]
+    return verts_poly, indices_poly, holes
+
+
+class TestNavMesh(unittest.TestCase):
+
+    def test_adjacency(self):
+        verts_poly, indices_poly, holes = demo_map()
+        verts, indices, bridges = merge_holes(verts_poly, indices_poly, holes)
+        polys, diags = convexify(verts, indices)
+        mesh = NavMesh(verts, polys)
+
+        self.assertEqual(mesh.n_polys, len(polys))
+        self.assertEqual(mesh.poly_offsets[-1], sum(len(p) for p in polys))
+        for p in range(mesh.n_polys):
+            np.testing.assert_array_equal(mesh.poly(p), polys[p])
+
+        # every diagonal and every hole bridge is a portal (linked from both sides)
+        n_links = int(np.sum(mesh.edge_neighbours >= 0))
+        self.assertEqual(n_links, 2 * (len(diags) + len(bridges)))
+
+        for p in range(mesh.n_polys):
+            for q in mesh.neighbours(p):
+                self.assertIn(p, mesh.neighbours(q).tolist())
+                left, right = mesh.portal(p, q)
+                self.assertEqual(mesh.portal(q, p), (right, left))
+                # the portal is an edge of both polygons
+                self.assertIn(left, mesh.poly(p).tolist())
+                self.assertIn(right, mesh.poly(q).tolist())
+                # right-to-left is an edge of p (counter-clock wise)
+                self.assertIn([right, left], mesh.edges[mesh.poly_offsets[p]:
+                                                        mesh.poly_offsets[p + 1]].tolist())
+
+        self.assertEqual(mesh.portal(0, 0), (-1, -1))
+
+    def test_build(self):
+        verts_poly, indices_poly, holes = demo_map()
+        mesh = NavMesh.build(verts_poly, indices_poly, holes, method="hm")
+        verts, indices, _ = merge_holes(verts_poly, indices_poly, holes)
+        polys, _ = convexify(verts, indices, method="hm")
+
+        self.assertEqual(mesh.n_polys, len(polys))
+        np.testing.assert_allclose(mesh.centers[0], verts[polys[0]].mean(axis=0))
+        # the mesh is connected, costs are center distances
+        linked = mesh.edge_neighbours >= 0
+        self.assertTrue(np.all(mesh.edge_costs[linked] > 0))
+        self.assertTrue(np.all(mesh.edge_costs[~linked] == 0))
+
+    def check_update(self, mesh, area):
+        alive = np.flatnonzero(mesh.poly_alive)
+        total = sum(Polygon(mesh.verts[mesh.poly(p)]).area for p in alive)
+        self.assertAlmostEqual(total, area)
+        # adjacency patched in place is the same as linking the alive polygons again
+        fresh = NavMesh(mesh.verts, [mesh.poly(p) for p in alive])
+        np.testing.assert_array_equal(
+            mesh.edge_neighbours[np.isin(mesh.edge_polys, alive)] >= 0,
+            fresh.edge_neighbours >= 0
+        )
+        self.assertFalse(np.isin(mesh.edge_neighbours, np.flatnonzero(~mesh.poly_alive)).any())
+
+    def test_obstacles(self):
+        verts_poly, indices_poly, holes = demo_map()
+        mesh = NavMesh.build(verts_poly, indices_poly, holes)
+        outline = Polygon(verts_poly[indices_poly], [v[i] for v, i in holes])
+        finder = PathFinder(mesh)
+        n_polys = mesh.n_polys
+
+        door = np.array([[0.9, 2.4], [1.4, 2.4], [1.4, 2.9], [0.9, 2.9]])
+        oid = mesh.add_obstacle(door)
+        self.assertEqual(mesh.revision, 1)
+        self.assertGreater(mesh.n_polys, n_polys)
+        self.check_update(mesh, outline.difference(Polygon(door)).area)
+        self.assertEqual(mesh.locate(door.mean(axis=0, keepdims=True))[0], -1)
+
+        # overlapping obstacle, partly out of the mesh
+        cover = np.array([[1.2, 2.6], [2.5, 2.6], [2.5, 3.8], [1.2, 3.8]])
+        oid2 = mesh.add_obstacle(cover)
+        self.check_update(mesh, outline.difference(Polygon(door).union(Polygon(cover))).area)
+
+        # the finder follows the updates
+        start, goal = mesh.locate([[0.1, 3.9], [3.9, 1.1]])
+        corridor = finder.find(start, goal)
+        self.assertAlmostEqual(finder.cost(goal), dijkstra(mesh, start)[goal])
+        self.assertTrue(mesh.poly_alive[corridor].all())
+
+        self.assertFalse(mesh.freed_since(0))
+        mesh.remove_obstacle(oid)
+        self.check_update(mesh, outline.difference(Polygon(cover)).area)
+        self.assertTrue(mesh.freed_since(0))
+        self.assertFalse(mesh.freed_since(mesh.revision))
+        mesh.remove_obstacle(oid2)
+        self.check_update(mesh, outline.area)
+        self.assertEqual(len(mesh.removed_since(0)), mesh.n_polys - mesh.poly_alive.sum())
+
+        with self.assertRaises(KeyError):
+            mesh.remove_obstacle(oid)
+        with self.assertRaises(ValueError):
+            mesh.add_obstacle([[0., 0.], [1., 1.], [1., 0.], [0., 1.]])
+
+    def test_compact(self):
+        verts_poly, indices_poly, holes = demo_map()
+        mesh = NavMesh.build(verts_poly, indices_poly, holes)
+        outline = Polygon(verts_poly[indices_poly], [v[i] for v, i in holes])
+        door = np.array([[0.9, 2.4], [1.4, 2.4], [1.4, 2.9], [0.9, 2.9]])
+        np.testing.assert_array_equal(mesh.compact(), np.arange(mesh.n_polys))  # none dead
+        mesh.add_obstacle(door)
+        mesh.remove_obstacle(mesh.add_obstacle(door + [1.5, -0.5]))
+        revision = mesh.revision
+        alive = np.flatnonzero(mesh.poly_alive)
+        polys = [mesh.poly(p).copy() for p in alive]
+
+        remap = mesh.compact()
+        self.assertTrue(mesh.renumbered_since(revision))
+        self.assertEqual(mesh.n_polys, len(alive))
+        self.assertTrue(mesh.poly_alive.all())
+        np.testing.assert_array_equal(remap[alive], np.arange(len(alive)))
+        self.assertTrue((np.delete(remap, alive) == -1).all())
+        for p, poly in enumerate(polys):
+            np.testing.assert_array_equal(mesh.poly(p), poly)
+        fresh = NavMesh(mesh.verts, polys)
+        np.testing.assert_array_equal(mesh.edge_neighbours, fresh.edge_neighbours)
+        np.testing.assert_allclose(mesh.edge_costs, fresh.edge_costs)
+
+        # still updatable
+        mesh.add_obstacle(door + [0., 0.8])
+        self.check_update(mesh, outline.difference(Polygon(door)).difference(
+            Polygon(door + [0., 0.8])).area)
+        self.assertFalse(mesh.renumbered_since(mesh.revision - 1))
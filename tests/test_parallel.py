@@ -0,0 +1,68 @@
+import unittest
+import numpy as np
+import os
+from meadow_map import PathWorkers, find_path, find_paths, string_pull
+from tests.test_pathfind import grid_map
+
+
+class TestFindPaths(unittest.TestCase):
+
+    def setUp(self):
+        self.mesh = grid_map()
+        rng = np.random.default_rng(3)
+        self.starts = rng.uniform(0., 10., size=(40, 2))
+        self.goals = rng.uniform(0., 10., size=(40, 2))
+        self.goals[0] = [20., 20.]  # out of the mesh
+
+    def expected(self):
+        start_polys = self.mesh.locate(self.starts)
+        goal_polys = self.mesh.locate(self.goals)
+        corridors, paths = [], []
+        for sp, gp, start, goal in zip(start_polys, goal_polys, self.starts, self.goals):
+            corridor = find_path(self.mesh, sp, gp) if sp >= 0 and gp >= 0 else []
+            corridors.append(corridor)
+            paths.append(string_pull(self.mesh, corridor, start, goal))
+        return corridors, paths
+
+    def check(self, corridors, paths):
+        exp_corridors, exp_paths = self.expected()
+        self.assertEqual(corridors, exp_corridors)
+        self.assertEqual(len(paths), len(exp_paths))
+        for path, exp in zip(paths, exp_paths):
+            np.testing.assert_array_equal(path, exp)
+        self.assertEqual(corridors[0], [])
+        self.assertEqual(paths[0].shape, (0, 2))
+
+    def test_serial(self):
+        self.check(*find_paths(self.mesh, self.starts, self.goals))
+
+    def test_pool(self):
+        self.check(*find_paths(self.mesh, self.starts, self.goals, workers=2))
+        self.check(*find_paths(self.mesh, self.starts, self.goals, workers=3, chunk_size=7))
+
+    def test_workers(self):
+        with PathWorkers(self.mesh, workers=2) as pool:
+            self.check(*pool.find_paths(self.starts, self.goals))
+            # same pool and mesh file for later batches
+            pool_id, path = id(pool._pool), pool._path  # pylint: disable=protected-access
+            self.check(*pool.find_paths(self.starts, self.goals, chunk_size=1))
+            self.assertEqual(id(pool._pool), pool_id)  # pylint: disable=protected-access
+
+            # the pool is restarted on the updated mesh
+            self.mesh.add_obstacle(np.array([[4.2, 4.2], [4.8, 4.2], [4.8, 4.8], [4.2, 4.8]]))
+            self.check(*pool.find_paths(self.starts, self.goals))
+            self.assertFalse(os.path.exists(path))
+        self.assertIsNone(pool._pool)  # pylint: disable=protected-access
+
+    def test_mismatch(self):
+        with self.assertRaises(ValueError):
+            find_paths(self.mesh, self.starts, self.goals[:3])
+
+    def test_chunk_size(self):
+        for chunk_size in (0, -1):
+            with self.assertRaises(ValueError):
+                find_paths(self.mesh, self.starts, self.goals, workers=2, chunk_size=chunk_size)
+
+
+if __name__ == '__main__':
+    unittest.main()
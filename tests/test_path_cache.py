@@ -0,0 +1,97 @@
+import unittest
+import numpy as np
+from meadow_map import PathCache, build_tiled, find_path
+from tests.test_pathfind import grid_map
+
+
+class TestPathCache(unittest.TestCase):
+
+    def test_hit_miss(self):
+        mesh = grid_map()
+        cache = PathCache(maxsize=8)
+        goal = mesh.n_polys - 1
+        corridor = find_path(mesh, 0, goal, cache=cache)
+        self.assertEqual(corridor, find_path(mesh, 0, goal))
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+
+        self.assertEqual(find_path(mesh, 0, goal, cache=cache), corridor)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+        # returned corridors are copies
+        find_path(mesh, 0, goal, cache=cache).append(-1)
+        self.assertEqual(find_path(mesh, 0, goal, cache=cache), corridor)
+
+    def test_lru_eviction(self):
+        mesh = grid_map()
+        cache = PathCache(maxsize=2)
+        find_path(mesh, 0, 1, cache=cache)
+        find_path(mesh, 0, 2, cache=cache)
+        find_path(mesh, 0, 1, cache=cache)  # (0, 2) is now least recently used
+        find_path(mesh, 0, 3, cache=cache)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNotNone(cache.get(mesh, 0, 1))
+        self.assertIsNotNone(cache.get(mesh, 0, 3))
+        self.assertIsNone(cache.get(mesh, 0, 2))
+
+    def test_invalidate(self):
+        mesh = grid_map()
+        cache = PathCache()
+        find_path(mesh, 0, 5, cache=cache)
+        self.assertEqual(len(cache), 1)
+
+        # modified in place: only corridors through replaced polygons are dropped
+        far = mesh.n_polys - 1
+        find_path(mesh, 0, far, cache=cache)
+        corridor = cache.get(mesh, 0, far)
+        blocked = mesh.centers[corridor[len(corridor) // 2]]
+        mesh.add_obstacle(blocked + [[-0.1, -0.1], [0.1, -0.1], [0.1, 0.1], [-0.1, 0.1]])
+        removed = set(mesh.removed_since(0).tolist())
+        self.assertIsNone(cache.get(mesh, 0, far))
+        self.assertEqual(cache.get(mesh, 0, 5) is None, not removed.isdisjoint(
+            find_path(mesh, 0, 5)))
+        find_path(mesh, 0, 5, cache=cache)
+        self.assertEqual(len(cache), 1)
+
+        # renumbered
+        mesh.compact()
+        self.assertIsNone(cache.get(mesh, 0, 5))
+        self.assertEqual(len(cache), 0)
+
+        # rebuilt
+        rebuilt = grid_map()
+        self.assertIsNone(cache.get(rebuilt, 0, 5))
+        self.assertEqual(len(cache), 0)
+
+    def test_remove_obstacle(self):
+        # 10 x 2 room of 1 x 1 tiles
+        mesh = build_tiled(np.array([[0., 0.], [10., 0.], [10., 2.], [0., 2.]]), [0, 1, 2, 3],
+                           tile_size=1.0)
+        cache = PathCache()
+        start, goal = mesh.locate([[0.5, 1.0], [9.5, 1.0]]).tolist()
+        find_path(mesh, start, goal, cache=cache)
+
+        # a wall across the room: goal unreachable
+        wall = mesh.add_obstacle([[4.8, -1.], [5.2, -1.], [5.2, 3.], [4.8, 3.]])
+        start, goal = mesh.locate([[0.5, 1.0], [9.5, 1.0]]).tolist()
+        self.assertEqual(find_path(mesh, start, goal, cache=cache), [])
+        # a wall with a door at the top: a detour
+        door = mesh.add_obstacle([[2.8, -1.], [3.2, -1.], [3.2, 1.5], [2.8, 1.5]])
+        mesh.remove_obstacle(wall)
+        start, goal = mesh.locate([[0.5, 1.0], [9.5, 1.0]]).tolist()
+        detour = find_path(mesh, start, goal, cache=cache)
+        self.assertGreater(len(detour), 0)
+
+        # freed area: shorter routes than the cached corridors
+        mesh.remove_obstacle(door)
+        start, goal = mesh.locate([[0.5, 1.0], [9.5, 1.0]]).tolist()
+        corridor = find_path(mesh, start, goal, cache=cache)
+        self.assertEqual(corridor, find_path(mesh, start, goal))
+        self.assertLess(len(corridor), len(detour))
+
+    def test_maxsize(self):
+        with self.assertRaises(ValueError):
+            PathCache(maxsize=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
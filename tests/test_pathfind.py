@@ -0,0 +1,113 @@
+import heapq
+import unittest
+import numpy as np
+from meadow_map import NavMesh, PathFinder, find_path
+
+
+def grid_map(seed: int = 0) -> NavMesh:
+    """
+    A square room with a grid of small (jittered) square obstacles.
+    :param seed:   int      random seed
+    :return:       NavMesh
+    """
+    verts_poly = np.array([[0., 0.], [10., 0.], [10., 10.], [0., 10.]])
+    rng = np.random.default_rng(seed)
+    holes = []
+    for x in range(1, 9, 2):
+        for y in range(1, 9, 2):
+            ox, oy = rng.uniform(0, 0.5, 2)
+            verts_hole = np.array([[x, y], [x + 1, y], [x + 1, y + 1], [x, y + 1]]) + [ox, oy]
+            holes.append((verts_hole, [3, 2, 1, 0]))  # CW
+    return NavMesh.build(verts_poly, [0, 1, 2, 3], holes)
+
+
+def dijkstra(mesh: NavMesh, start: int) -> np.ndarray:
+    """
+    Reference shortest corridor cost from `start` to every polygon.
+    """
+    dist = np.full(mesh.n_polys, np.inf)
+    dist[start] = 0.0
+    heap = [(0.0, start)]
+    while heap:
+        d, p = heapq.heappop(heap)
+        if d > dist[p]:
+            continue
+        for e in range(mesh.poly_offsets[p], mesh.poly_offsets[p + 1]):
+            q = mesh.edge_neighbours[e]
+            if q >= 0 and d + mesh.edge_costs[e] < dist[q]:
+                dist[q] = d + mesh.edge_costs[e]
+                heapq.heappush(heap, (dist[q], q))
+    return dist
+
+
+class TestPathFind(unittest.TestCase):
+
+    def test_find_path(self):
+        mesh = grid_map()
+        finder = PathFinder(mesh)
+        rng = np.random.default_rng(1)
+
+        for _ in range(30):
+            start, goal = rng.integers(0, mesh.n_polys, 2)
+            dist = dijkstra(mesh, start)
+            path = finder.find(start, goal)
+
+            self.assertEqual(path[0], start)
+            self.assertEqual(path[-1], goal)
+            cost = 0.0
+            for p, q in zip(path[:-1], path[1:]):
+                self.assertIn(q, mesh.neighbours(p).tolist())
+                cost += np.linalg.norm(mesh.centers[p] - mesh.centers[q])
+            # A* with a consistent heuristic returns the shortest corridor
+            self.assertAlmostEqual(cost, dist[goal])
+            self.assertAlmostEqual(finder.cost(goal), dist[goal])
+
+    def test_same_and_unreachable(self):
+        # two disjoint squares
+        verts = np.array([[0., 0.], [1., 0.], [1., 1.], [0., 1.],
+                          [2., 0.], [3., 0.], [3., 1.], [2., 1.]])
+        mesh = NavMesh(verts, [np.array([0, 1, 2, 3]), np.array([4, 5, 6, 7])])
+
+        self.assertEqual(find_path(mesh, 0, 0), [0])
+        self.assertEqual(find_path(mesh, 0, 1), [])
+        self.assertEqual(find_path(mesh, 1, 1), [1])
+
+    def test_invalid_ids(self):
+        mesh = grid_map()
+        finder = PathFinder(mesh)
+        n = mesh.n_polys
+        for start, goal in ((-1, 0), (0, -1), (n, 0), (0, n), (-n, 0)):
+            self.assertEqual(finder.find(start, goal), [])
+            self.assertEqual(find_path(mesh, start, goal), [])
+        self.assertEqual(finder.cost(-1), np.inf)
+
+        # polygons removed by an update of the mesh
+        mesh.add_obstacle(np.array([[4.2, 4.2], [4.8, 4.2], [4.8, 4.8], [4.2, 4.8]]))
+        dead = np.flatnonzero(~mesh.poly_alive)
+        alive = np.flatnonzero(mesh.poly_alive)
+        self.assertGreater(len(dead), 0)
+        self.assertEqual(finder.find(dead[0], alive[0]), [])
+        self.assertEqual(finder.find(alive[0], dead[0]), [])
+
+    def test_updates(self):
+        mesh = grid_map(seed=2)
+        finder = PathFinder(mesh)
+        rng = np.random.default_rng(4)
+        oids = []
+        for step in range(12):
+            if step % 3 == 2:
+                mesh.remove_obstacle(oids.pop(0))
+            else:
+                x, y = rng.uniform(0.5, 9.5, 2)
+                oids.append(mesh.add_obstacle([[x, y], [x + .6, y], [x + .6, y + .6],
+                                               [x, y + .6]]))
+            if step == 7:
+                remap = mesh.compact()
+                self.assertTrue(mesh.poly_alive.all())
+                self.assertEqual(int((remap >= 0).sum()), mesh.n_polys)
+            # the finder patched after each update finds the shortest corridors
+            alive = np.flatnonzero(mesh.poly_alive)
+            for start, goal in rng.choice(alive, size=(5, 2)).tolist():
+                corridor = finder.find(start, goal)
+                self.assertTrue(mesh.poly_alive[corridor].all())
+                self.assertAlmostEqual(finder.cost(goal), dijkstra(mesh, start)[goal])
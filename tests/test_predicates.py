@@ -0,0 +1,59 @@
+import unittest
+from fractions import Fraction
+import numpy as np
+from meadow_map.predicates import orient2d, orient2d_many
+
+
+def exact_sign(a, b, c) -> int:
+    """
+    Reference orientation with rational arithmetic.
+    """
+    ax, ay, bx, by, cx, cy = (Fraction(float(v)) for v in (*a, *b, *c))
+    det = (ax - cx) * (by - cy) - (ay - cy) * (bx - cx)
+    return (det > 0) - (det < 0)
+
+
+def near_collinear(n: int = 32) -> np.ndarray:
+    """
+    Points a few ulps around (0.5, 0.5), to be tested against line (12, 12) - (24, 24).
+    The naive floating point determinant has the wrong sign on many of them.
+    """
+    steps = np.arange(n) * np.spacing(0.5)
+    xs, ys = np.meshgrid(0.5 + steps, 0.5 + steps)
+    return np.stack((xs.ravel(), ys.ravel()), axis=-1)
+
+
+class TestPredicates(unittest.TestCase):
+
+    def test_near_collinear(self):
+        a = near_collinear()
+        b = np.array([12., 12.])
+        c = np.array([24., 24.])
+        expected = [exact_sign(p, b, c) for p in a]
+        naive = np.sign((a[:, 0] - c[0]) * (b[1] - c[1]) - (a[:, 1] - c[1]) * (b[0] - c[0]))
+        self.assertGreater(np.count_nonzero(naive != expected), 0)
+
+        self.assertEqual(np.sign(orient2d_many(a, b, c)).tolist(), expected)
+        self.assertEqual([int(np.sign(orient2d(p, b, c))) for p in a], expected)
+
+    def test_world_space(self):
+        rng = np.random.default_rng(0)
+        # nearly collinear triples tens of thousands of units away from the origin
+        a = rng.uniform(-5e4, 5e4, (500, 2))
+        b = rng.uniform(-5e4, 5e4, (500, 2))
+        t = rng.uniform(-1, 2, (500, 1))
+        c = a + t * (b - a) + rng.integers(-2, 3, (500, 2)) * np.spacing(5e4)
+        expected = [exact_sign(*abc) for abc in zip(a, b, c)]
+        self.assertEqual(np.sign(orient2d_many(a, b, c)).tolist(), expected)
+        self.assertEqual([int(np.sign(orient2d(*abc))) for abc in zip(a, b, c)], expected)
+
+    def test_broadcast(self):
+        a = near_collinear(4)
+        det = orient2d_many(a, [12., 12.], [24., 24.])
+        self.assertEqual(det.shape, (16, ))
+        self.assertEqual(orient2d_many([0., 0.], [1., 1.], [2., 2.]), 0.0)
+        self.assertGreater(orient2d_many([0., 0.], [1., 0.], [0., 1.]), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
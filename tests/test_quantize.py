@@ -0,0 +1,102 @@
+import unittest
+import numpy as np
+from shapely.geometry import Polygon
+from meadow_map import NavMesh, Quantizer, convexify, merge_holes
+from meadow_map.predicates import MAX_COORD, orient2d, orient2d_many
+from tests.test_navmesh import demo_map
+
+
+class TestQuantize(unittest.TestCase):
+
+    def test_round_trip(self):
+        q = Quantizer(0.01, origin=(40000.0, -40000.0))
+        points = np.array([[40000.0, -40000.0], [40123.456, -39876.544], [39999.994, -40000.0]])
+        grid = q.quantize(points)
+        self.assertEqual(grid.dtype, np.int32)
+        self.assertEqual(grid.tolist(), [[0, 0], [12346, 12346], [-1, 0]])
+        np.testing.assert_allclose(q.dequantize(grid), points, atol=0.005)
+        self.assertEqual(Quantizer(1.0, dtype=np.int64).quantize(points).dtype, np.int64)
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            Quantizer(0.0)
+        with self.assertRaises(ValueError):
+            Quantizer(1.0, dtype=np.float32)
+        with self.assertRaises(ValueError):
+            Quantizer(1e-6).quantize([[2000.0, 0.0]])
+        with self.assertRaises(ValueError):
+            Quantizer(1e-6).quantize([[np.nan, 0.0]])
+
+        square = np.array([[0., 0.], [1., 0.], [1., 0.001], [0., 1.]])
+        Quantizer(1e-4).quantize_ring(square, [0, 1, 2, 3])
+        with self.assertRaises(ValueError):
+            Quantizer(0.01).quantize_ring(square, [0, 1, 2, 3])
+
+    def test_integer_predicates(self):
+        # determinants of the largest coordinates do not overflow int64
+        m = MAX_COORD
+        a = np.array([[-m, -m], [-m, -m], [0, 0]], dtype=np.int32)
+        b = np.array([[m, m], [m, -m], [m, m]], dtype=np.int32)
+        c = np.array([[m - 1, m], [-m, m], [-m, -m]], dtype=np.int32)
+        det = orient2d_many(a, b, c)
+        self.assertEqual(det.dtype, np.int64)
+        expected = [orient2d(*abc) for abc in zip(a.tolist(), b.tolist(), c.tolist())]
+        self.assertEqual(det.tolist(), expected)
+        self.assertEqual(np.sign(det).tolist(), [1, 1, 0])
+        self.assertEqual([orient2d(*abc) for abc in zip(a, b, c)], expected)
+
+    def test_integer_predicates_out_of_range(self):
+        # past MAX_COORD, int64 products overflow: computed exactly by other means
+        m = 4_000_000_000
+        a = np.array([[m, 0], [-m, -m], [m, m + 1]], dtype=np.int64)
+        b = np.array([[0, m], [m, -m + 1], [-m, -m]], dtype=np.int64)
+        c = np.array([[-m, -m], [m - 1, m], [0, 1]], dtype=np.int64)
+        expected = [orient2d(*abc) for abc in zip(a.tolist(), b.tolist(), c.tolist())]
+        naive = (a[:, 0] - c[:, 0]) * (b[:, 1] - c[:, 1]) - \
+            (a[:, 1] - c[:, 1]) * (b[:, 0] - c[:, 0])
+        self.assertNotEqual(np.sign(naive).tolist(), np.sign(expected).tolist())
+
+        det = orient2d_many(a, b, c)
+        self.assertEqual(np.sign(det).tolist(), np.sign(expected).tolist())
+        np.testing.assert_allclose(det, np.array(expected, dtype=np.float64))
+        self.assertEqual(np.sign(orient2d_many(a[0], b[0], c[0])), np.sign(expected[0]))
+
+    def test_build(self):
+        verts_poly, indices_poly, holes = demo_map()
+        q = Quantizer(0.1)
+        verts, indices, diags = merge_holes(
+            q.quantize(verts_poly), indices_poly,
+            [(q.quantize(verts_hole), indices_hole) for verts_hole, indices_hole in holes])
+        self.assertEqual(verts.dtype, np.int32)
+        polys, _ = convexify(verts, indices)
+        polys_hm, _ = convexify(verts, indices, method="hm")
+
+        # demo map vertices are on the grid: same result as on float coordinates
+        verts_f, indices_f, diags_f = merge_holes(verts_poly, indices_poly, holes)
+        self.assertEqual((indices, diags), (indices_f, diags_f))
+        np.testing.assert_array_equal(q.dequantize(verts), verts_f)
+        for res, res_f in [(polys, convexify(verts_f, indices_f)[0]),
+                           (polys_hm, convexify(verts_f, indices_f, method="hm")[0])]:
+            self.assertEqual([p.tolist() for p in res], [p.tolist() for p in res_f])
+
+        mesh = NavMesh.build(verts_poly, indices_poly, holes, cell_size=0.1)
+        self.assertEqual(mesh.verts.dtype, np.float64)
+        np.testing.assert_array_equal(mesh.verts, verts_f)
+        self.assertEqual(mesh.n_polys, len(polys))
+
+    def test_world_space(self):
+        # the demo map, scaled to km and far from the origin, on a 1 cm grid
+        verts_poly, indices_poly, holes = demo_map()
+        offset = np.array([35000.0, -42000.0])
+        mesh = NavMesh.build(verts_poly * 1000 + offset, indices_poly,
+                             [(h * 1000 + offset, i) for h, i in holes], cell_size=0.01)
+        expected = NavMesh.build(verts_poly, indices_poly, holes)
+        self.assertEqual(mesh.n_polys, expected.n_polys)
+        area = sum(Polygon(mesh.verts[mesh.poly(p)]).area for p in range(mesh.n_polys))
+        expected_area = sum(Polygon(expected.verts[expected.poly(p)]).area
+                            for p in range(expected.n_polys))
+        self.assertAlmostEqual(area, expected_area * 1e6, delta=1e-3)
+
+
+if __name__ == '__main__':
+    unittest.main()
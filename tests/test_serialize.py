@@ -0,0 +1,67 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from meadow_map import NavMesh, find_path, load_navmesh, save_navmesh
+from meadow_map.serialize import FORMAT_VERSION
+from tests.test_navmesh import demo_map
+
+ARRAYS = ("verts", "poly_offsets", "poly_verts", "edges", "edge_polys", "edge_neighbours",
+          "edge_costs", "centers", "poly_alive")
+
+
+class TestSerialize(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "mesh.nav")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        mesh = NavMesh.build(*demo_map())
+        mesh.add_obstacle([[0.9, 2.4], [1.4, 2.4], [1.4, 2.9], [0.9, 2.9]])
+        save_navmesh(mesh, self.path)
+        loaded = load_navmesh(self.path)
+
+        self.assertEqual(loaded.n_polys, mesh.n_polys)
+        self.assertEqual(loaded.revision, mesh.revision)
+        for name in ARRAYS:
+            arr = getattr(loaded, name)
+            np.testing.assert_array_equal(arr, getattr(mesh, name))
+            self.assertIsInstance(arr, np.memmap)
+            self.assertFalse(arr.flags.writeable)
+        self.assertEqual(loaded.poly_alive.dtype, bool)
+
+        start, goal = mesh.locate([[0.1, 3.9], [3.9, 1.1]])
+        np.testing.assert_array_equal(loaded.locate([[0.1, 3.9], [3.9, 1.1]]), [start, goal])
+        self.assertEqual(find_path(loaded, start, goal), find_path(mesh, start, goal))
+
+        # updates copy the memory-mapped arrays first
+        center = mesh.centers[np.flatnonzero(mesh.poly_alive)[0]]
+        loaded.add_obstacle(center + [[-0.02, -0.02], [0.02, -0.02], [0.02, 0.02], [-0.02, 0.02]])
+        self.assertGreater(loaded.n_polys, mesh.n_polys)
+        np.testing.assert_array_equal(load_navmesh(self.path).edge_neighbours,
+                                      mesh.edge_neighbours)
+
+    def test_header(self):
+        save_navmesh(NavMesh.build(*demo_map()), self.path)
+        with open(self.path, "rb") as f:
+            data = bytearray(f.read())
+
+        data[8:12] = (FORMAT_VERSION + 1).to_bytes(4, "little")
+        with open(self.path, "wb") as f:
+            f.write(data)
+        with self.assertRaises(ValueError):
+            load_navmesh(self.path)
+
+        data[:8] = b"NOTAMESH"
+        with open(self.path, "wb") as f:
+            f.write(data)
+        with self.assertRaises(ValueError):
+            load_navmesh(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
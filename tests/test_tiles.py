@@ -0,0 +1,51 @@
+import unittest
+import numpy as np
+from shapely.geometry import Polygon
+from meadow_map import build_tiled, find_path
+from meadow_map.landmarks import dijkstra
+from tests.test_navmesh import demo_map
+
+
+class TestTiled(unittest.TestCase):
+
+    def check_mesh(self, mesh, area):
+        total = 0.0
+        for p in range(mesh.n_polys):
+            poly = Polygon(mesh.verts[mesh.poly(p)])
+            self.assertTrue(poly.exterior.is_ccw)
+            self.assertAlmostEqual(poly.convex_hull.area, poly.area)
+            total += poly.area
+        self.assertAlmostEqual(total, area)
+        # the walkable area is connected, so is the stitched mesh
+        self.assertFalse(np.isinf(dijkstra(mesh, 0)).any())
+
+    def test_demo_map(self):
+        verts_poly, indices_poly, holes = demo_map()
+        area = Polygon(verts_poly[indices_poly], [v[i] for v, i in holes]).area
+        for tile_size in (None, 1.0, 0.7, 0.33):
+            self.check_mesh(build_tiled(verts_poly, indices_poly, holes, tile_size=tile_size), area)
+
+    def test_cross_tile_portals(self):
+        verts_poly, indices_poly, holes = demo_map()
+        mesh = build_tiled(verts_poly, indices_poly, holes, tile_size=1.0)
+        start, goal = mesh.locate([[0.1, 3.9], [3.9, 1.1]])
+        corridor = find_path(mesh, start, goal)
+        self.assertGreater(len(corridor), 4)
+
+    def test_workers(self):
+        verts_poly, indices_poly, holes = demo_map()
+        serial = build_tiled(verts_poly, indices_poly, holes, tile_size=0.7)
+        pooled = build_tiled(verts_poly, indices_poly, holes, tile_size=0.7, workers=2)
+        np.testing.assert_array_equal(serial.verts, pooled.verts)
+        np.testing.assert_array_equal(serial.poly_verts, pooled.poly_verts)
+        np.testing.assert_array_equal(serial.edge_neighbours, pooled.edge_neighbours)
+
+    def test_tile_size(self):
+        verts_poly, indices_poly, holes = demo_map()
+        for tile_size in (0.0, -1.0, float("nan")):
+            with self.assertRaises(ValueError):
+                build_tiled(verts_poly, indices_poly, holes, tile_size=tile_size)
+
+
+if __name__ == '__main__':
+    unittest.main()
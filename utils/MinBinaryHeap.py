@@ -76,6 +76,113 @@ class MinBinaryHeap:
     def _swap(self, i, j):
         self.heap[i], self.heap[j] = self.heap[j], self.heap[i]
 
+
+class IndexedMinBinaryHeap:
+    """
+    Min binary heap of integer keys in [0, capacity) with priorities.
+
+    Keys and priorities are kept in parallel arrays (in heap order), and `pos[key]` tracks
+    where each key sits in the heap, so `decrease_key`, `remove` and `contains` need no
+    search: O(log n), O(log n) and O(1).
+    """
+
+    def __init__(self, capacity):
+        self.keys = []
+        self.priorities = []
+        self.pos = [-1] * capacity
+
+    def __len__(self):
+        return len(self.keys)
+
+    def contains(self, key):
+        return self.pos[key] != -1
+
+    def insert(self, key, priority):
+        if self.pos[key] != -1:
+            raise ValueError('Key already in heap')
+        self.keys.append(key)
+        self.priorities.append(priority)
+        self.pos[key] = len(self.keys) - 1
+        self._percolate_up(len(self.keys) - 1)
+
+    def priority(self, key):
+        index = self.pos[key]
+        if index == -1:
+            raise KeyError(key)
+        return self.priorities[index]
+
+    def decrease_key(self, key, priority):
+        index = self.pos[key]
+        if index == -1:
+            raise KeyError(key)
+        if priority > self.priorities[index]:
+            raise ValueError('New priority is larger than current priority')
+        self.priorities[index] = priority
+        self._percolate_up(index)
+
+    def remove(self, key):
+        index = self.pos[key]
+        if index == -1:
+            raise KeyError(key)
+        last = len(self.keys) - 1
+        self._swap(index, last)
+        self.keys.pop()
+        self.priorities.pop()
+        self.pos[key] = -1
+        if index < last:
+            self._percolate_up(index)
+            self._percolate_down(index)
+
+    def get_min(self):
+        if len(self.keys) > 0:
+            return self.keys[0], self.priorities[0]
+        raise IndexError('Heap is empty')
+
+    def pop_min(self):
+        if len(self.keys) > 0:
+            key, priority = self.keys[0], self.priorities[0]
+            self.remove(key)
+            return key, priority
+        raise IndexError('Heap is empty')
+
+    def _percolate_up(self, index):
+        keys, priorities, pos = self.keys, self.priorities, self.pos
+        key, priority = keys[index], priorities[index]
+        while index > 0:
+            parent = (index - 1) // 2
+            if priorities[parent] <= priority:
+                break
+            keys[index], priorities[index] = keys[parent], priorities[parent]
+            pos[keys[index]] = index
+            index = parent
+        keys[index], priorities[index] = key, priority
+        pos[key] = index
+
+    def _percolate_down(self, index):
+        keys, priorities, pos = self.keys, self.priorities, self.pos
+        size = len(keys)
+        key, priority = keys[index], priorities[index]
+        while True:
+            child = 2 * index + 1
+            if child >= size:
+                break
+            if child + 1 < size and priorities[child + 1] < priorities[child]:
+                child += 1
+            if priority <= priorities[child]:
+                break
+            keys[index], priorities[index] = keys[child], priorities[child]
+            pos[keys[index]] = index
+            index = child
+        keys[index], priorities[index] = key, priority
+        pos[key] = index
+
+    def _swap(self, i, j):
+        self.keys[i], self.keys[j] = self.keys[j], self.keys[i]
+        self.priorities[i], self.priorities[j] = self.priorities[j], self.priorities[i]
+        self.pos[self.keys[i]] = i
+        self.pos[self.keys[j]] = j
+
+
 # test
 # heap = MinBinaryHeap()
 # heap.insert(5)
@@ -91,4 +198,4 @@ class MinBinaryHeap:
 #
 # heap.heap[2] = 1
 # heap.update(2)
-# print(heap.heap)  # 输出: [1, 2, 3, 10]
\ No newline at end of file
+# print(heap.heap)  # 输出: [1, 2, 3, 10]